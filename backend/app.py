@@ -1,13 +1,37 @@
 from sanic import Sanic
 from app.db.mongo import init_mongo
+from app.db.cache import init_cache, close_cache
 from app.routes import get_api_blueprints
 from app.db.config import API_VERSION
+from app.services.token_service import TokenService
+from app.services.activity_service import ActivityService
+from app.services.sample_service import SampleService
+from app.services.sync_service import SyncService
+from app.services.user_service import UserService
+from app.utils.snowflake import get_id_generator
 
 app = Sanic("launchpad-backend")
 
 @app.listener('before_server_start')
 async def setup_db(app, loop):
     await init_mongo(app)
+    await init_cache(app)
+
+@app.listener('before_server_start')
+async def setup_ids(app, loop):
+    # Resolve this worker's id space now, so a bad NODE_ID fails startup instead of the first write.
+    get_id_generator()
+
+@app.listener('after_server_stop')
+async def close_connections(app, loop):
+    await close_cache(app)
+
+TokenService.register_listeners(app)
+TokenService.register_middleware(app)
+ActivityService.register_listeners(app)
+SampleService.register_listeners(app)
+SyncService.register_listeners(app)
+UserService.register_listeners(app)
 
 app.blueprint(get_api_blueprints(API_VERSION))
 
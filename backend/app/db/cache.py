@@ -0,0 +1,21 @@
+from sanic.log import logger
+from app.db.config import CACHE_REDIS_URL
+
+async def init_cache(app):
+    if CACHE_REDIS_URL:
+        import redis.asyncio
+        app.ctx.redis = redis.asyncio.from_url(CACHE_REDIS_URL)
+        logger.info(f"Shared cache: {CACHE_REDIS_URL}")
+    else:
+        # A per-worker stand-in would keep serving entries another worker invalidated, so go without.
+        app.ctx.redis = None
+        logger.warning("CACHE_REDIS_URL not set; caches are per-worker only")
+
+async def close_cache(app):
+    redis = getattr(app.ctx, "redis", None)
+    if redis is not None:
+        await redis.aclose()
+
+def get_shared_cache(app):
+    """The shared tier client, or None when there is no shared tier (no CACHE_REDIS_URL, scripts, benchmarks)."""
+    return getattr(app.ctx, "redis", None)
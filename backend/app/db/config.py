@@ -18,4 +18,71 @@ if isinstance(MONGO_HOSTS, str):
 
 MONGO_URI = f"mongodb+srv://{MONGO_USER}:{MONGO_PASS}@{MONGO_HOSTS[0]}/{DB_NAME}?retryWrites=true&w=majority"
 
-API_VERSION = config.get("API_VERSION", "v1") 
\ No newline at end of file
+API_VERSION = config.get("API_VERSION", "v1") 
+
+# Browser/CDN cache lifetime of the pre-serialized step, intro and search responses (they also carry an ETag).
+STATIC_RESPONSE_MAX_AGE = int(os.getenv("STATIC_RESPONSE_MAX_AGE", config.get("API", {}).get("STATIC_MAX_AGE", 300)))
+
+activity_conf = config.get("ACTIVITY", {})
+
+ACTIVITY_STORAGE = os.getenv("ACTIVITY_STORAGE", activity_conf.get("STORAGE", "bucketed"))
+ACTIVITY_BUCKET_MAX_ENTRIES = int(os.getenv("ACTIVITY_BUCKET_MAX_ENTRIES", activity_conf.get("BUCKET_MAX_ENTRIES", 200)))
+# Entries older than this many days are moved to the compressed `activity_archive` tier by scripts.archive_activity.
+ACTIVITY_ARCHIVE_AFTER_DAYS = int(os.getenv("ACTIVITY_ARCHIVE_AFTER_DAYS", activity_conf.get("ARCHIVE_AFTER_DAYS", 90)))
+
+stream_conf = activity_conf.get("STREAM", {})
+
+# Live dashboard streams (GET /activity/stream), per worker process.
+ACTIVITY_STREAM_MAX_CONNECTIONS = int(os.getenv("ACTIVITY_STREAM_MAX_CONNECTIONS", stream_conf.get("MAX_CONNECTIONS", 10000)))
+ACTIVITY_STREAM_HEARTBEAT_SECONDS = float(os.getenv("ACTIVITY_STREAM_HEARTBEAT_SECONDS", stream_conf.get("HEARTBEAT_SECONDS", 15)))
+# A client that can't take an event within this many seconds is disconnected (it reconnects and gets a fresh snapshot).
+ACTIVITY_STREAM_SEND_TIMEOUT_SECONDS = float(os.getenv("ACTIVITY_STREAM_SEND_TIMEOUT_SECONDS", stream_conf.get("SEND_TIMEOUT_SECONDS", 10)))
+
+coalesce_conf = activity_conf.get("COALESCE", {})
+
+ACTIVITY_COALESCE_ENABLED = str(os.getenv("ACTIVITY_COALESCE_ENABLED", coalesce_conf.get("ENABLED", False))).lower() in ("1", "true")
+ACTIVITY_COALESCE_MAX_DELAY_MS = float(os.getenv("ACTIVITY_COALESCE_MAX_DELAY_MS", coalesce_conf.get("MAX_DELAY_MS", 5)))
+ACTIVITY_COALESCE_MAX_BATCH = int(os.getenv("ACTIVITY_COALESCE_MAX_BATCH", coalesce_conf.get("MAX_BATCH", 100)))
+
+# Distinct per host (0-31); combined with the Sanic worker index to give each process a unique id space.
+NODE_ID = int(os.getenv("NODE_ID", config.get("NODE_ID", 0)))
+# Slot (0-31) for a process on this host that isn't a Sanic worker but creates ids; must not match a worker index.
+ID_PROCESS_SLOT = os.getenv("ID_PROCESS_SLOT", config.get("ID_PROCESS_SLOT"))
+ID_PROCESS_SLOT = int(ID_PROCESS_SLOT) if ID_PROCESS_SLOT not in (None, "") else None
+
+auth_conf = config.get("AUTH", {})
+
+# bcrypt cost for new hashes; existing hashes with another cost are rehashed on the next successful login.
+AUTH_BCRYPT_ROUNDS = int(os.getenv("AUTH_BCRYPT_ROUNDS", auth_conf.get("BCRYPT_ROUNDS", 12)))
+# Threads per worker process for bcrypt, and the most hashes in progress at once.
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", auth_conf.get("HASH_WORKERS", min(4, os.cpu_count() or 1))))
+# Threads hashing the passwords of POST /users/import, kept apart from the login pool above.
+AUTH_IMPORT_HASH_WORKERS = int(os.getenv("AUTH_IMPORT_HASH_WORKERS", auth_conf.get("IMPORT_HASH_WORKERS", 1)))
+# Most rows one POST /users/import may carry; larger files go through scripts.import_users.
+AUTH_IMPORT_MAX_ROWS = int(os.getenv("AUTH_IMPORT_MAX_ROWS", auth_conf.get("IMPORT_MAX_ROWS", 500)))
+
+# HMAC key for access tokens; must be the same on every worker and host. Set it through the
+# AUTH_TOKEN_SECRET env var rather than config.json. Empty disables token login, which is only
+# allowed while REQUIRE_TOKEN is off.
+AUTH_TOKEN_SECRET = os.getenv("AUTH_TOKEN_SECRET", auth_conf.get("TOKEN_SECRET", ""))
+AUTH_TOKEN_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_TTL_SECONDS", auth_conf.get("TOKEN_TTL_SECONDS", 3600)))
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", auth_conf.get("TOKEN_CACHE_SIZE", 10000)))
+AUTH_REVOCATION_REFRESH_SECONDS = float(os.getenv("AUTH_REVOCATION_REFRESH_SECONDS", auth_conf.get("REVOCATION_REFRESH_SECONDS", 10)))
+# When false, requests without a token may still name their user with a `user_id` parameter.
+AUTH_REQUIRE_TOKEN = str(os.getenv("AUTH_REQUIRE_TOKEN", auth_conf.get("REQUIRE_TOKEN", False))).lower() in ("1", "true")
+# User ids allowed to call admin endpoints (e.g. POST /users/import); comma-separated in the environment.
+AUTH_ADMIN_USER_IDS = frozenset(u.strip() for u in (os.getenv("AUTH_ADMIN_USER_IDS") or ",".join(auth_conf.get("ADMIN_USER_IDS", []))).split(",") if u.strip())
+
+cache_conf = config.get("CACHE", {})
+
+# Shared cache tier (redis://...). Empty means no shared tier: each worker caches on its own.
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", cache_conf.get("REDIS_URL", ""))
+
+user_config_conf = config.get("USER_CONFIG", {})
+
+# Encoded /api/wellness/config responses kept per worker. Updates drop the entry on the worker that
+# handled them; other workers serve theirs for up to the TTL.
+USER_CONFIG_CACHE_SIZE = int(os.getenv("USER_CONFIG_CACHE_SIZE", user_config_conf.get("CACHE_SIZE", 10000)))
+USER_CONFIG_CACHE_TTL_SECONDS = float(os.getenv("USER_CONFIG_CACHE_TTL_SECONDS", user_config_conf.get("CACHE_TTL_SECONDS", 30)))
+# How long an encoded config stays in the shared tier; updates invalidate it before then.
+USER_CONFIG_SHARED_TTL_SECONDS = int(os.getenv("USER_CONFIG_SHARED_TTL_SECONDS", user_config_conf.get("SHARED_TTL_SECONDS", 3600)))
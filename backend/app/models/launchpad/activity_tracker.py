@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Optional
 
+from app.utils.snowflake import SnowflakeId
+
 class Stat(BaseModel):
     current: float
     goal: float
@@ -20,7 +22,7 @@ class WeeklyStats(BaseModel):
     labels: List[str]
 
 class Activity(BaseModel):
-    id: int
+    id: SnowflakeId
     type: str
     title: str
     duration: int
@@ -29,6 +31,34 @@ class Activity(BaseModel):
     timestamp: str
     intensity: str
 
+# Validates a whole batch of entries in one call into pydantic-core.
+ActivityList = TypeAdapter(List[Activity])
+
+class ActivityRecord:
+    """Unvalidated, slotted stand-in for `Activity`, for entries read back from our own database.
+
+    Every stored entry was validated by `Activity` when it was written, so reads skip pydantic.
+    Never build one from client input.
+    """
+    __slots__ = ("id", "type", "title", "duration", "calories", "steps", "timestamp", "intensity")
+
+    def __init__(self, doc: dict):
+        self.id = doc["id"]
+        self.type = doc["type"]
+        self.title = doc["title"]
+        self.duration = doc["duration"]
+        self.calories = doc["calories"]
+        self.steps = doc["steps"]
+        self.timestamp = doc["timestamp"]
+        self.intensity = doc["intensity"]
+
+    def model_dump(self, mode: str = "python") -> dict:
+        """Same name and `mode` as on pydantic models, so callers can treat records and `Activity` alike."""
+        return {
+            "id": str(self.id) if mode == "json" else self.id, "type": self.type, "title": self.title, "duration": self.duration,
+            "calories": self.calories, "steps": self.steps, "timestamp": self.timestamp, "intensity": self.intensity,
+        }
+
 class DailyGoals(BaseModel):
     steps: int
     calories: int
@@ -58,4 +88,13 @@ class ActivityTracker(BaseModel):
     weeklyStats: WeeklyStats
     activities: List[Activity]
     goals: Goals
-    achievements: List[Achievement] 
\ No newline at end of file
+    achievements: List[Achievement]
+
+TRACKER_FIELDS = ("todayStats", "weeklyStats", "activities", "goals", "achievements")
+
+def tracker_from_document(doc: dict) -> dict:
+    """Trusted read of a stored tracker: keep the `ActivityTracker` fields without re-validating them."""
+    tracker = {name: doc.get(name) for name in TRACKER_FIELDS}
+    if tracker["activities"] is not None:
+        tracker["activities"] = [ActivityRecord(a) for a in tracker["activities"]]
+    return tracker
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ValidationError, root_validator
+from pydantic import BaseModel, model_validator
 from typing import List, Dict, Any, Optional
 from .hra import HraStep
 
@@ -11,9 +11,10 @@ class AssessmentTemplatePayload(BaseModel):
 class AssessmentAnswersPayload(BaseModel):
     answers: Dict[str, Any]  # question_id -> answer value
 
-    @root_validator(pre=True)
-    def check_answers_not_empty(cls, values):
-        answers = values.get('answers')
+    @model_validator(mode='before')
+    @classmethod
+    def check_answers_not_empty(cls, values: Any) -> Any:
+        answers = values.get('answers') if isinstance(values, dict) else None
         if not answers or not isinstance(answers, dict):
             raise ValueError('Answers must be a non-empty dictionary')
         return values 
\ No newline at end of file
@@ -1,16 +1,38 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, SerializationInfo, field_serializer
 from typing import List, Dict, Any
 
+from app.utils.casing import to_camel_case, keys_to_camel
+
+# Fields accept either spelling; `model_dump(by_alias=True)` writes camelCase for the API.
+CAMEL_CONFIG = ConfigDict(alias_generator=to_camel_case, populate_by_name=True)
+
 class Widget(BaseModel):
+    model_config = CAMEL_CONFIG
+
     widget_id: int
     widget_name: str
     value: Any
 
+    @field_serializer('value', mode='wrap')
+    def camel_value(self, value: Any, handler, info: SerializationInfo):
+        return keys_to_camel(handler(value)) if info.by_alias else handler(value)
+
 class Form(BaseModel):
+    model_config = CAMEL_CONFIG
+
     tabs: List[str]
     widgets: Dict[str, List[Widget]]
 
+    @field_serializer('widgets', mode='wrap')
+    def camel_widget_keys(self, widgets: Dict[str, List[Widget]], handler, info: SerializationInfo):
+        # Tab names are data, not fields, so the alias generator doesn't reach them.
+        data = handler(widgets)
+        return {to_camel_case(k): v for k, v in data.items()} if info.by_alias else data
+
 class User(BaseModel):
-    id: int
+    # `id` is the account's user id; configs saved before accounts existed have numeric ids.
+    model_config = ConfigDict(**CAMEL_CONFIG, coerce_numbers_to_str=True)
+
+    id: str
     name: str
-    form: Form 
\ No newline at end of file
+    form: Form
@@ -11,6 +11,10 @@ from .v1.activity import activity_bp as activity_v1_bp
 from .v1.search import search_bp as search_v1_bp
 from .v1.user_progress import user_progress_bp as user_progress_v1_bp
 from .v1.navigation import navigation_bp as navigation_v1_bp
+from .v1.samples import samples_bp as samples_v1_bp
+from .v1.sync import sync_bp as sync_v1_bp
+from .v1.auth import auth_bp as auth_v1_bp
+from .v1.users import users_bp as users_v1_bp
 
 from .v2.home import home_bp as home_v2_bp
 from .v2.wellness_config import wellness_config_bp as wellness_config_v2_bp
@@ -24,6 +28,10 @@ from .v2.activity import activity_bp as activity_v2_bp
 from .v2.search import search_bp as search_v2_bp
 from .v2.user_progress import user_progress_bp as user_progress_v2_bp
 from .v2.navigation import navigation_bp as navigation_v2_bp
+from .v2.samples import samples_bp as samples_v2_bp
+from .v2.sync import sync_bp as sync_v2_bp
+from .v2.auth import auth_bp as auth_v2_bp
+from .v2.users import users_bp as users_v2_bp
 
 v1_blueprints = Blueprint.group(
     wellness_config_v1_bp,
@@ -38,6 +46,10 @@ v1_blueprints = Blueprint.group(
     search_v1_bp,
     user_progress_v1_bp,
     navigation_v1_bp,
+    samples_v1_bp,
+    sync_v1_bp,
+    auth_v1_bp,
+    users_v1_bp,
     url_prefix="/v1/api"
 )
 
@@ -54,6 +66,10 @@ v2_blueprints = Blueprint.group(
     search_v2_bp,
     user_progress_v2_bp,
     navigation_v2_bp,
+    samples_v2_bp,
+    sync_v2_bp,
+    auth_v2_bp,
+    users_v2_bp,
     url_prefix="/v2/api"
 )
 
@@ -1,25 +1,70 @@
-from sanic import Blueprint, response, Request
+import asyncio
+from datetime import datetime
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response, dumps
+from app.services.activity_service import ActivityService, ActivityServiceException, parse_history_cursor, MAX_TREND_WINDOW, SERIES_METHODS
+from app.services.activity_events import STATS
+from app.services.token_service import request_user_id
+from app.db.config import ACTIVITY_STREAM_HEARTBEAT_SECONDS, ACTIVITY_STREAM_SEND_TIMEOUT_SECONDS
+
+MAX_BULK_ENTRIES = 1000
+MAX_HISTORY_PAGE = 500
+MAX_SERIES_RESOLUTION = 2000
+# EventSource reconnect delay sent to stream clients.
+STREAM_RETRY_MS = 3000
 
 activity_bp = Blueprint('activity', url_prefix='/activity')
 
 @activity_bp.route('/dashboard')
 async def activity_dashboard(request: Request):
-    return response.json({
-        "todayStats": {"steps": 8000, "calories": 500, "activeMinutes": 45},
-        "weeklyStats": {"steps": 56000, "calories": 3500, "activeMinutes": 315},
-        "activities": [
-            {"id": 1, "type": "walk", "title": "Morning Walk", "duration": 30, "calories": 120, "timestamp": "2025-06-26T06:30:00Z"},
-            {"id": 2, "type": "yoga", "title": "Yoga Session", "duration": 45, "calories": 180, "timestamp": "2025-06-25T07:00:00Z"}
-        ],
-        "goals": {"steps": 10000, "calories": 600, "activeMinutes": 60},
-        "achievements": [
-            {"id": 1, "title": "10K Steps!", "description": "You walked 10,000 steps in a day!", "date": "2025-06-24"}
-        ]
-    })
+    user_id = request_user_id(request, request.args.get("user_id"))
+    if not user_id:
+        return json_response({"error": "user_id is required"}, status=400)
+    try:
+        dashboard = await ActivityService(request.app).get_dashboard(user_id)
+    except ActivityServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response(dashboard)
+
+@activity_bp.route('/stream')
+async def activity_stream(request: Request):
+    """Server-Sent Events: `stats` ({"todayStats"}) on connect and after every write, `achievement` when one is earned."""
+    user_id = request_user_id(request, request.args.get("user_id"))
+    if not user_id:
+        return json_response({"error": "user_id is required"}, status=400)
+    service = ActivityService(request.app)
+    subscription = service.events.subscribe(user_id)
+    if subscription is None:
+        return json_response({"error": "Too many live connections, retry later"}, status=503, headers={"Retry-After": "5"})
+    try:
+        try:
+            # Start every (re)connect from a snapshot so the client never shows stale stats.
+            subscription.offer(STATS, {"todayStats": await service.get_today_stats(user_id)})
+        except ActivityServiceException as e:
+            return json_response({"error": str(e)}, status=500)
+        resp = await request.respond(content_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+        await resp.send(f"retry: {STREAM_RETRY_MS}\n\n")
+        while True:
+            # Heartbeats keep proxies from closing idle streams and Sanic's response timeout from firing.
+            ready = await subscription.wait(ACTIVITY_STREAM_HEARTBEAT_SECONDS)
+            chunk = subscription.drain() if ready else ": heartbeat\n\n"
+            try:
+                await asyncio.wait_for(resp.send(chunk), ACTIVITY_STREAM_SEND_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                # The client's socket buffer stayed full; drop it rather than hold its backlog.
+                service.events.record_slow_consumer()
+                request.transport.abort()
+                return
+    finally:
+        service.events.unsubscribe(subscription)
+
+@activity_bp.route('/metrics/stream')
+async def activity_stream_metrics(request: Request):
+    return json_response(ActivityService(request.app).events.metrics())
 
 @activity_bp.route('/log', methods=["POST"])
 async def activity_log(request: Request):
-    return response.json({
+    return json_response({
         "success": True,
         "activityId": "activity_123",
         "updatedStats": {"steps": 8500, "calories": 520, "activeMinutes": 50}
@@ -27,7 +72,117 @@ async def activity_log(request: Request):
 
 @activity_bp.route('/goals/update', methods=["POST"])
 async def activity_goals_update(request: Request):
-    return response.json({
+    return json_response({
         "success": True,
         "updatedGoals": {"steps": 12000, "calories": 700, "activeMinutes": 70}
-    }) 
\ No newline at end of file
+    }) 
+
+@activity_bp.route('/bulk', methods=["POST"])
+async def activity_bulk(request: Request):
+    body = request.json or {}
+    user_id = request_user_id(request, body.get("user_id"))
+    activities = body.get("activities")
+    if not user_id or not isinstance(activities, list):
+        return json_response({"error": "user_id and an activities list are required"}, status=400)
+    if len(activities) > MAX_BULK_ENTRIES:
+        return json_response({"error": f"At most {MAX_BULK_ENTRIES} activities per request"}, status=413)
+    try:
+        results = await ActivityService(request.app).add_activity_entries(user_id, activities)
+    except ActivityServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    accepted = sum(1 for r in results if r["success"])
+    return json_response({
+        "success": accepted == len(results),
+        "accepted": accepted,
+        "rejected": len(results) - accepted,
+        "results": results
+    })
+
+@activity_bp.route('/history')
+async def activity_history(request: Request):
+    user_id = request_user_id(request, request.args.get("user_id"))
+    activity_type = request.args.get("type")
+    if not user_id or not activity_type:
+        return json_response({"error": "user_id and type are required"}, status=400)
+    start_date, end_date = request.args.get("start"), request.args.get("end")
+    try:
+        for value in (start_date, end_date):
+            if value:
+                datetime.fromisoformat(value)
+    except ValueError:
+        return json_response({"error": "start and end must be ISO timestamps"}, status=400)
+    service = ActivityService(request.app)
+    if request.args.get("resolution"):
+        # Chart mode: at most `resolution` downsampled points instead of raw entries.
+        try:
+            resolution = min(int(request.args["resolution"]), MAX_SERIES_RESOLUTION)
+        except ValueError:
+            return json_response({"error": "resolution must be an integer"}, status=400)
+        method = request.args.get("method", "lttb")
+        if resolution < 3 or method not in SERIES_METHODS:
+            return json_response({"error": f"resolution must be at least 3 and method one of {', '.join(SERIES_METHODS)}"}, status=400)
+        try:
+            points = await service.get_series(user_id, activity_type, resolution, method, start_date, end_date)
+        except ActivityServiceException as e:
+            return json_response({"error": str(e)}, status=500)
+        return json_response({"points": points, "method": method, "resolution": resolution})
+    if request.args.get("format") == "ndjson":
+        # Full export: write entries as they come off the cursor instead of building a page. Lines are
+        # in day order (archived days first), not sorted by timestamp within a day.
+        resp = await request.respond(content_type="application/x-ndjson")
+        try:
+            async for entry in service.stream_activity_history(user_id, activity_type, start_date, end_date):
+                await resp.send(dumps(entry) + b"\n")
+        except ActivityServiceException as e:
+            # The 200 status is already sent, so a final `{"error"}` line tells the client the export is incomplete.
+            await resp.send(dumps({"error": str(e)}) + b"\n")
+        await resp.eof()
+        return
+    try:
+        limit = min(int(request.args.get("limit", 100)), MAX_HISTORY_PAGE)
+        after = parse_history_cursor(request.args["after"]) if request.args.get("after") else None
+    except ValueError:
+        return json_response({"error": "Invalid limit or after cursor"}, status=400)
+    if limit < 1:
+        return json_response({"error": "limit must be positive"}, status=400)
+    try:
+        page = await service.get_activity_history_page(user_id, activity_type, after, limit, start_date, end_date)
+    except ActivityServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response({
+        "activities": page["items"],
+        "next": page["next"]
+    })
+
+@activity_bp.route('/trends')
+async def activity_trends(request: Request):
+    user_id = request_user_id(request, request.args.get("user_id"))
+    if not user_id:
+        return json_response({"error": "user_id is required"}, status=400)
+    types = [t for t in request.args.get("types", "").split(",") if t] or None
+    try:
+        window = int(request.args.get("window", 30))
+    except ValueError:
+        return json_response({"error": "window must be an integer"}, status=400)
+    if not 1 <= window <= MAX_TREND_WINDOW:
+        return json_response({"error": f"window must be between 1 and {MAX_TREND_WINDOW} days"}, status=400)
+    try:
+        result = await ActivityService(request.app).get_trends(user_id, types, window)
+    except ActivityServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response(result)
+
+@activity_bp.route('/metrics/writes')
+async def activity_write_metrics(request: Request):
+    return json_response(ActivityService(request.app).get_write_metrics())
+
+@activity_bp.route('/achievements')
+async def activity_achievements(request: Request):
+    user_id = request_user_id(request, request.args.get("user_id"))
+    if not user_id:
+        return json_response({"error": "user_id is required"}, status=400)
+    try:
+        achievements = await ActivityService(request.app).get_achievements(user_id)
+    except ActivityServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response({"achievements": achievements})
@@ -0,0 +1,24 @@
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.services.sync_service import SyncService, SyncServiceException, DEFAULT_SYNC_LIMIT
+from app.services.token_service import request_user_id
+
+sync_bp = Blueprint('sync', url_prefix='/sync')
+
+@sync_bp.route('/')
+async def sync_changes(request: Request):
+    user_id = request_user_id(request, request.args.get("user_id"))
+    if not user_id:
+        return json_response({"error": "user_id is required"}, status=400)
+    try:
+        since = int(request.args.get("since", 0))
+        limit = min(int(request.args.get("limit", DEFAULT_SYNC_LIMIT)), DEFAULT_SYNC_LIMIT)
+    except ValueError:
+        return json_response({"error": "since and limit must be integers"}, status=400)
+    if since < 0 or limit < 1:
+        return json_response({"error": "since must be >= 0 and limit positive"}, status=400)
+    try:
+        result = await SyncService(request.app).get_changes(user_id, since, limit)
+    except SyncServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response(result)
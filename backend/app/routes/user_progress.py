@@ -1,10 +1,11 @@
-from sanic import Blueprint, response, Request
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
 
 user_progress_bp = Blueprint('user_progress', url_prefix='/user/progress')
 
 @user_progress_bp.route('/')
 async def user_progress_get(request: Request):
-    return response.json({
+    return json_response({
         "completionStatus": {"onboarding": True, "profile": False, "hra": False},
         "currentStep": {"onboarding": 5, "profile": 2, "hra": 1},
         "overallProgress": 60
@@ -12,7 +13,7 @@ async def user_progress_get(request: Request):
 
 @user_progress_bp.route('/update', methods=["POST"])
 async def user_progress_update(request: Request):
-    return response.json({
+    return json_response({
         "success": True,
         "updatedProgress": {"onboarding": True, "profile": True, "hra": True}
     }) 
\ No newline at end of file
@@ -0,0 +1,40 @@
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.services.user_service import UserService, UserServiceException
+from app.services.token_service import require_admin
+from app.services.user_import import csv_records, ndjson_records, ImportTooLarge
+from app.db.config import AUTH_IMPORT_MAX_ROWS
+
+IMPORT_FORMATS = {"csv": csv_records, "ndjson": ndjson_records}
+
+users_bp = Blueprint('users', url_prefix='/users')
+
+async def request_lines(request: Request):
+    """Decode a streamed request body line by line, without buffering all of it."""
+    pending = b""
+    while True:
+        chunk = await request.stream.read()
+        if chunk is None:
+            break
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8-sig").rstrip("\r")
+
+@users_bp.route('/import', methods=["POST"], stream=True)
+async def users_import(request: Request):
+    """Bulk-create up to AUTH_IMPORT_MAX_ROWS users from a CSV (header: email,name[,password]) or NDJSON body; rows without a password are invited."""
+    # Creates accounts and returns their invite tokens, so only admins may call it.
+    require_admin(request)
+    fmt = request.args.get("format") or ("ndjson" if "ndjson" in request.headers.get("content-type", "") else "csv")
+    if fmt not in IMPORT_FORMATS:
+        return json_response({"error": f"format must be one of {', '.join(IMPORT_FORMATS)}"}, status=400)
+    try:
+        report = await UserService(request.app).import_users(IMPORT_FORMATS[fmt](request_lines(request)), max_rows=AUTH_IMPORT_MAX_ROWS)
+    except ImportTooLarge as e:
+        return json_response({"error": str(e)}, status=413)
+    except UserServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response(report)
@@ -1,4 +1,6 @@
-from sanic import Blueprint, response, Request
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.utils.static_response import static_payloads, static_json
 
 goals_bp = Blueprint('goals', url_prefix='/goals')
 
@@ -30,17 +32,19 @@ GOALS_MOCK = {
     }
 }
 
+GOALS_PAYLOADS = static_payloads(GOALS_MOCK)
+
 @goals_bp.route('/<step:int>')
 async def goals_step(request: Request, step: int):
-    data = GOALS_MOCK.get(step)
-    if not data:
-        return response.json({"error": "Step not found"}, status=404)
-    return response.json(data)
+    payload = GOALS_PAYLOADS.get(step)
+    if not payload:
+        return json_response({"error": "Step not found"}, status=404)
+    return static_json(request, payload)
 
 @goals_bp.route('/<step:int>/save', methods=["POST"])
 async def goals_save(request: Request, step: int):
     # Mock response for saving goals step
-    return response.json({
+    return json_response({
         "success": True,
         "recommendations": ["Keep up the good work!"],
         "nextStep": step + 1
@@ -1,4 +1,6 @@
-from sanic import Blueprint, response, Request
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.utils.static_response import static_payloads, static_json
 
 onboarding_bp = Blueprint('onboarding', url_prefix='/onboarding')
 
@@ -59,17 +61,19 @@ ONBOARDING_MOCK = {
     }
 }
 
+ONBOARDING_PAYLOADS = static_payloads(ONBOARDING_MOCK)
+
 @onboarding_bp.route('/<step:int>')
 async def onboarding_step(request: Request, step: int):
-    data = ONBOARDING_MOCK.get(step)
-    if not data:
-        return response.json({"error": "Step not found"}, status=404)
-    return response.json(data)
+    payload = ONBOARDING_PAYLOADS.get(step)
+    if not payload:
+        return json_response({"error": "Step not found"}, status=404)
+    return static_json(request, payload)
 
 @onboarding_bp.route('/<step:int>/save', methods=["POST"])
 async def onboarding_save(request: Request, step: int):
     # Mock response for saving onboarding step
-    return response.json({
+    return json_response({
         "success": True,
         "nextStep": step + 2,
         "message": f"Step {step} saved successfully."
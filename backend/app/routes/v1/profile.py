@@ -1,4 +1,6 @@
-from sanic import Blueprint, response, Request
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.utils.static_response import static_payloads, static_json
 
 profile_bp = Blueprint('profile', url_prefix='/profile')
 
@@ -42,17 +44,19 @@ PROFILE_MOCK = {
     }
 }
 
+PROFILE_PAYLOADS = static_payloads(PROFILE_MOCK)
+
 @profile_bp.route('/basic/<step:int>')
 async def basic_profile_step(request: Request, step: int):
-    data = PROFILE_MOCK.get(step)
-    if not data:
-        return response.json({"error": "Step not found"}, status=404)
-    return response.json(data)
+    payload = PROFILE_PAYLOADS.get(step)
+    if not payload:
+        return json_response({"error": "Step not found"}, status=404)
+    return static_json(request, payload)
 
 @profile_bp.route('/basic/<step:int>/save', methods=["POST"])
 async def profile_save(request: Request, step: int):
     # Mock response for saving profile step
-    return response.json({
+    return json_response({
         "success": True,
         "validationErrors": {},
         "nextStep": step + 1
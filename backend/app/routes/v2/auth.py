@@ -0,0 +1,53 @@
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.services.user_service import UserService, UserServiceException
+from app.services.token_service import TokenService, TokenServiceException
+
+auth_bp = Blueprint('auth', url_prefix='/auth')
+
+@auth_bp.route('/login', methods=["POST"])
+async def auth_login(request: Request):
+    body = request.json or {}
+    email, password = body.get("email"), body.get("password")
+    if not email or not password:
+        return json_response({"error": "email and password are required"}, status=400)
+    try:
+        user_id = await UserService(request.app).authenticate(email, password)
+    except UserServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    if user_id is None:
+        return json_response({"error": "Invalid email or password"}, status=401)
+    try:
+        token = await TokenService(request.app).issue(user_id)
+    except TokenServiceException as e:
+        return json_response({"error": str(e)}, status=503)
+    return json_response({"user_id": user_id, **token})
+
+@auth_bp.route('/logout', methods=["POST"])
+async def auth_logout(request: Request):
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return json_response({"error": "A Bearer token is required"}, status=401)
+    try:
+        revoked = await TokenService(request.app).revoke(token)
+    except TokenServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response({"success": revoked})
+
+@auth_bp.route('/invite/accept', methods=["POST"])
+async def auth_accept_invite(request: Request):
+    body = request.json or {}
+    invite_token, password = body.get("invite_token"), body.get("password")
+    if not invite_token or not password:
+        return json_response({"error": "invite_token and password are required"}, status=400)
+    try:
+        user_id = await UserService(request.app).accept_invite(invite_token, password)
+    except UserServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    if user_id is None:
+        return json_response({"error": "Invite is invalid or has expired"}, status=404)
+    try:
+        token = await TokenService(request.app).issue(user_id)
+    except TokenServiceException as e:
+        return json_response({"error": str(e)}, status=503)
+    return json_response({"user_id": user_id, **token})
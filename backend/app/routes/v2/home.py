@@ -1,10 +1,11 @@
-from sanic import Blueprint, response, Request
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
 
 home_bp = Blueprint('home', url_prefix='/home')
 
 @home_bp.route('/')
 async def home_handler(request: Request):
-    return response.json({
+    return json_response({
         "userName": "John Doe",
         "healthScore": 85,
         "dailyGoals": [
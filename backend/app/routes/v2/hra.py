@@ -1,4 +1,6 @@
-from sanic import Blueprint, response, Request
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.utils.static_response import static_payloads, static_json
 
 hra_bp = Blueprint('hra', url_prefix='/hra')
 
@@ -68,17 +70,19 @@ HRA_MOCK = {
     }
 }
 
+HRA_PAYLOADS = static_payloads(HRA_MOCK)
+
 @hra_bp.route('/<step:int>')
 async def hra_step(request: Request, step: int):
-    data = HRA_MOCK.get(step)
-    if not data:
-        return response.json({"error": "Step not found"}, status=404)
-    return response.json(data)
+    payload = HRA_PAYLOADS.get(step)
+    if not payload:
+        return json_response({"error": "Step not found"}, status=404)
+    return static_json(request, payload)
 
 @hra_bp.route('/<step:int>/save', methods=["POST"])
 async def hra_save(request: Request, step: int):
     # Mock response for saving HRA step
-    return response.json({
+    return json_response({
         "success": True,
         "riskAssessment": {"risk": "Low"},
         "recommendations": ["Stay healthy!"],
@@ -88,7 +92,7 @@ async def hra_save(request: Request, step: int):
 @hra_bp.route('/report')
 async def hra_report(request: Request):
     # Mock HRA report response
-    return response.json({
+    return json_response({
         "overallRisk": "Low",
         "riskFactors": ["Sedentary lifestyle", "Poor diet quality"],
         "recommendations": [
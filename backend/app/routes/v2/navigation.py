@@ -1,10 +1,11 @@
-from sanic import Blueprint, response, Request
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
 
 navigation_bp = Blueprint('navigation', url_prefix='/navigation')
 
 @navigation_bp.route('/save-continue', methods=["POST"])
 async def navigation_save_continue(request: Request):
-    return response.json({
+    return json_response({
         "success": True,
         "nextRoute": "/api/v1/onboarding/2",
         "nextStep": 2,
@@ -13,7 +14,7 @@ async def navigation_save_continue(request: Request):
 
 @navigation_bp.route('/save-exit', methods=["POST"])
 async def navigation_save_exit(request: Request):
-    return response.json({
+    return json_response({
         "success": True,
         "resumeToken": "resume_abc123",
         "message": "Progress saved. You can resume later."
@@ -0,0 +1,42 @@
+from datetime import datetime
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.services.sample_service import SampleService, SampleServiceException, SAMPLE_METRICS
+from app.services.token_service import request_user_id
+
+MAX_BULK_SAMPLES = 20000
+
+samples_bp = Blueprint('samples', url_prefix='/samples')
+
+@samples_bp.route('/bulk', methods=["POST"])
+async def samples_bulk(request: Request):
+    body = request.json or {}
+    user_id, metric, samples = request_user_id(request, body.get("user_id")), body.get("metric"), body.get("samples")
+    if not user_id or metric not in SAMPLE_METRICS or not isinstance(samples, list):
+        return json_response({"error": f"user_id, a metric ({', '.join(SAMPLE_METRICS)}) and a samples list are required"}, status=400)
+    if len(samples) > MAX_BULK_SAMPLES:
+        return json_response({"error": f"At most {MAX_BULK_SAMPLES} samples per request"}, status=413)
+    try:
+        result = await SampleService(request.app).add_samples(user_id, metric, samples)
+    except SampleServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response({"success": not result["rejected"], **result})
+
+@samples_bp.route('/')
+async def samples_range(request: Request):
+    user_id, metric = request_user_id(request, request.args.get("user_id")), request.args.get("metric")
+    if not user_id or metric not in SAMPLE_METRICS:
+        return json_response({"error": f"user_id and a metric ({', '.join(SAMPLE_METRICS)}) are required"}, status=400)
+    start, end = request.args.get("start"), request.args.get("end")
+    try:
+        for value in (start, end):
+            if value:
+                datetime.fromisoformat(value)
+    except ValueError:
+        return json_response({"error": "start and end must be ISO timestamps"}, status=400)
+    try:
+        times, values = await SampleService(request.app).get_samples(user_id, metric, start, end)
+    except SampleServiceException as e:
+        return json_response({"error": str(e)}, status=500)
+    # Epoch seconds keep a day of per-minute samples small on the wire.
+    return json_response({"metric": metric, "timestamps": times.astype("int64"), "values": values})
@@ -1,18 +1,22 @@
-from sanic import Blueprint, response, Request
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.utils.static_response import StaticJSON, static_json
 
 search_bp = Blueprint('search', url_prefix='/search')
 
+SEARCH_DEFAULTS = StaticJSON({
+    "suggestions": ["Weight loss exercises", "Healthy breakfast recipes", "Stress management techniques"],
+    "popularSearches": ["cardio workout", "meditation", "protein recipes"],
+    "filters": {"categories": ["All", "Exercise", "Nutrition"], "difficulty": ["All", "Beginner"], "duration": ["All", "10-30 min"]}
+})
+
 @search_bp.route('/')
 async def search_get(request: Request):
-    return response.json({
-        "suggestions": ["Weight loss exercises", "Healthy breakfast recipes", "Stress management techniques"],
-        "popularSearches": ["cardio workout", "meditation", "protein recipes"],
-        "filters": {"categories": ["All", "Exercise", "Nutrition"], "difficulty": ["All", "Beginner"], "duration": ["All", "10-30 min"]}
-    })
+    return static_json(request, SEARCH_DEFAULTS)
 
 @search_bp.route('/query', methods=["POST"])
 async def search_query(request: Request):
-    return response.json({
+    return json_response({
         "results": [
             {"id": 1, "type": "exercise", "title": "Push-ups", "description": "Chest and arm strengthening exercise"},
             {"id": 2, "type": "recipe", "title": "Protein Smoothie", "description": "High-protein breakfast smoothie"}
@@ -1,4 +1,6 @@
-from sanic import Blueprint, response, Request
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.utils.static_response import static_payloads, static_json
 
 trackers_bp = Blueprint('trackers', url_prefix='/trackers')
 
@@ -34,17 +36,19 @@ TRACKERS_MOCK = {
     }
 }
 
+TRACKERS_PAYLOADS = static_payloads(TRACKERS_MOCK)
+
 @trackers_bp.route('/<step:int>')
 async def trackers_step(request: Request, step: int):
-    data = TRACKERS_MOCK.get(step)
-    if not data:
-        return response.json({"error": "Step not found"}, status=404)
-    return response.json(data)
+    payload = TRACKERS_PAYLOADS.get(step)
+    if not payload:
+        return json_response({"error": "Step not found"}, status=404)
+    return static_json(request, payload)
 
 @trackers_bp.route('/<step:int>/save', methods=["POST"])
 async def trackers_save(request: Request, step: int):
     # Mock response for saving trackers step
-    return response.json({
+    return json_response({
         "success": True,
         "configuredTrackers": ["steps", "sleep"],
         "nextStep": step + 1
@@ -1,22 +1,38 @@
-from sanic import Blueprint, response, Request
-from app.services.launchpad.user_service import get_user_config
+from pydantic import ValidationError
+from sanic import Blueprint, Request
+from app.utils.json_response import json_response
+from app.utils.static_response import static_json
+from app.models.launchpad.user import User
+from app.services.launchpad.user_service import EXAMPLE_USER, get_user_config_payload, get_user_config_cache, update_user_config
+from app.services.token_service import request_user_id
 
 wellness_config_bp = Blueprint('wellness_config', url_prefix='/api/wellness')
 
-def to_camel_case(s):
-    parts = s.split('_')
-    return parts[0] + ''.join(word.capitalize() for word in parts[1:])
-
-def keys_to_camel(obj):
-    if isinstance(obj, list):
-        return [keys_to_camel(i) for i in obj]
-    elif isinstance(obj, dict):
-        return {to_camel_case(k): keys_to_camel(v) for k, v in obj.items()}
-    else:
-        return obj
-
 @wellness_config_bp.route('/config')
 async def wellness_config(request: Request):
-    user_config = await get_user_config(request.app)
-    camel_config = keys_to_camel(user_config.model_dump())
-    return response.json(camel_config) 
\ No newline at end of file
+    # Callers without a token or user_id get user 1's config, as before configs were per user.
+    user_id = request_user_id(request, request.args.get("user_id")) or EXAMPLE_USER.id
+    payload = await get_user_config_payload(request.app, user_id)
+    # Per-user content: clients may keep it but must revalidate (cheap 304 via the ETag).
+    return static_json(request, payload, cache_control="private, no-cache")
+
+@wellness_config_bp.route('/config', methods=['PUT'])
+async def update_wellness_config(request: Request):
+    body = request.json or {}
+    if not isinstance(body, dict):
+        return json_response({"error": "Invalid config"}, status=400)
+    # The config's `id` is the user it belongs to, so it must be the caller's own.
+    supplied = body.get("id")
+    user_id = request_user_id(request, str(supplied) if supplied is not None else None)
+    if not user_id:
+        return json_response({"error": "id is required"}, status=400)
+    try:
+        user = User.model_validate({**body, "id": user_id})
+    except ValidationError as e:
+        return json_response({"error": "Invalid config", "details": e.errors(include_url=False, include_context=False)}, status=400)
+    user = await update_user_config(request.app, user)
+    return json_response(user.model_dump(by_alias=True))
+
+@wellness_config_bp.route('/config/metrics')
+async def wellness_config_cache_metrics(request: Request):
+    return json_response(get_user_config_cache(request.app).metrics())
@@ -0,0 +1,209 @@
+"""
+Achievements evaluated incrementally as activity entries are ingested.
+
+Each user has one small `activity_achievements` document holding, per rule, its progress and
+(for streaks) the current run, best run and last qualifying day. Ingest only looks at the day and
+lifetime rollups the new entries touched, and reading achievements is a single document lookup.
+A backfilled streak day (older than the last qualifying one) is the exception: the run around it
+is re-read from the day rollups, so a day that closes a gap joins the runs on both sides.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+from app.services.activity_rollups import DAY, LIFETIME, LIFETIME_KEY
+from app.services.activity_storage import day_key
+
+DAILY_TOTAL = "daily_total"
+STREAK = "streak"
+LIFETIME_TOTAL = "lifetime_total"
+
+# `metric` is the rollup counter a rule reads: "value" (the tracker's own metric) or "count" (entries logged).
+ACHIEVEMENT_RULES: List[Dict[str, Any]] = [
+    {"id": 1, "title": "10K Steps!", "description": "You walked 10,000 steps in a day!", "icon": "steps",
+     "rule": DAILY_TOTAL, "type": "steps", "metric": "value", "target": 10000},
+    {"id": 2, "title": "Week Warrior", "description": "You hit 10,000 steps 7 days in a row!", "icon": "streak",
+     "rule": STREAK, "type": "steps", "metric": "value", "daily_min": 10000, "target": 7},
+    {"id": 3, "title": "Hydration Habit", "description": "You logged water 30 days in a row!", "icon": "water",
+     "rule": STREAK, "type": "water", "metric": "count", "daily_min": 1, "target": 30},
+    {"id": 4, "title": "Million Steps", "description": "You walked 1,000,000 steps!", "icon": "trophy",
+     "rule": LIFETIME_TOTAL, "type": "steps", "metric": "value", "target": 1000000},
+]
+
+# Concurrent ingests for one user retry on a version conflict this many times.
+MAX_UPDATE_ATTEMPTS = 5
+# Day rollups read per query while walking a streak run outwards from a backfilled day.
+RUN_SCAN_DAYS = 62
+
+
+def advance(rule: Dict[str, Any], state: Dict[str, Any], day_totals: Dict[str, float], lifetime: float,
+            runs: Optional[Dict[str, Tuple[str, str]]] = None) -> Dict[str, Any]:
+    """Return a rule's new state given the (updated) totals of the days just written and the lifetime total.
+
+    For streaks, `runs` maps qualifying days older than the last qualifying day (or all of them, for
+    a new state) to the first and last day of the run of qualifying days around them.
+    """
+    state = dict(state)
+    target = rule["target"]
+    if rule["rule"] == DAILY_TOTAL:
+        for day, total in sorted(day_totals.items()):
+            state["progress"] = max(state.get("progress", 0), min(100, int(total * 100 / target)))
+            if total >= target and not state.get("earned"):
+                state.update(earned=True, date=day)
+    elif rule["rule"] == LIFETIME_TOTAL:
+        state["progress"] = min(100, int(lifetime * 100 / target))
+        if lifetime >= target and not state.get("earned"):
+            state.update(earned=True, date=max(day_totals))
+    elif rule["rule"] == STREAK:
+        runs = runs or {}
+        for day in sorted(d for d, total in day_totals.items() if total >= rule["daily_min"]):
+            last = state.get("last_day")
+            if day in runs:
+                first, end = runs[day]
+                if last is None or end >= last:
+                    state.update(current=_days(first, end), last_day=end)
+            elif last is None or day > last:
+                # Nothing after the last qualifying day qualifies, so the run only grows at its end.
+                consecutive = last is not None and _days(last, day) == 2
+                state["current"] = state.get("current", 0) + 1 if consecutive else 1
+                state["last_day"] = day
+                first, end = (date.fromisoformat(day) - timedelta(days=state["current"] - 1)).isoformat(), day
+            else:
+                continue
+            length = _days(first, end)
+            state["best"] = max(state.get("best", 0), length)
+            if length >= target and not state.get("earned"):
+                state.update(earned=True, date=(date.fromisoformat(first) + timedelta(days=target - 1)).isoformat())
+        state["progress"] = min(100, int(state.get("best", 0) * 100 / target))
+    return state
+
+
+def _days(first: str, last: str) -> int:
+    """Days from `first` to `last`, both included."""
+    return (date.fromisoformat(last) - date.fromisoformat(first)).days + 1
+
+
+def current_streak(state: Dict[str, Any], today: str) -> int:
+    """A streak is still current if its last qualifying day is today or yesterday."""
+    last = state.get("last_day")
+    if not last or (date.fromisoformat(today) - date.fromisoformat(last)).days > 1:
+        return 0
+    return state.get("current", 0)
+
+
+class ActivityAchievements:
+    def __init__(self, db, rules: List[Dict[str, Any]] = ACHIEVEMENT_RULES):
+        self.collection = db['activity_achievements']
+        self.rollups = db['activity_rollups']
+        self.rules = rules
+
+    async def ensure_indexes(self):
+        """Create the unique `user_id` index, and raise unless it is in place afterwards.
+
+        `evaluate` relies on it: without it, two first writes for a user both upsert a document.
+        """
+        await self.collection.create_index([('user_id', ASCENDING)], unique=True)
+        indexes = await self.collection.index_information()
+        if not any(index.get("unique") and list(index["key"]) == [("user_id", ASCENDING)] for index in indexes.values()):
+            raise RuntimeError("activity_achievements has no unique user_id index")
+
+    async def evaluate(self, user_id: str, entries: List[Dict[str, Any]]) -> List[int]:
+        """Advance every rule affected by newly written entries (after their rollups were applied).
+
+        Returns the ids of the rules this call earned.
+        """
+        touched = {(e["type"], day_key(e["timestamp"])) for e in entries}
+        rules = [r for r in self.rules if any(t == r["type"] for t, _ in touched)]
+        if not rules:
+            return []
+        types = list({r["type"] for r in rules})
+        days = list({d for _, d in touched})
+        totals: Dict[tuple, Dict[str, Any]] = {}
+        query = {"user_id": user_id, "type": {"$in": types}, "$or": [
+            {"period": DAY, "key": {"$in": days}},
+            {"period": LIFETIME, "key": LIFETIME_KEY},
+        ]}
+        async for doc in self.rollups.find(query, {"_id": 0, "type": 1, "period": 1, "key": 1, "value": 1, "count": 1}):
+            totals[(doc["type"], doc["period"], doc["key"])] = doc
+        run_cache: Dict[Tuple[int, str], Tuple[str, str]] = {}
+        for _ in range(MAX_UPDATE_ATTEMPTS):
+            doc = await self.collection.find_one({"user_id": user_id}) or {}
+            version = doc.get("version", 0)
+            states = doc.get("rules", {})
+            changes, earned = {}, []
+            for rule in rules:
+                metric, t = rule["metric"], rule["type"]
+                day_totals = {d: totals.get((t, DAY, d), {}).get(metric, 0) for tt, d in touched if tt == t}
+                lifetime = totals.get((t, LIFETIME, LIFETIME_KEY), {}).get(metric, 0)
+                key = str(rule["id"])
+                runs = {}
+                if rule["rule"] == STREAK:
+                    last = states.get(key, {}).get("last_day")
+                    for day, total in day_totals.items():
+                        if total >= rule["daily_min"] and (last is None or day < last):
+                            if (rule["id"], day) not in run_cache:
+                                run_cache[(rule["id"], day)] = await self._run_around(user_id, rule, day)
+                            runs[day] = run_cache[(rule["id"], day)]
+                new_state = advance(rule, states.get(key, {}), day_totals, lifetime, runs)
+                if new_state != states.get(key):
+                    changes[f"rules.{key}"] = new_state
+                    if new_state.get("earned") and not states.get(key, {}).get("earned"):
+                        earned.append(rule["id"])
+            if not changes:
+                return []
+            try:
+                result = await self.collection.update_one(
+                    {"user_id": user_id, "version": version} if version else {"user_id": user_id, "version": {"$exists": False}},
+                    {"$set": changes, "$inc": {"version": 1}},
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                # Another ingest created or bumped the document first; re-read and re-apply.
+                continue
+            if result.matched_count or result.upserted_id is not None:
+                return earned
+        raise RuntimeError(f"Achievement state for {user_id} kept changing; gave up after {MAX_UPDATE_ATTEMPTS} attempts")
+
+    async def _run_around(self, user_id: str, rule: Dict[str, Any], day: str) -> Tuple[str, str]:
+        """First and last day of the run of consecutive qualifying days, per the day rollups, that includes `day`."""
+        d = date.fromisoformat(day)
+        first = await self._run_end(user_id, rule, d, -1)
+        last = await self._run_end(user_id, rule, d, 1)
+        return first.isoformat(), last.isoformat()
+
+    async def _run_end(self, user_id: str, rule: Dict[str, Any], day: date, step: int) -> date:
+        end = day
+        while True:
+            window = [end + timedelta(days=step * n) for n in range(1, RUN_SCAN_DAYS + 1)]
+            keys = sorted(d.isoformat() for d in window)
+            query = {"user_id": user_id, "type": rule["type"], "period": DAY,
+                     "key": {"$gte": keys[0], "$lte": keys[-1]}, rule["metric"]: {"$gte": rule["daily_min"]}}
+            qualifying = {doc["key"] async for doc in self.rollups.find(query, {"_id": 0, "key": 1})}
+            for d in window:
+                if d.isoformat() not in qualifying:
+                    return end
+                end = d
+
+    async def get(self, user_id: str, today: str) -> List[Dict[str, Any]]:
+        """Every rule as an `Achievement` dict, from the user's stored state (one lookup)."""
+        doc = await self.collection.find_one({"user_id": user_id}, {"rules": 1}) or {}
+        states = doc.get("rules", {})
+        achievements = []
+        for rule in self.rules:
+            state = states.get(str(rule["id"]), {})
+            achievement = {
+                "id": rule["id"],
+                "title": rule["title"],
+                "description": rule["description"],
+                "icon": rule["icon"],
+                "earned": bool(state.get("earned")),
+                "date": state.get("date"),
+                "progress": state.get("progress", 0),
+            }
+            if rule["rule"] == STREAK:
+                achievement["currentStreak"] = current_streak(state, today)
+                achievement["bestStreak"] = state.get("best", 0)
+            achievements.append(achievement)
+        return achievements
@@ -0,0 +1,163 @@
+"""
+Vectorized trend analytics over daily activity series.
+
+A user's day rollups are loaded once into a (types x days) float matrix; every statistic is then
+computed with NumPy over whole rows instead of per-element Python loops.
+"""
+
+import math
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+ROLLING_WINDOWS = (7, 30)
+PERCENTILES = (25, 50, 75, 90)
+
+# Activity types whose daily goal lives in the user's `goals.daily`.
+DAILY_GOAL_FIELDS = {
+    "steps": "steps",
+    "calories": "calories",
+    "move_minutes": "activeMinutes",
+    "water": "water",
+}
+
+
+def daily_sums(rows: np.ndarray, offsets: np.ndarray, values: np.ndarray, shape: Sequence[int]) -> np.ndarray:
+    """Sum values into a (rows x days) matrix; `offsets` are day indexes from the first day."""
+    flat = np.bincount(rows * shape[1] + offsets, weights=values, minlength=shape[0] * shape[1])
+    return flat.reshape(shape)
+
+
+def load_matrix(docs: Iterable[Dict[str, Any]], types: Sequence[str], start: date, days: int) -> np.ndarray:
+    """Build the (types x days) matrix of daily metric values from day rollup documents."""
+    docs = list(docs)
+    if not docs:
+        return np.zeros((len(types), days))
+    row_of = {t: i for i, t in enumerate(types)}
+    rows = np.fromiter((row_of[d["type"]] for d in docs), dtype=np.int64, count=len(docs))
+    keys = np.array([d["key"] for d in docs], dtype="datetime64[D]")
+    offsets = (keys - np.datetime64(start, "D")).astype(np.int64)
+    values = np.fromiter((d.get("value", 0) for d in docs), dtype=np.float64, count=len(docs))
+    return daily_sums(rows, offsets, values, (len(types), days))
+
+
+def rolling_mean(matrix: np.ndarray, n: int) -> np.ndarray:
+    """Trailing n-day mean of each row; the result has n - 1 fewer columns than the input."""
+    csum = np.cumsum(np.pad(matrix, ((0, 0), (1, 0))), axis=1)
+    return (csum[:, n:] - csum[:, :-n]) / n
+
+
+def streaks(hits: np.ndarray) -> Dict[str, np.ndarray]:
+    """Longest and current run of consecutive True days in each row.
+
+    The current streak also counts a run that ended yesterday, since today may still be in progress.
+    """
+    n_rows, n_days = hits.shape
+    edges = np.diff(np.pad(hits, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    # Starts and ends come out in row-major order, so the i-th start pairs with the i-th end.
+    starts, ends = np.argwhere(edges == 1), np.argwhere(edges == -1)
+    lengths = ends[:, 1] - starts[:, 1]
+    longest = np.zeros(n_rows, dtype=np.int64)
+    np.maximum.at(longest, starts[:, 0], lengths)
+    current = np.zeros(n_rows, dtype=np.int64)
+    ongoing = ends[:, 1] >= n_days - 1
+    np.maximum.at(current, ends[ongoing, 0], lengths[ongoing])
+    return {"longest": longest, "current": current}
+
+
+def trends(matrix: np.ndarray, types: Sequence[str], goals: Dict[str, float], window: int, start: date) -> Dict[str, Any]:
+    """Summarize the last `window` days of a matrix starting at `start`; earlier columns only feed the rolling averages."""
+    recent = matrix[:, -window:]
+    rolling = {n: rolling_mean(matrix, n)[:, -window:] for n in ROLLING_WINDOWS}
+    pcts = np.percentile(recent, PERCENTILES, axis=1)
+    goal = np.array([goals.get(t, 0) for t in types], dtype=np.float64)
+    has_goal = goal > 0
+    hits = (recent >= goal[:, None]) & has_goal[:, None]
+    hit_ratio = hits.mean(axis=1)
+    runs = streaks(hits)
+    first = start + timedelta(days=matrix.shape[1] - window)
+    result: Dict[str, Any] = {
+        "days": [(first + timedelta(days=i)).isoformat() for i in range(window)],
+        "types": {}
+    }
+    for i, t in enumerate(types):
+        result["types"][t] = {
+            "daily": recent[i].tolist(),
+            "total": float(recent[i].sum()),
+            "average": float(recent[i].mean()),
+            **{f"rolling_{n}": np.round(rolling[n][i], 2).tolist() for n in ROLLING_WINDOWS},
+            "percentiles": {f"p{p}": float(pcts[j, i]) for j, p in enumerate(PERCENTILES)},
+            "goal": float(goal[i]) if has_goal[i] else None,
+            "goal_hit_ratio": round(float(hit_ratio[i]), 4) if has_goal[i] else None,
+            "current_streak": int(runs["current"][i]),
+            "longest_streak": int(runs["longest"][i]),
+        }
+    return result
+
+
+def daily_goals(goals: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """Map activity types to their daily goal from the user's goals (as stored by `GoalService`), if set."""
+    daily = (goals or {}).get("daily") or {}
+    return {t: daily[field] for t, field in DAILY_GOAL_FIELDS.items() if daily.get(field)}
+
+
+def history_start(today: date, window: int) -> date:
+    """First day to load so that every day in the window has a full longest rolling average."""
+    return today - timedelta(days=window + max(ROLLING_WINDOWS) - 2)
+
+
+def history_days(window: int) -> int:
+    return window + max(ROLLING_WINDOWS) - 1
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indexes of at most `n` points that keep the visual shape of (x, y).
+
+    `x` must be sorted. The first and last points are always kept; from each of the n - 2 buckets in
+    between, the point forming the largest triangle with the previous pick and the next bucket's mean.
+    """
+    size = len(x)
+    if n >= size:
+        return np.arange(size)
+    if n < 3:
+        raise ValueError("LTTB needs at least 3 output points")
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    picked = np.empty(n, dtype=np.int64)
+    picked[0], picked[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < n - 1 else size
+        cx, cy = x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked
+
+
+def min_max_points(buckets: Iterable[Dict[str, Any]]) -> Iterable[tuple]:
+    """Flatten min/max bucket documents into (time, value) points in time order, one per distinct point."""
+    for b in buckets:
+        low, high = (b["min_t"], b["min_v"]), (b["max_t"], b["max_v"])
+        if low == high:
+            yield low
+        else:
+            yield from sorted((low, high))
+
+
+def merge_bucket_extremes(buckets: Iterable[Dict[str, Any]], points: Iterable[tuple], start: datetime, width_ms: float, count: int) -> List[Dict[str, Any]]:
+    """Fold extra (time, value) points into min/max bucket documents (as grouped by the series pipeline), in bucket order."""
+    merged = {b["_id"]: dict(b) for b in buckets}
+    for t, v in points:
+        idx = min(math.floor((t - start).total_seconds() * 1000 / width_ms), count - 1)
+        b = merged.get(idx)
+        if b is None:
+            merged[idx] = {"_id": idx, "min_t": t, "min_v": v, "max_t": t, "max_v": v}
+            continue
+        # Same order as the pipeline's sort: by value, then time.
+        if (v, t) < (b["min_v"], b["min_t"]):
+            b["min_t"], b["min_v"] = t, v
+        if (v, t) > (b["max_v"], b["max_t"]):
+            b["max_t"], b["max_v"] = t, v
+    return [merged[k] for k in sorted(merged)]
@@ -0,0 +1,130 @@
+"""
+Cold tier for old activity entries: one `activity_archive` document per user and UTC month,
+holding that month's entries as a zlib-compressed BSON blob.
+
+Archived entries are only needed by long-range history reads and rollup rebuilds; totals,
+calendars and trends keep coming from `activity_rollups`, which archiving doesn't touch.
+Each document also lists its entry `ids`, so a single archived entry can still be edited or
+deleted by rewriting its month's blob.
+"""
+
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+import bson
+from bson.binary import Binary
+from pymongo import ASCENDING
+
+from app.services.activity_storage import to_document, from_document
+
+CODEC = "zlib"
+COMPRESSION_LEVEL = 6
+# A month rewritten concurrently (by another edit or an archive run) is re-read this many times.
+MAX_REWRITE_ATTEMPTS = 5
+
+
+def month_key(ts: datetime) -> str:
+    return ts.strftime("%Y-%m")
+
+
+def pack(docs: List[Dict[str, Any]]) -> Binary:
+    return Binary(zlib.compress(bson.encode({"entries": docs}), COMPRESSION_LEVEL))
+
+
+def unpack(blob: bytes) -> List[Dict[str, Any]]:
+    return bson.decode(zlib.decompress(blob))["entries"]
+
+
+class ActivityArchive:
+    def __init__(self, db):
+        self.collection = db['activity_archive']
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([('user_id', ASCENDING), ('month', ASCENDING)], unique=True)
+        await self.collection.create_index([('user_id', ASCENDING), ('ids', ASCENDING)])
+
+    async def add(self, user_id: str, docs: List[Dict[str, Any]]) -> int:
+        """Merge stored-form entries into the user's monthly blobs. Entries already archived (same id) are replaced."""
+        by_month = defaultdict(list)
+        for doc in docs:
+            by_month[month_key(doc["timestamp"])].append(doc)
+        for month, month_docs in by_month.items():
+            existing = await self.collection.find_one({"user_id": user_id, "month": month})
+            merged = {d["id"]: d for d in (unpack(existing["data"]) if existing else [])}
+            merged.update({d["id"]: d for d in month_docs})
+            entries = sorted(merged.values(), key=lambda d: (d["timestamp"], d["id"]))
+            await self.collection.update_one(
+                {"user_id": user_id, "month": month},
+                {"$set": self._fields(entries)},
+                upsert=True
+            )
+        return len(docs)
+
+    @staticmethod
+    def _fields(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {"codec": CODEC, "count": len(entries), "ids": [d["id"] for d in entries], "data": pack(entries)}
+
+    async def find_entry(self, user_id: str, entry_id) -> Optional[Dict[str, Any]]:
+        """An archived entry in API form, like `store.find_entry`."""
+        doc = await self.collection.find_one({"user_id": user_id, "ids": entry_id}, {"data": 1})
+        if not doc:
+            return None
+        return next((from_document(e) for e in unpack(doc["data"]) if e["id"] == entry_id), None)
+
+    async def update_entry(self, user_id: str, entry_id, updates: Dict[str, Any]) -> bool:
+        """Apply (API form) updates to an archived entry, moving it if its month changes."""
+        return await self._rewrite(user_id, entry_id, updates)
+
+    async def delete_entry(self, user_id: str, entry_id) -> bool:
+        return await self._rewrite(user_id, entry_id, None)
+
+    async def _rewrite(self, user_id: str, entry_id, updates: Optional[Dict[str, Any]]) -> bool:
+        for _ in range(MAX_REWRITE_ATTEMPTS):
+            doc = await self.collection.find_one({"user_id": user_id, "ids": entry_id})
+            if not doc:
+                return False
+            entries = unpack(doc["data"])
+            current = next((e for e in entries if e["id"] == entry_id), None)
+            if current is None:
+                return False
+            kept = [e for e in entries if e["id"] != entry_id]
+            if updates is not None:
+                updated = to_document({**from_document(current), **updates})
+                if month_key(updated["timestamp"]) == doc["month"]:
+                    kept = sorted(kept + [updated], key=lambda d: (d["timestamp"], d["id"]))
+                else:
+                    # Add to the new month before removing from this one, so a failure never loses the entry.
+                    await self.add(user_id, [updated])
+            # Only rewrite the blob that was read; a concurrent rewrite means starting over.
+            if kept:
+                result = await self.collection.update_one({"_id": doc["_id"], "data": doc["data"]}, {"$set": self._fields(kept)})
+                done = result.matched_count > 0
+            else:
+                done = (await self.collection.delete_one({"_id": doc["_id"], "data": doc["data"]})).deleted_count > 0
+            if done:
+                return True
+        raise RuntimeError(f"Archived month of entry {entry_id} for {user_id} kept changing; gave up after {MAX_REWRITE_ATTEMPTS} attempts")
+
+    async def find_entries(self, user_id: str, activity_type: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Archived entries (stored form) within [start, end], in (timestamp, id) order. Only the months in range are decompressed."""
+        return [entry async for entry in self.iter_entries(user_id, activity_type, start, end)]
+
+    async def iter_entries(self, user_id: str, activity_type: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Like `find_entries`, but decompresses one month at a time."""
+        query: Dict[str, Any] = {"user_id": user_id}
+        months = {}
+        if start is not None:
+            months["$gte"] = month_key(start)
+        if end is not None:
+            months["$lte"] = month_key(end)
+        if months:
+            query["month"] = months
+        async for doc in self.collection.find(query, {"data": 1}).sort("month", ASCENDING):
+            for entry in unpack(doc["data"]):
+                if activity_type is not None and entry["type"] != activity_type:
+                    continue
+                if (start is not None and entry["timestamp"] < start) or (end is not None and entry["timestamp"] > end):
+                    continue
+                yield entry
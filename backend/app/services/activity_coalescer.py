@@ -0,0 +1,128 @@
+"""
+In-process group commit for activity writes: concurrent single-entry writes for the same user are
+buffered briefly and written together with one `insert_many` (a single `$push: {$each}` per document).
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from sanic.log import logger
+
+
+class CoalescedWriteError(Exception):
+    pass
+
+
+class ActivityWriteCoalescer:
+    """Buffers entries per user for up to `max_delay_ms` or `max_batch` entries, whichever comes first.
+
+    One instance is shared by every request in a worker process (see `ActivityService`). Each caller
+    of `submit` gets its own entry's id back once the batch holding it has been written.
+    """
+
+    def __init__(self, store, on_written, max_delay_ms: float = 5, max_batch: int = 100):
+        self.store = store
+        # Awaited with (user_id, entries) for the entries of each flush that were written.
+        self.on_written = on_written
+        self.max_delay = max_delay_ms / 1000
+        self.max_batch = max_batch
+        self._buffers: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._inflight: set = set()
+        self._stats = {"flushes": 0, "entries": 0, "failed": 0, "largest_batch": 0, "flush_ms_total": 0.0, "flush_ms_max": 0.0}
+        self._triggers: Dict[str, int] = defaultdict(int)
+        self._closed = False
+
+    async def submit(self, user_id: str, entry: Dict[str, Any]) -> int:
+        """Queue a validated entry and wait until it has been written. Returns the entry's id."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        buffer = self._buffers.setdefault(user_id, [])
+        buffer.append((entry, future))
+        if self._closed:
+            # Shutting down: no timer may fire any more, so write right away.
+            self._schedule(user_id, "close")
+        elif len(buffer) >= self.max_batch:
+            self._schedule(user_id, "size")
+        elif user_id not in self._timers:
+            self._timers[user_id] = loop.call_later(self.max_delay, self._schedule, user_id, "timer")
+        return await future
+
+    def _schedule(self, user_id: str, trigger: str):
+        timer = self._timers.pop(user_id, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._buffers.pop(user_id, None)
+        if batch:
+            task = asyncio.ensure_future(self._flush(user_id, batch, trigger))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _flush(self, user_id: str, batch: List[Tuple[Dict[str, Any], asyncio.Future]], trigger: str):
+        started = time.perf_counter()
+        entries = [entry for entry, _ in batch]
+        try:
+            failed = await self.store.insert_many(user_id, entries)
+            written = [e for n, e in enumerate(entries) if n not in failed]
+            if written:
+                await self.on_written(user_id, written)
+        except Exception as e:
+            logger.error(f"Error flushing {len(batch)} coalesced activity entries for {user_id}: {e}")
+            failed = set(range(len(batch)))
+        for n, (entry, future) in enumerate(batch):
+            if future.done():
+                # The caller went away (cancelled); the entry is written regardless.
+                continue
+            if n in failed:
+                future.set_exception(CoalescedWriteError(f"Failed to write activity entry {entry['id']}"))
+            else:
+                future.set_result(entry["id"])
+        self._record(len(batch), len(failed), (time.perf_counter() - started) * 1000, trigger)
+
+    def _record(self, size: int, failed: int, elapsed_ms: float, trigger: str):
+        stats = self._stats
+        stats["flushes"] += 1
+        stats["entries"] += size
+        stats["failed"] += failed
+        stats["largest_batch"] = max(stats["largest_batch"], size)
+        stats["flush_ms_total"] += elapsed_ms
+        stats["flush_ms_max"] = max(stats["flush_ms_max"], elapsed_ms)
+        self._triggers[trigger] += 1
+
+    async def close(self):
+        """Flush everything still buffered and wait for in-flight flushes (on server shutdown).
+
+        Entries submitted after this are written immediately instead of being buffered.
+        """
+        self._closed = True
+        for user_id in list(self._buffers):
+            self._schedule(user_id, "close")
+        while self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = self._stats
+        flushes = stats["flushes"]
+        return {
+            "max_delay_ms": self.max_delay * 1000,
+            "max_batch": self.max_batch,
+            "flushes": flushes,
+            "entries": stats["entries"],
+            "failed": stats["failed"],
+            "pending": sum(len(b) for b in self._buffers.values()),
+            "avg_batch": round(stats["entries"] / flushes, 2) if flushes else 0,
+            "largest_batch": stats["largest_batch"],
+            "avg_flush_ms": round(stats["flush_ms_total"] / flushes, 3) if flushes else 0,
+            "max_flush_ms": round(stats["flush_ms_max"], 3),
+            "flushes_by_trigger": dict(self._triggers),
+        }
+
+
+def get_coalescer(app, store, on_written, max_delay_ms: float, max_batch: int) -> ActivityWriteCoalescer:
+    """The worker's shared coalescer, created on first use."""
+    coalescer = getattr(app.ctx, "activity_coalescer", None)
+    if coalescer is None:
+        coalescer = app.ctx.activity_coalescer = ActivityWriteCoalescer(store, on_written, max_delay_ms, max_batch)
+    return coalescer
@@ -0,0 +1,116 @@
+"""
+In-process fan-out of live activity updates to the dashboard's Server-Sent Events streams.
+
+Every open stream holds a `Subscription`. Publishing never waits on a client: each subscription
+keeps only the latest `stats` snapshot plus the achievements it hasn't sent yet, so a slow consumer
+skips intermediate snapshots instead of queueing them, and memory per connection stays bounded.
+Only streams connected to the worker that handled the write are notified.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from app.utils.json_response import dumps
+
+STATS = "stats"
+ACHIEVEMENT = "achievement"
+
+# Unsent achievements kept per subscription; older ones are dropped (the next snapshot still lists them).
+MAX_PENDING_ACHIEVEMENTS = 20
+
+
+def format_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+class Subscription:
+    __slots__ = ("user_id", "_stats", "_achievements", "_ready")
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self._stats: Optional[Dict[str, Any]] = None
+        self._achievements: List[Dict[str, Any]] = []
+        self._ready = asyncio.Event()
+
+    def offer(self, event: str, data: Dict[str, Any]):
+        if event == STATS:
+            self._stats = data
+        else:
+            self._achievements = self._achievements[-(MAX_PENDING_ACHIEVEMENTS - 1):] + [data]
+        self._ready.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for something to send. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def drain(self) -> str:
+        """Everything pending, formatted as SSE events (achievements first, then the latest stats)."""
+        chunks = [format_event(ACHIEVEMENT, a) for a in self._achievements]
+        if self._stats is not None:
+            chunks.append(format_event(STATS, self._stats))
+        self._stats = None
+        self._achievements = []
+        self._ready.clear()
+        return "".join(chunks)
+
+
+class ActivityEventBroker:
+    """Per-worker registry of open streams, keyed by user."""
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._count = 0
+        self._stats = {"published": 0, "delivered": 0, "rejected": 0, "dropped_slow": 0}
+
+    def subscribe(self, user_id: str) -> Optional[Subscription]:
+        """Register a new stream, or return None if the worker is at `max_connections`."""
+        if self._count >= self.max_connections:
+            self._stats["rejected"] += 1
+            return None
+        subscription = Subscription(user_id)
+        self._subscriptions[user_id].add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions and subscription in subscriptions:
+            subscriptions.discard(subscription)
+            self._count -= 1
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def has_subscribers(self, user_id: str) -> bool:
+        return user_id in self._subscriptions
+
+    def publish(self, user_id: str, event: str, data: Dict[str, Any]):
+        subscriptions = self._subscriptions.get(user_id, ())
+        self._stats["published"] += 1
+        for subscription in subscriptions:
+            subscription.offer(event, data)
+        self._stats["delivered"] += len(subscriptions)
+
+    def record_slow_consumer(self):
+        self._stats["dropped_slow"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "connections": self._count,
+            "users": len(self._subscriptions),
+            "max_connections": self.max_connections,
+            **self._stats,
+        }
+
+
+def get_event_broker(app, max_connections: int) -> ActivityEventBroker:
+    """The worker's shared broker, created on first use."""
+    broker = getattr(app.ctx, "activity_events", None)
+    if broker is None:
+        broker = app.ctx.activity_events = ActivityEventBroker(max_connections)
+    return broker
@@ -0,0 +1,143 @@
+"""
+Write-time rollups of activity entries (per user and type: day, ISO week, month and lifetime)
+"""
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Optional, List, Dict, Any, Tuple
+from pymongo import ASCENDING, UpdateOne, ReplaceOne, DeleteOne
+from app.services.activity_storage import day_key
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+LIFETIME = "lifetime"
+LIFETIME_KEY = "all"
+
+COUNTERS = ("count", "steps", "value")
+
+
+def period_keys(day: str) -> Dict[str, str]:
+    """Return the rollup key of every period a `YYYY-MM-DD` day belongs to."""
+    d = date.fromisoformat(day)
+    iso_year, iso_week, _ = d.isocalendar()
+    return {DAY: day, WEEK: f"{iso_year}-W{iso_week:02d}", MONTH: day[:7], LIFETIME: LIFETIME_KEY}
+
+
+class ActivityRollups:
+    """Keeps `activity_rollups` in step with raw entries using atomic `$inc` updates."""
+
+    def __init__(self, db, field_map: Dict[str, str]):
+        self.collection = db['activity_rollups']
+        # Users whose rollups may have missed a write, for `scripts.rebuild_activity_rollups --flagged`.
+        self.rebuilds = db['activity_rollup_rebuilds']
+        self.field_map = field_map
+
+    async def ensure_indexes(self):
+        await self.collection.create_index(
+            [('user_id', ASCENDING), ('period', ASCENDING), ('key', ASCENDING), ('type', ASCENDING)],
+            unique=True
+        )
+        await self.rebuilds.create_index([('user_id', ASCENDING)], unique=True)
+
+    async def flag_rebuild(self, user_id: str):
+        await self.rebuilds.update_one({"user_id": user_id}, {"$set": {"flagged_at": datetime.utcnow()}}, upsert=True)
+
+    async def flagged_users(self) -> List[str]:
+        return [doc["user_id"] async for doc in self.rebuilds.find({}, {"_id": 0, "user_id": 1})]
+
+    def increments(self, entry: Dict[str, Any], sign: int = 1) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Return (filter fields, $inc fields) pairs that add (or with sign=-1 remove) an entry."""
+        day = day_key(entry["timestamp"])
+        counters = {"count": sign, "steps": sign * entry.get("steps", 0)}
+        metric = self.field_map.get(entry["type"])
+        if metric and metric in entry:
+            counters["value"] = sign * entry[metric]
+        changes = []
+        for period, key in period_keys(day).items():
+            inc = dict(counters)
+            if period == MONTH and "value" in counters:
+                # Month documents also carry the per-day calendar values.
+                inc[f"days.{day[8:]}"] = counters["value"]
+            changes.append(({"type": entry["type"], "period": period, "key": key}, inc))
+        return changes
+
+    async def apply(self, user_id: str, entries: List[Dict[str, Any]], sign: int = 1):
+        """Atomically add (sign=1) or remove (sign=-1) entries from every rollup they touch."""
+        merged: Dict[Tuple, Dict[str, Any]] = defaultdict(lambda: defaultdict(int))
+        for entry in entries:
+            for match, inc in self.increments(entry, sign):
+                for field, amount in inc.items():
+                    merged[(match["type"], match["period"], match["key"])][field] += amount
+        if not merged:
+            return
+        ops = [
+            UpdateOne({"user_id": user_id, "type": t, "period": period, "key": key}, {"$inc": dict(inc)}, upsert=True)
+            for (t, period, key), inc in merged.items()
+        ]
+        await self.collection.bulk_write(ops, ordered=False)
+
+    async def get_totals(self, user_id: str, period: str, key: str, activity_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        query: Dict[str, Any] = {"user_id": user_id, "period": period, "key": key, "count": {"$gt": 0}}
+        if activity_type is not None:
+            query["type"] = activity_type
+        return [doc async for doc in self.collection.find(query)]
+
+    async def get_range(self, user_id: str, activity_type: str, period: str, start_key: str, end_key: str) -> List[Dict[str, Any]]:
+        query = {"user_id": user_id, "type": activity_type, "period": period, "key": {"$gte": start_key, "$lte": end_key}}
+        return [doc async for doc in self.collection.find(query)]
+
+    async def get_days(self, user_id: str, types: List[str], start_key: str, end_key: str) -> List[Dict[str, Any]]:
+        """Day rollups of several types at once, for loading a user's series in one query."""
+        query = {"user_id": user_id, "type": {"$in": types}, "period": DAY, "key": {"$gte": start_key, "$lte": end_key}}
+        return [doc async for doc in self.collection.find(query, {"_id": 0, "type": 1, "key": 1, "value": 1})]
+
+    async def rebuild(self, user_id: str, entries, dry_run: bool = False) -> List[Dict[str, Any]]:
+        """Recompute a user's rollups from raw entries (an async iterable) and return the drift found.
+
+        Each drift item names the rollup and the stored vs. recomputed counters. Unless `dry_run`
+        is set, the drifted rollups are replaced with the recomputed ones.
+        """
+        started = datetime.utcnow()
+        expected: Dict[Tuple, Dict[str, Any]] = defaultdict(lambda: defaultdict(int))
+        async for entry in entries:
+            for match, inc in self.increments(entry):
+                for field, amount in inc.items():
+                    doc = expected[(match["type"], match["period"], match["key"])]
+                    if field.startswith("days."):
+                        doc.setdefault("days", defaultdict(int))
+                        doc["days"][field[5:]] += amount
+                    else:
+                        doc[field] += amount
+        stored = {(d["type"], d["period"], d["key"]): d async for d in self.collection.find({"user_id": user_id})}
+        drift = []
+        for ident in sorted(set(expected) | set(stored), key=str):
+            want = expected.get(ident, {})
+            have = stored.get(ident, {})
+            want_counters = {f: want.get(f, 0) for f in COUNTERS}
+            have_counters = {f: have.get(f, 0) for f in COUNTERS}
+            want_days = {d: v for d, v in want.get("days", {}).items() if v}
+            have_days = {d: v for d, v in have.get("days", {}).items() if v}
+            if want_counters != have_counters or want_days != have_days:
+                drift.append({"type": ident[0], "period": ident[1], "key": ident[2], "stored": have_counters, "expected": want_counters})
+        if not dry_run and drift:
+            # Replace only the drifted documents, one atomic write each, so readers never see the
+            # user's rollups missing while they are rebuilt.
+            ops = []
+            for item in drift:
+                ident = (item["type"], item["period"], item["key"])
+                match = {"user_id": user_id, "type": ident[0], "period": ident[1], "key": ident[2]}
+                counters = expected.get(ident)
+                if counters is None:
+                    ops.append(DeleteOne(match))
+                    continue
+                doc = dict(match)
+                doc.update({f: v for f, v in counters.items() if f != "days"})
+                if "days" in counters:
+                    doc["days"] = dict(counters["days"])
+                ops.append(ReplaceOne(match, doc, upsert=True))
+            await self.collection.bulk_write(ops, ordered=False)
+        if not dry_run:
+            # A flag raised while the entries were being read stays for the next rebuild.
+            await self.rebuilds.delete_one({"user_id": user_id, "flagged_at": {"$lte": started}})
+        return drift
@@ -3,22 +3,65 @@ Service for activity tracking (steps, water, sleep, weight, meditation, etc.)
 """
 
 import uuid
-from app.models.launchpad.activity_tracker import ActivityTracker, Activity
+from contextlib import aclosing
+import numpy as np
+from app.models.launchpad.activity_tracker import Activity, ActivityList, ActivityRecord, tracker_from_document
 from motor.motor_asyncio import AsyncIOMotorClient
 from sanic import Sanic
 from sanic.log import logger
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
 from datetime import datetime, timedelta
-from pymongo import ASCENDING
+from pymongo import ASCENDING, DESCENDING
+from pydantic import ValidationError
 from calendar import monthrange
+from app.db.config import ACTIVITY_STORAGE, ACTIVITY_BUCKET_MAX_ENTRIES, ACTIVITY_ARCHIVE_AFTER_DAYS, ACTIVITY_COALESCE_ENABLED, ACTIVITY_COALESCE_MAX_DELAY_MS, ACTIVITY_COALESCE_MAX_BATCH, ACTIVITY_STREAM_MAX_CONNECTIONS
+from app.services.activity_storage import get_activity_store, day_key, to_utc, from_document
+from app.services.activity_rollups import ActivityRollups, DAY, WEEK, MONTH, LIFETIME, LIFETIME_KEY, period_keys
+from app.services.activity_analytics import load_matrix, trends, daily_goals, history_start, history_days, lttb, min_max_points, merge_bucket_extremes
+from app.services.activity_coalescer import get_coalescer
+from app.services.activity_achievements import ActivityAchievements
+from app.services.activity_archive import ActivityArchive
+from app.services.goal_service import GoalService
+from app.services.activity_events import get_event_broker, STATS, ACHIEVEMENT
+from app.services.sync_service import SyncService, ACTIVITY
+from app.utils.snowflake import next_id, get_id_generator
+
+# Days of recent entries attached to the activity summary.
+SUMMARY_WINDOW_DAYS = 7
+# Fields a client may change on an existing entry; the id is fixed.
+UPDATABLE_FIELDS = set(Activity.model_fields) - {"id"}
+# Most recent entries shown on the dashboard.
+DASHBOARD_RECENT_ENTRIES = 10
+# Dashboard goal keys, as named in the user's `goals.daily`.
+DASHBOARD_GOALS = ("steps", "calories", "activeMinutes")
+# Documents per round trip when streaming a full history export.
+EXPORT_BATCH_SIZE = 500
+MAX_TREND_WINDOW = 365
+SERIES_METHODS = ("lttb", "minmax")
+SERIES_DEFAULT_DAYS = 365
+# LTTB chooses each output point from this many min/max-bucketed candidates.
+LTTB_OVERSAMPLE = 4
+
+
+def encode_history_cursor(entry: Dict[str, Any]) -> str:
+    """Keyset cursor (`<timestamp>,<id>`) pointing just past an entry."""
+    return f"{to_utc(entry['timestamp']).isoformat()},{entry['id']}"
+
+
+def parse_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Parse a `<timestamp>,<id>` cursor. Raises ValueError if it is malformed."""
+    timestamp, _, entry_id = cursor.rpartition(",")
+    return to_utc(timestamp), int(entry_id)
 
 class ActivityServiceException(Exception):
     pass
 
 class ActivityService:
-    def __init__(self, app: Sanic):
+    def __init__(self, app: Sanic, storage: Optional[str] = None):
         self.app = app
-        self.collection = app.ctx.mongo['launchpad_db']['activity_tracker']
+        db = app.ctx.mongo['launchpad_db']
+        self.collection = db['activity_tracker']
+        self.store = get_activity_store(storage or ACTIVITY_STORAGE, db, ACTIVITY_BUCKET_MAX_ENTRIES)
         self.field_map = {
             "steps": "steps",
             "water": "glasses",
@@ -29,168 +72,480 @@ class ActivityService:
             "move_minutes": "activeMinutes",
             # Add more mappings as needed
         }
+        self.rollups = ActivityRollups(db, self.field_map)
+        self.achievements = ActivityAchievements(db)
+        self.archive = ActivityArchive(db)
+        self.sync = SyncService(app)
+        self.events = get_event_broker(app, ACTIVITY_STREAM_MAX_CONNECTIONS)
+        self.coalescer = None
+        if ACTIVITY_COALESCE_ENABLED and storage is None:
+            self.coalescer = get_coalescer(app, self.store, self._after_insert, ACTIVITY_COALESCE_MAX_DELAY_MS, ACTIVITY_COALESCE_MAX_BATCH)
 
     @classmethod
     def register_listeners(cls, app: Sanic):
         @app.listener('before_server_start')
         async def ensure_indexes(app, loop):
-            collection = app.ctx.mongo['launchpad_db']['activity_tracker']
+            db = app.ctx.mongo['launchpad_db']
             try:
-                await collection.create_index([('user_id', ASCENDING)])
-                await collection.create_index([('activities.timestamp', ASCENDING)])
+                await db['activity_tracker'].create_index([('user_id', ASCENDING)])
+                await ActivityArchive(db).ensure_indexes()
             except Exception as e:
                 logger.error(f"Failed to create indexes: {e}")
+            # The store must have its layout (e.g. a real time-series collection), and rollup upserts and
+            # achievement updates are only race-free with their unique indexes, so the worker doesn't start without them.
+            try:
+                await get_activity_store(ACTIVITY_STORAGE, db, ACTIVITY_BUCKET_MAX_ENTRIES).ensure_indexes()
+                await ActivityRollups(db, {}).ensure_indexes()
+                await ActivityAchievements(db).ensure_indexes()
+            except Exception as e:
+                logger.error(f"Failed to prepare activity storage: {e}")
+                raise
+
+        @app.listener('before_server_stop')
+        async def flush_coalesced_writes(app, loop):
+            coalescer = getattr(app.ctx, "activity_coalescer", None)
+            if coalescer is not None:
+                await coalescer.close()
 
     async def get_activity_summary(self, user_id: str) -> Optional[Dict]:
-        """Return a summary of all tracked activities for the user."""
+        """Return a summary of all tracked activities for the user, with the last week's entries."""
         try:
-            doc = await self.collection.find_one({"user_id": user_id})
+            doc = await self.collection.find_one({"user_id": user_id}, {"activities": 0})
             if doc:
-                return ActivityTracker(**doc).dict()
+                today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+                doc["activities"] = await self.store.find_entries(user_id, start=today - timedelta(days=SUMMARY_WINDOW_DAYS - 1))
+                doc["achievements"] = await self.achievements.get(user_id, today.date().isoformat())
+                return tracker_from_document(doc)
             return None
         except Exception as e:
             logger.error(f"Error fetching activity summary for {user_id}: {e}")
             raise ActivityServiceException("Failed to fetch activity summary")
 
+    async def _after_insert(self, user_id: str, entries: List[Dict[str, Any]]):
+        """Rollups, achievements, changelog and live updates for entries that are already stored.
+
+        The write has succeeded by now, so a failure here is logged and the user's rollups are
+        flagged for rebuild instead of failing the request.
+        """
+        earned = []
+        try:
+            await self.rollups.apply(user_id, entries)
+            # Achievements read the rollups, so they are advanced once those include the new entries.
+            earned = await self.achievements.evaluate(user_id, entries)
+            await self.sync.record_many(user_id, ACTIVITY, [(e["id"], e) for e in entries])
+        except Exception as e:
+            logger.error(f"Error updating rollups after adding {len(entries)} activity entries for {user_id}: {e}")
+            await self._flag_rollup_rebuild(user_id)
+        await self._publish(user_id, earned)
+
+    async def _flag_rollup_rebuild(self, user_id: str):
+        try:
+            await self.rollups.flag_rebuild(user_id)
+        except Exception as e:
+            logger.error(f"Error flagging activity rollups of {user_id} for rebuild: {e}")
+
+    async def _publish(self, user_id: str, earned: List[int]):
+        """Push fresh today stats and newly earned achievements to the user's open dashboard streams."""
+        if not self.events.has_subscribers(user_id):
+            return
+        try:
+            self.events.publish(user_id, STATS, {"todayStats": await self.get_today_stats(user_id)})
+            if earned:
+                for achievement in await self.achievements.get(user_id, datetime.utcnow().date().isoformat()):
+                    if achievement["id"] in earned:
+                        self.events.publish(user_id, ACHIEVEMENT, achievement)
+        except Exception as e:
+            # The write already succeeded; a missed live update is corrected by the next one.
+            logger.error(f"Error publishing activity update for {user_id}: {e}")
+
+    @staticmethod
+    def _activity_fields(activity_id: int, activity_type: str, value: dict) -> Dict[str, Any]:
+        """Client input with defaults filled in, ready for `Activity` validation."""
+        return {
+            "id": activity_id,
+            "type": activity_type,
+            "title": value.get('title', activity_type.title()),
+            "duration": value.get('duration', 0),
+            "calories": value.get('calories', 0),
+            "steps": value.get('steps', 0),
+            "timestamp": value.get('timestamp', datetime.utcnow().isoformat()),
+            "intensity": value.get('intensity', 'normal')
+        }
+
+    @classmethod
+    def _build_activity(cls, activity_id: int, activity_type: str, value: dict) -> Activity:
+        return Activity.model_validate(cls._activity_fields(activity_id, activity_type, value))
+
     async def add_activity_entry(self, user_id: str, activity_type: str, value: dict) -> int:
         """Add a new entry for a specific activity type. Returns the new entry's id as int."""
         try:
-            # Validate input using Activity model
-            activity_id = int(datetime.utcnow().timestamp() * 1000)
-            activity = Activity(
-                id=activity_id,
-                type=activity_type,
-                title=value.get('title', activity_type.title()),
-                duration=value.get('duration', 0),
-                calories=value.get('calories', 0),
-                steps=value.get('steps', 0),
-                timestamp=value.get('timestamp', datetime.utcnow().isoformat()),
-                intensity=value.get('intensity', 'normal')
-            )
-            await self.collection.update_one(
-                {"user_id": user_id},
-                {"$push": {"activities": activity.dict()}},
-                upsert=True
-            )
+            activity_id = next_id()
+            activity = self._build_activity(activity_id, activity_type, value)
+            entry = activity.model_dump()
+            if self.coalescer is not None:
+                return await self.coalescer.submit(user_id, entry)
+            await self.store.insert(user_id, entry)
+            await self._after_insert(user_id, [entry])
             return activity_id
         except Exception as e:
             logger.error(f"Error adding activity entry for {user_id}: {e}")
             raise ActivityServiceException("Failed to add activity entry")
 
-    async def get_activity_history(self, user_id: str, activity_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Activity]:
+    async def add_activity_entries(self, user_id: str, values: List[dict]) -> List[Dict[str, Any]]:
+        """Validate and add a batch of entries (each with a 'type') in one unordered bulk write.
+
+        Returns one result per input, in order: {"index", "success", "id"} (the id as a string) or {"index", "success", "error"}.
+        Invalid or failed items don't prevent the rest of the batch from being written.
+        """
+        try:
+            ids = get_id_generator().next_ids(len(values))
+            results: List[Dict[str, Any]] = [None] * len(values)
+            candidates, candidate_positions = [], []
+            for i, value in enumerate(values):
+                if not isinstance(value, dict) or not isinstance(value.get("type"), str):
+                    results[i] = {"index": i, "success": False, "error": "entry must be an object with a string 'type'"}
+                    continue
+                candidates.append(self._activity_fields(ids[i], value["type"], value))
+                candidate_positions.append(i)
+            try:
+                # One pass through pydantic-core for the whole batch; only a batch with a bad entry is revalidated one by one.
+                validated = ActivityList.dump_python(ActivityList.validate_python(candidates))
+            except ValidationError:
+                validated = []
+                for fields in candidates:
+                    try:
+                        validated.append(Activity.model_validate(fields).model_dump())
+                    except ValidationError as e:
+                        validated.append(e)
+            entries, positions = [], []
+            for i, entry in zip(candidate_positions, validated):
+                try:
+                    if isinstance(entry, ValidationError):
+                        raise entry
+                    # Reject timestamps that can't be bucketed by day before anything is written.
+                    day_key(entry["timestamp"])
+                except (ValidationError, ValueError, TypeError) as e:
+                    results[i] = {"index": i, "success": False, "error": str(e)}
+                    continue
+                results[i] = {"index": i, "success": True, "id": str(entry["id"])}
+                entries.append(entry)
+                positions.append(i)
+            failed = await self.store.insert_many(user_id, entries) if entries else set()
+            for n in failed:
+                results[positions[n]] = {"index": positions[n], "success": False, "error": "write failed"}
+            written = [e for n, e in enumerate(entries) if n not in failed]
+            if written:
+                await self._after_insert(user_id, written)
+            return results
+        except Exception as e:
+            logger.error(f"Error adding activity entries for {user_id}: {e}")
+            raise ActivityServiceException("Failed to add activity entries")
+
+    async def get_achievements(self, user_id: str) -> List[Dict[str, Any]]:
+        """Return every achievement with the user's earned flag, progress and streaks."""
+        try:
+            return await self.achievements.get(user_id, datetime.utcnow().date().isoformat())
+        except Exception as e:
+            logger.error(f"Error fetching achievements for {user_id}: {e}")
+            raise ActivityServiceException("Failed to fetch achievements")
+
+    def get_write_metrics(self) -> Dict[str, Any]:
+        """Return the write coalescer's flush metrics for this worker."""
+        if self.coalescer is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.coalescer.metrics()}
+
+    async def get_activity_history(self, user_id: str, activity_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[ActivityRecord]:
         """Return the history of a specific activity for the user, optionally filtered by date range (ISO format)."""
         try:
-            doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
-            if not doc or "activities" not in doc:
-                return []
-            activities = [Activity(**a) for a in doc["activities"] if a["type"] == activity_type]
-            if start_date or end_date:
-                def in_range(a):
-                    ts = datetime.fromisoformat(a.timestamp)
-                    if start_date and ts < datetime.fromisoformat(start_date):
-                        return False
-                    if end_date and ts > datetime.fromisoformat(end_date):
-                        return False
-                    return True
-                activities = [a for a in activities if in_range(a)]
-            return activities
+            start = to_utc(start_date) if start_date else None
+            end = to_utc(end_date) if end_date else None
+            entries = await self.store.find_entries(user_id, activity_type, start=start, end=end)
+            if self._reaches_archive(start):
+                hot_ids = {a["id"] for a in entries}
+                archived = await self.archive.find_entries(user_id, activity_type, start, end)
+                entries = [from_document(d) for d in archived if d["id"] not in hot_ids] + entries
+            return [ActivityRecord(a) for a in entries]
         except Exception as e:
             logger.error(f"Error fetching activity history for {user_id}: {e}")
             raise ActivityServiceException("Failed to fetch activity history")
 
+    async def get_activity_history_page(self, user_id: str, activity_type: str, after: Optional[Tuple[datetime, int]] = None, limit: int = 100, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, Any]:
+        """Return up to `limit` entries ordered by (timestamp, id), starting after the `after` keyset cursor.
+
+        The result carries `next`, the cursor for the following page, or None on the last page.
+        """
+        try:
+            start = to_utc(start_date) if start_date else None
+            end = to_utc(end_date) if end_date else None
+            if after is not None and (start is None or after[0] > start):
+                # Narrow the scanned range (and, for buckets, the days) to what lies past the cursor.
+                start = after[0]
+            pipeline = self.store.entry_pipeline(user_id, activity_type, start=start, end=end)
+            if after is not None:
+                pipeline.append({"$match": {"$or": [
+                    {"timestamp": {"$gt": after[0]}},
+                    {"timestamp": after[0], "id": {"$gt": after[1]}},
+                ]}})
+            pipeline += [
+                {"$sort": {"timestamp": ASCENDING, "id": ASCENDING}},
+                {"$limit": limit + 1},
+            ]
+            docs = [d async for d in self.store.collection.aggregate(pipeline)]
+            if self._reaches_archive(start):
+                # The first limit + 1 of the union lie within the first limit + 1 of each side.
+                hot_ids = {d["id"] for d in docs}
+                archived = []
+                # Archived entries come in (timestamp, id) order, so stop reading months once enough matched.
+                async with aclosing(self.archive.iter_entries(user_id, activity_type, start, end)) as entries:
+                    async for d in entries:
+                        if d["id"] in hot_ids or (after is not None and (d["timestamp"], d["id"]) <= after):
+                            continue
+                        archived.append(d)
+                        if len(archived) > limit:
+                            break
+                docs = sorted(docs + archived, key=lambda d: (d["timestamp"], d["id"]))[:limit + 1]
+            entries = [from_document(d) for d in docs]
+            page = entries[:limit]
+            return {
+                "items": [ActivityRecord(a) for a in page],
+                "next": encode_history_cursor(page[-1]) if len(entries) > limit else None,
+            }
+        except Exception as e:
+            logger.error(f"Error fetching activity history page for {user_id}: {e}")
+            raise ActivityServiceException("Failed to fetch activity history")
+
+    async def stream_activity_history(self, user_id: str, activity_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[ActivityRecord]:
+        """Yield the history entry by entry in storage (day) order, fetching `batch_size` documents per round trip.
+
+        Archived entries, which are all older than the hot ones, come first, one decompressed month at a time.
+        Nothing else is materialised beyond the current cursor batch, so memory stays flat for any history length.
+        """
+        start = to_utc(start_date) if start_date else None
+        end = to_utc(end_date) if end_date else None
+        pipeline = self.store.entry_pipeline(user_id, activity_type, start=start, end=end)
+        try:
+            archived_ids = set()
+            if self._reaches_archive(start):
+                async for doc in self.archive.iter_entries(user_id, activity_type, start, end):
+                    archived_ids.add(doc["id"])
+                    yield ActivityRecord(from_document(doc))
+            async for doc in self.store.collection.aggregate(pipeline, batchSize=batch_size):
+                if doc["id"] not in archived_ids:
+                    yield ActivityRecord(from_document(doc))
+        except Exception as e:
+            logger.error(f"Error streaming activity history for {user_id}: {e}")
+            raise ActivityServiceException("Failed to stream activity history")
+
+    async def get_series(self, user_id: str, activity_type: str, resolution: int, method: str = "lttb", start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return at most `resolution` (timestamp, value) points of the tracker's metric, downsampled with LTTB or min/max bucketing.
+
+        The range defaults to the last SERIES_DEFAULT_DAYS days. Entries are bucketed by time inside Mongo, so
+        only per-bucket aggregates (never the raw entries) are returned by the database.
+        """
+        if method not in SERIES_METHODS:
+            raise ActivityServiceException(f"method must be one of {', '.join(SERIES_METHODS)}")
+        if resolution < 3:
+            raise ActivityServiceException("resolution must be at least 3")
+        try:
+            metric = self.field_map.get(activity_type)
+            if not metric:
+                return []
+            end = to_utc(end_date) if end_date else datetime.utcnow()
+            start = to_utc(start_date) if start_date else end - timedelta(days=SERIES_DEFAULT_DAYS)
+            # Each bucket contributes its min and max point; LTTB then picks from LTTB_OVERSAMPLE times more candidates.
+            buckets = resolution // 2 if method == "minmax" else resolution * LTTB_OVERSAMPLE // 2
+            width_ms = max((end - start).total_seconds() * 1000 / buckets, 1)
+            pipeline = self.store.entry_pipeline(user_id, activity_type, start=start, end=end)
+            pipeline += [
+                {"$project": {
+                    "_id": 0,
+                    "t": "$timestamp",
+                    "v": {"$ifNull": [f"${metric}", 0]},
+                    # Entries exactly at `end` would open one bucket past the last; fold them into it.
+                    "b": {"$min": [{"$floor": {"$divide": [{"$subtract": ["$timestamp", start]}, width_ms]}}, buckets - 1]},
+                }},
+                {"$sort": {"b": ASCENDING, "v": ASCENDING, "t": ASCENDING}},
+                {"$group": {"_id": "$b", "min_t": {"$first": "$t"}, "min_v": {"$first": "$v"}, "max_t": {"$last": "$t"}, "max_v": {"$last": "$v"}}},
+                {"$sort": {"_id": ASCENDING}},
+            ]
+            # The sort runs over every entry in range, which can exceed the in-memory sort limit.
+            extremes = [b async for b in self.store.collection.aggregate(pipeline, allowDiskUse=True)]
+            if self._reaches_archive(start):
+                archived = self.archive.iter_entries(user_id, activity_type, start, end)
+                extremes = merge_bucket_extremes(extremes, [(d["timestamp"], d.get(metric) or 0) async for d in archived], start, width_ms, buckets)
+            points = list(min_max_points(extremes))
+            if method == "lttb" and len(points) > resolution:
+                x = np.array([(t - start).total_seconds() for t, _ in points], dtype=np.float64)
+                y = np.array([v for _, v in points], dtype=np.float64)
+                points = [points[i] for i in lttb(x, y, resolution)]
+            return [{"timestamp": t.isoformat(), "value": v} for t, v in points]
+        except Exception as e:
+            logger.error(f"Error fetching activity series for {user_id}: {e}")
+            raise ActivityServiceException("Failed to fetch activity series")
+
     async def get_daily_totals(self, user_id: str, date: str) -> Dict[str, float]:
         """Return totals per activity type for a given date (ISO format)."""
         try:
-            doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
-            if not doc or "activities" not in doc:
-                return {}
-            totals = {}
-            for a in doc["activities"]:
-                ts = datetime.fromisoformat(a["timestamp"])
-                if ts.date() == datetime.fromisoformat(date).date():
-                    t = a["type"]
-                    totals[t] = totals.get(t, 0) + a.get("steps", 0)
-            return totals
+            docs = await self.rollups.get_totals(user_id, DAY, day_key(date))
+            return {d["type"]: d["steps"] for d in docs}
         except Exception as e:
             logger.error(f"Error calculating daily totals for {user_id}: {e}")
             raise ActivityServiceException("Failed to calculate daily totals")
 
+    @staticmethod
+    def _stats(docs: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Dashboard stats from the rollups of one period, all types."""
+        values = {d["type"]: d.get("value", 0) for d in docs}
+        return {
+            "steps": sum(d.get("steps", 0) for d in docs),
+            "calories": values.get("calories", 0),
+            "activeMinutes": values.get("move_minutes", 0),
+        }
+
+    async def get_today_stats(self, user_id: str) -> Dict[str, float]:
+        """The dashboard's `todayStats` (UTC day) from the day rollups."""
+        try:
+            return self._stats(await self.rollups.get_totals(user_id, DAY, datetime.utcnow().date().isoformat()))
+        except Exception as e:
+            logger.error(f"Error fetching today stats for {user_id}: {e}")
+            raise ActivityServiceException("Failed to fetch today stats")
+
+    async def get_dashboard(self, user_id: str) -> Dict[str, Any]:
+        """Today's and this ISO week's stats, the latest entries, the daily goals and the earned achievements."""
+        try:
+            now = datetime.utcnow()
+            today = now.date().isoformat()
+            week = await self.rollups.get_totals(user_id, WEEK, period_keys(today)[WEEK])
+            pipeline = self.store.entry_pipeline(user_id, start=now - timedelta(days=SUMMARY_WINDOW_DAYS))
+            pipeline += [{"$sort": {"timestamp": DESCENDING, "id": DESCENDING}}, {"$limit": DASHBOARD_RECENT_ENTRIES}]
+            recent = [ActivityRecord(from_document(d)) async for d in self.store.collection.aggregate(pipeline)]
+            daily = ((await GoalService(self.app).get_goals(user_id)) or {}).get("daily") or {}
+            achievements = await self.achievements.get(user_id, today)
+            return {
+                "todayStats": await self.get_today_stats(user_id),
+                "weeklyStats": self._stats(week),
+                "activities": recent,
+                "goals": {k: daily.get(k) for k in DASHBOARD_GOALS},
+                "achievements": [a for a in achievements if a["earned"]],
+            }
+        except Exception as e:
+            logger.error(f"Error building activity dashboard for {user_id}: {e}")
+            raise ActivityServiceException("Failed to build activity dashboard")
+
     async def get_weekly_averages(self, user_id: str, activity_type: str) -> float:
         """Return the 7-day average for a given activity type."""
         try:
-            doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
-            if not doc or "activities" not in doc:
-                return 0.0
             now = datetime.utcnow()
             week_ago = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=6)
-            values = [a.get("steps", 0) for a in doc["activities"] if a["type"] == activity_type and week_ago <= datetime.fromisoformat(a["timestamp"]) <= now]
-            if not values:
+            days = await self.rollups.get_range(user_id, activity_type, DAY, week_ago.date().isoformat(), now.date().isoformat())
+            count = sum(d.get("count", 0) for d in days)
+            if not count:
                 return 0.0
-            return sum(values) / len(values)
+            return sum(d.get("steps", 0) for d in days) / count
         except Exception as e:
             logger.error(f"Error calculating weekly average for {user_id}: {e}")
             raise ActivityServiceException("Failed to calculate weekly average")
 
+    async def _find_entry(self, user_id: str, entry_id) -> Optional[Dict[str, Any]]:
+        """An entry from the hot store, or from the archive once it has been archived."""
+        entry = await self.store.find_entry(user_id, entry_id)
+        if entry is None:
+            entry = await self.archive.find_entry(user_id, entry_id)
+        return entry
+
     async def delete_activity_entry(self, user_id: str, entry_id: str) -> bool:
-        """Delete an activity entry by its id."""
+        """Delete an activity entry by its id, hot or archived."""
         try:
-            result = await self.collection.update_one(
-                {"user_id": user_id},
-                {"$pull": {"activities": {"id": entry_id}}}
-            )
-            return result.modified_count > 0
+            entry = await self._find_entry(user_id, entry_id)
+            if entry is None:
+                return False
+            # Both tiers: an interrupted archive run can leave the entry in each.
+            deleted = await self.store.delete_entry(user_id, entry_id)
+            if not await self.archive.delete_entry(user_id, entry_id) and not deleted:
+                return False
         except Exception as e:
             logger.error(f"Error deleting activity entry for {user_id}: {e}")
             raise ActivityServiceException("Failed to delete activity entry")
+        try:
+            await self.rollups.apply(user_id, [entry], sign=-1)
+            await self.sync.record(user_id, ACTIVITY, entry["id"], deleted=True)
+        except Exception as e:
+            logger.error(f"Error updating rollups after deleting activity entry {entry_id} for {user_id}: {e}")
+            await self._flag_rollup_rebuild(user_id)
+        return True
 
     async def update_activity_entry(self, user_id: str, entry_id: str, updates: dict) -> bool:
-        """Update an activity entry by its id."""
+        """Update an activity entry by its id, hot or archived. Raises ActivityServiceException for invalid updates."""
+        fields = sorted(set(updates) - UPDATABLE_FIELDS)
+        if fields:
+            raise ActivityServiceException(f"Invalid activity update: unknown or read-only field(s) {', '.join(fields)}")
         try:
-            # Validate updates using Activity model (partial)
-            update_fields = {f"activities.$.{k}": v for k, v in updates.items()}
-            result = await self.collection.update_one(
-                {"user_id": user_id, "activities.id": entry_id},
-                {"$set": update_fields}
-            )
-            return result.modified_count > 0
+            entry = await self._find_entry(user_id, entry_id)
+            if entry is None:
+                return False
+            # The updated entry must still be a valid `Activity` before anything is written.
+            try:
+                updated = Activity.model_validate({**entry, **updates}).model_dump()
+                day_key(updated["timestamp"])
+            except (ValidationError, ValueError, TypeError) as e:
+                raise ActivityServiceException(f"Invalid activity update: {e}")
+            changes = {k: updated[k] for k in updates}
+            written = await self.store.update_entry(user_id, entry_id, changes)
+            if not await self.archive.update_entry(user_id, entry_id, changes) and not written:
+                return False
+        except ActivityServiceException:
+            raise
         except Exception as e:
             logger.error(f"Error updating activity entry for {user_id}: {e}")
             raise ActivityServiceException("Failed to update activity entry")
+        try:
+            await self.rollups.apply(user_id, [entry], sign=-1)
+            await self.rollups.apply(user_id, [updated])
+            await self.achievements.evaluate(user_id, [updated])
+            await self.sync.record(user_id, ACTIVITY, entry["id"], updated)
+        except Exception as e:
+            logger.error(f"Error updating rollups after updating activity entry {entry_id} for {user_id}: {e}")
+            await self._flag_rollup_rebuild(user_id)
+        return True
 
     async def get_monthly_history(self, user_id: str, activity_type: str, year: int, month: int) -> List[Dict[str, Any]]:
         """Return a list of daily values for a month for the given activity_type (for calendar view)."""
         try:
-            doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
-            if not doc or "activities" not in doc:
-                return []
             days_in_month = monthrange(year, month)[1]
             daily = [0] * days_in_month
             metric = self.field_map.get(activity_type, None)
-            for a in doc["activities"]:
-                if a["type"] == activity_type:
-                    ts = datetime.fromisoformat(a["timestamp"])
-                    if ts.year == year and ts.month == month:
-                        day = ts.day - 1
-                        if metric and metric in a:
-                            daily[day] += a.get(metric, 0)
+            if metric:
+                docs = await self.rollups.get_totals(user_id, MONTH, f"{year:04d}-{month:02d}", activity_type)
+                for day, value in (docs[0].get("days", {}) if docs else {}).items():
+                    daily[int(day) - 1] = value
             return [{"day": i+1, "value": daily[i]} for i in range(days_in_month)]
         except Exception as e:
             logger.error(f"Error getting monthly history for {user_id}: {e}")
             raise ActivityServiceException("Failed to get monthly history")
 
+    async def get_trends(self, user_id: str, types: Optional[List[str]] = None, window: int = 30) -> Dict[str, Any]:
+        """Return daily values, rolling 7/30-day averages, percentiles, streaks and goal-hit ratios per type for the last `window` days."""
+        if not 1 <= window <= MAX_TREND_WINDOW:
+            raise ActivityServiceException(f"window must be between 1 and {MAX_TREND_WINDOW} days")
+        try:
+            types = list(dict.fromkeys(types)) if types else list(self.field_map)
+            today = datetime.utcnow().date()
+            start = history_start(today, window)
+            docs = await self.rollups.get_days(user_id, types, start.isoformat(), today.isoformat())
+            goals = await GoalService(self.app).get_goals(user_id)
+            matrix = load_matrix(docs, types, start, history_days(window))
+            return trends(matrix, types, daily_goals(goals), window, start)
+        except Exception as e:
+            logger.error(f"Error computing activity trends for {user_id}: {e}")
+            raise ActivityServiceException("Failed to compute activity trends")
+
     async def get_lifetime_totals(self, user_id: str) -> Dict[str, float]:
         """Return total for each tracker type since account creation."""
         try:
-            doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
-            if not doc or "activities" not in doc:
-                return {}
-            totals = {}
-            for a in doc["activities"]:
-                t = a["type"]
-                metric = self.field_map.get(t, None)
-                if metric and metric in a:
-                    totals[t] = totals.get(t, 0) + a.get(metric, 0)
-            return totals
+            docs = await self.rollups.get_totals(user_id, LIFETIME, LIFETIME_KEY)
+            # Entries without their tracker's metric field don't count towards a total.
+            return {d["type"]: d["value"] for d in docs if "value" in d}
         except Exception as e:
             logger.error(f"Error getting lifetime totals for {user_id}: {e}")
             raise ActivityServiceException("Failed to get lifetime totals")
@@ -198,14 +553,49 @@ class ActivityService:
     async def get_last_sync_time(self, user_id: str, activity_type: str) -> Optional[str]:
         """Return the last sync timestamp for a tracker (activity_type), if available."""
         try:
-            doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
-            if not doc or "activities" not in doc:
-                return None
-            # Find the latest timestamp for the given activity_type
-            timestamps = [a["timestamp"] for a in doc["activities"] if a["type"] == activity_type]
-            if not timestamps:
-                return None
-            return max(timestamps)
+            latest = await self.store.latest_timestamp(user_id, activity_type)
+            return latest.isoformat() if latest else None
         except Exception as e:
             logger.error(f"Error getting last sync time for {user_id}: {e}")
-            raise ActivityServiceException("Failed to get last sync time") 
\ No newline at end of file
+            raise ActivityServiceException("Failed to get last sync time") 
+
+    @staticmethod
+    def hot_cutoff(days: int = ACTIVITY_ARCHIVE_AFTER_DAYS) -> datetime:
+        """Start (UTC midnight) of the hot window; older entries may have been archived."""
+        return datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
+
+    def _reaches_archive(self, start: Optional[datetime]) -> bool:
+        """Whether a range starting at `start` reaches past the hot window, so entries may be in the archive."""
+        return start is None or start < self.hot_cutoff()
+
+    async def _all_entries(self, user_id: str) -> AsyncIterator[Dict[str, Any]]:
+        archived_ids = set()
+        for doc in await self.archive.find_entries(user_id):
+            archived_ids.add(doc["id"])
+            yield doc
+        async for doc in self.store.collection.aggregate(self.store.entry_pipeline(user_id)):
+            # Skip entries still hot because archiving was interrupted between copying and removing them.
+            if doc["id"] not in archived_ids:
+                yield doc
+
+    async def archive_entries(self, user_id: str, older_than_days: int = ACTIVITY_ARCHIVE_AFTER_DAYS) -> Dict[str, int]:
+        """Move the user's entries from before the hot window into compressed monthly archive blobs."""
+        try:
+            docs, token = await self.store.find_archivable(user_id, self.hot_cutoff(older_than_days))
+            if not docs:
+                return {"archived": 0, "removed": 0}
+            # Copy first: an interrupted run leaves duplicates (skipped on read), never lost entries.
+            archived = await self.archive.add(user_id, docs)
+            removed = await self.store.remove_archived(user_id, token)
+            return {"archived": archived, "removed": removed}
+        except Exception as e:
+            logger.error(f"Error archiving activity entries for {user_id}: {e}")
+            raise ActivityServiceException("Failed to archive activity entries")
+
+    async def rebuild_rollups(self, user_id: str, dry_run: bool = False) -> List[Dict[str, Any]]:
+        """Recompute the user's rollups from raw entries. Returns the drift that was found (and fixed unless dry_run)."""
+        try:
+            return await self.rollups.rebuild(user_id, self._all_entries(user_id), dry_run=dry_run)
+        except Exception as e:
+            logger.error(f"Error rebuilding activity rollups for {user_id}: {e}")
+            raise ActivityServiceException("Failed to rebuild activity rollups")
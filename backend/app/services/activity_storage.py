@@ -0,0 +1,448 @@
+"""
+Storage layouts for activity entries.
+
+`embedded` keeps the legacy shape: a single `activity_tracker` document per user with an
+unbounded `activities` array. `bucketed` stores entries in `activity_buckets`, one document
+per user, activity type and UTC day, rolling over to a new bucket once `max_entries` is reached,
+so reads only touch the buckets inside the requested date range. `timeseries` writes each entry
+to the `activity_series` time-series collection (MongoDB 7.0+), with `{user_id, type}` as the
+metaField, and lets the server do the bucketing and compression.
+
+Entries are stored with `timestamp` as a BSON date (UTC) and a precomputed UTC `day` key;
+the stores convert back to the ISO-string shape of the `Activity` model on the way out.
+"""
+
+from datetime import datetime, timezone
+from collections import defaultdict
+from typing import Optional, List, Dict, Any, Set, Tuple, Union
+from pymongo import ASCENDING, DESCENDING, DeleteOne, UpdateOne, ReturnDocument
+from pymongo.errors import BulkWriteError, CollectionInvalid
+
+DEFAULT_BUCKET_MAX_ENTRIES = 200
+
+
+def to_utc(timestamp: Union[str, datetime]) -> datetime:
+    """Return a timestamp (ISO string or datetime) as a naive UTC datetime, the form BSON dates come back in."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def day_key(timestamp: Union[str, datetime]) -> str:
+    """Return the `YYYY-MM-DD` UTC day a timestamp falls on."""
+    return to_utc(timestamp).date().isoformat()
+
+
+def to_document(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Storage form of an activity entry."""
+    ts = to_utc(entry["timestamp"])
+    return {**entry, "timestamp": ts, "day": ts.date().isoformat()}
+
+
+def from_document(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """API (`Activity`) form of a stored entry."""
+    entry = {k: v for k, v in doc.items() if k != "day"}
+    if isinstance(entry.get("timestamp"), datetime):
+        entry["timestamp"] = entry["timestamp"].isoformat()
+    return entry
+
+
+def _document_updates(updates: Dict[str, Any]) -> Dict[str, Any]:
+    if "timestamp" not in updates:
+        return updates
+    ts = to_utc(updates["timestamp"])
+    return {**updates, "timestamp": ts, "day": ts.date().isoformat()}
+
+
+def _failed_entries(error: BulkWriteError, op_entries: List[List[int]]) -> Set[int]:
+    """Map the failed operations of an unordered bulk write back to the entries they carried."""
+    return {n for err in error.details.get("writeErrors", []) for n in op_entries[err["index"]]}
+
+
+def _range(low, high) -> Dict[str, Any]:
+    bounds = {}
+    if low is not None:
+        bounds["$gte"] = low
+    if high is not None:
+        bounds["$lte"] = high
+    return bounds
+
+
+class EmbeddedActivityStore:
+    """One `activity_tracker` document per user holding every entry in `activities`."""
+
+    name = "embedded"
+
+    def __init__(self, db):
+        self.collection = db['activity_tracker']
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([('user_id', ASCENDING)])
+        await self.collection.create_index([('user_id', ASCENDING), ('activities.type', ASCENDING), ('activities.timestamp', ASCENDING)])
+
+    async def user_ids(self) -> List[str]:
+        return await self.collection.distinct("user_id")
+
+    async def insert(self, user_id: str, entry: Dict[str, Any]):
+        await self.collection.update_one(
+            {"user_id": user_id},
+            {"$push": {"activities": to_document(entry)}},
+            upsert=True
+        )
+
+    async def insert_many(self, user_id: str, entries: List[Dict[str, Any]]) -> Set[int]:
+        """Append entries in one write. Returns the positions of entries that failed to be written."""
+        try:
+            await self.collection.bulk_write(
+                [UpdateOne({"user_id": user_id}, {"$push": {"activities": {"$each": [to_document(e) for e in entries]}}}, upsert=True)],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            return _failed_entries(e, [list(range(len(entries)))])
+        return set()
+
+    def entry_pipeline(self, user_id: str, activity_type: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Aggregation stages yielding one stored entry per document, optionally within [start, end] (UTC)."""
+        conditions = []
+        if activity_type is not None:
+            conditions.append({"$eq": ["$$a.type", activity_type]})
+        if start is not None:
+            conditions.append({"$gte": ["$$a.timestamp", start]})
+        if end is not None:
+            conditions.append({"$lte": ["$$a.timestamp", end]})
+        pipeline: List[Dict[str, Any]] = [{"$match": {"user_id": user_id}}]
+        if conditions:
+            # Trim the array server-side so only the requested type and window leave mongod.
+            pipeline.append({"$project": {"activities": {"$filter": {"input": "$activities", "as": "a", "cond": {"$and": conditions}}}}})
+        pipeline += [
+            {"$unwind": "$activities"},
+            {"$replaceRoot": {"newRoot": "$activities"}},
+        ]
+        return pipeline
+
+    async def find_entries(self, user_id: str, activity_type: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        pipeline = self.entry_pipeline(user_id, activity_type, start, end)
+        return [from_document(a) async for a in self.collection.aggregate(pipeline)]
+
+    async def find_entry(self, user_id: str, entry_id) -> Optional[Dict[str, Any]]:
+        doc = await self.collection.find_one(
+            {"user_id": user_id, "activities.id": entry_id},
+            {"activities": {"$elemMatch": {"id": entry_id}}}
+        )
+        if not doc or not doc.get("activities"):
+            return None
+        return from_document(doc["activities"][0])
+
+    async def latest_timestamp(self, user_id: str, activity_type: str) -> Optional[datetime]:
+        pipeline = self.entry_pipeline(user_id, activity_type) + [
+            {"$group": {"_id": None, "latest": {"$max": "$timestamp"}}},
+        ]
+        docs = [d async for d in self.collection.aggregate(pipeline)]
+        return docs[0]["latest"] if docs else None
+
+    async def update_entry(self, user_id: str, entry_id, updates: Dict[str, Any]) -> bool:
+        update_fields = {f"activities.$.{k}": v for k, v in _document_updates(updates).items()}
+        result = await self.collection.update_one(
+            {"user_id": user_id, "activities.id": entry_id},
+            {"$set": update_fields}
+        )
+        return result.modified_count > 0
+
+    async def delete_entry(self, user_id: str, entry_id) -> bool:
+        result = await self.collection.update_one(
+            {"user_id": user_id},
+            {"$pull": {"activities": {"id": entry_id}}}
+        )
+        return result.modified_count > 0
+
+    async def find_archivable(self, user_id: str, before: datetime) -> Tuple[List[Dict[str, Any]], Any]:
+        """Stored entries older than `before`, plus a token for `remove_archived` naming exactly those entries."""
+        pipeline = self.entry_pipeline(user_id) + [{"$match": {"timestamp": {"$lt": before}}}]
+        docs = [d async for d in self.collection.aggregate(pipeline)]
+        return docs, [d["id"] for d in docs]
+
+    async def remove_archived(self, user_id: str, token) -> int:
+        if not token:
+            return 0
+        # The pre-image shows which of the entries were still there for the (atomic) pull to remove.
+        before = await self.collection.find_one_and_update(
+            {"user_id": user_id},
+            {"$pull": {"activities": {"id": {"$in": token}}}},
+            projection={"_id": 0, "activities.id": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        ids = set(token)
+        return sum(1 for a in (before or {}).get("activities", []) if a.get("id") in ids)
+
+
+class BucketedActivityStore:
+    """Entries grouped into `activity_buckets` documents keyed by user, type and day."""
+
+    name = "bucketed"
+
+    def __init__(self, db, max_entries: int = DEFAULT_BUCKET_MAX_ENTRIES):
+        self.collection = db['activity_buckets']
+        self.max_entries = max_entries
+
+    async def ensure_indexes(self):
+        # `day` is the bucket's UTC day key, so this index bounds time-range scans to whole days.
+        await self.collection.create_index([('user_id', ASCENDING), ('type', ASCENDING), ('day', ASCENDING)])
+        await self.collection.create_index([('user_id', ASCENDING), ('entries.id', ASCENDING)])
+
+    async def user_ids(self) -> List[str]:
+        return await self.collection.distinct("user_id")
+
+    async def insert(self, user_id: str, entry: Dict[str, Any]):
+        doc = to_document(entry)
+        # Fill the open bucket for the day; the upsert opens a new one once it is full.
+        await self.collection.update_one(
+            {"user_id": user_id, "type": doc["type"], "day": doc["day"], "count": {"$lt": self.max_entries}},
+            {"$push": {"entries": doc}, "$inc": {"count": 1}},
+            upsert=True
+        )
+
+    async def insert_many(self, user_id: str, entries: List[Dict[str, Any]]) -> Set[int]:
+        """Write entries with one unordered bulk write, one `$push: {$each}` per bucket-sized group.
+
+        Returns the positions of entries that failed to be written.
+        """
+        docs = [to_document(e) for e in entries]
+        grouped = defaultdict(list)
+        for n, doc in enumerate(docs):
+            grouped[(doc["type"], doc["day"])].append(n)
+        ops, op_entries = [], []
+        for (activity_type, day), positions in grouped.items():
+            for i in range(0, len(positions), self.max_entries):
+                chunk = positions[i:i + self.max_entries]
+                # Only a bucket with room for the whole chunk matches; otherwise a new one is opened.
+                ops.append(UpdateOne(
+                    {"user_id": user_id, "type": activity_type, "day": day, "count": {"$lte": self.max_entries - len(chunk)}},
+                    {"$push": {"entries": {"$each": [docs[n] for n in chunk]}}, "$inc": {"count": len(chunk)}},
+                    upsert=True
+                ))
+                op_entries.append(chunk)
+        try:
+            await self.collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            return _failed_entries(e, op_entries)
+        return set()
+
+    def entry_pipeline(self, user_id: str, activity_type: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Aggregation stages yielding one stored entry per document, optionally within [start, end] (UTC)."""
+        query: Dict[str, Any] = {"user_id": user_id}
+        if activity_type is not None:
+            query["type"] = activity_type
+        if start is not None or end is not None:
+            query["day"] = _range(day_key(start) if start else None, day_key(end) if end else None)
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": query},
+            {"$sort": {"day": ASCENDING, "_id": ASCENDING}},
+            {"$unwind": "$entries"},
+            {"$replaceRoot": {"newRoot": "$entries"}},
+        ]
+        if start is not None or end is not None:
+            pipeline.append({"$match": {"timestamp": _range(start, end)}})
+        return pipeline
+
+    async def find_entries(self, user_id: str, activity_type: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        pipeline = self.entry_pipeline(user_id, activity_type, start, end)
+        return [from_document(a) async for a in self.collection.aggregate(pipeline)]
+
+    async def find_entry(self, user_id: str, entry_id) -> Optional[Dict[str, Any]]:
+        doc = await self.collection.find_one(
+            {"user_id": user_id, "entries.id": entry_id},
+            {"entries": {"$elemMatch": {"id": entry_id}}}
+        )
+        if not doc or not doc.get("entries"):
+            return None
+        return from_document(doc["entries"][0])
+
+    async def latest_timestamp(self, user_id: str, activity_type: str) -> Optional[datetime]:
+        # Only the buckets of the newest day can hold the latest entry.
+        newest = await self.collection.find_one(
+            {"user_id": user_id, "type": activity_type, "count": {"$gt": 0}},
+            {"day": 1},
+            sort=[("day", DESCENDING)]
+        )
+        if not newest:
+            return None
+        pipeline = [
+            {"$match": {"user_id": user_id, "type": activity_type, "day": newest["day"]}},
+            {"$unwind": "$entries"},
+            {"$group": {"_id": None, "latest": {"$max": "$entries.timestamp"}}},
+        ]
+        docs = [d async for d in self.collection.aggregate(pipeline)]
+        return docs[0]["latest"] if docs else None
+
+    async def update_entry(self, user_id: str, entry_id, updates: Dict[str, Any]) -> bool:
+        if "timestamp" in updates or "type" in updates:
+            bucket = await self.collection.find_one(
+                {"user_id": user_id, "entries.id": entry_id},
+                {"entries": {"$elemMatch": {"id": entry_id}}}
+            )
+            if not bucket or not bucket.get("entries"):
+                return False
+            current = from_document(bucket["entries"][0])
+            moved = {**current, **updates}
+            if moved["type"] != current["type"] or day_key(moved["timestamp"]) != day_key(current["timestamp"]):
+                # The entry belongs in another bucket. Insert it there before pulling it from this one:
+                # a failure in between leaves a duplicate for the next update or delete, never a lost entry.
+                await self.insert(user_id, moved)
+                result = await self.collection.update_one(
+                    {"_id": bucket["_id"], "entries.id": entry_id},
+                    {"$pull": {"entries": {"id": entry_id}}, "$inc": {"count": -1}}
+                )
+                return result.modified_count > 0
+        # Same bucket: patch the entry's fields in place, in one atomic update.
+        update_fields = {f"entries.$[e].{k}": v for k, v in _document_updates(updates).items()}
+        result = await self.collection.update_one(
+            {"user_id": user_id, "entries.id": entry_id},
+            {"$set": update_fields},
+            array_filters=[{"e.id": entry_id}]
+        )
+        return result.modified_count > 0
+
+    async def delete_entry(self, user_id: str, entry_id) -> bool:
+        result = await self.collection.update_one(
+            {"user_id": user_id, "entries.id": entry_id},
+            {"$pull": {"entries": {"id": entry_id}}, "$inc": {"count": -1}}
+        )
+        return result.modified_count > 0
+
+    async def find_archivable(self, user_id: str, before: datetime) -> Tuple[List[Dict[str, Any]], Any]:
+        """Entries of whole days before `before`, plus a token for `remove_archived` naming the buckets read."""
+        docs, buckets = [], []
+        async for bucket in self.collection.find({"user_id": user_id, "day": {"$lt": day_key(before)}}):
+            docs.extend(bucket.get("entries", []))
+            buckets.append((bucket["_id"], bucket.get("count", 0)))
+        return docs, buckets
+
+    async def remove_archived(self, user_id: str, token) -> int:
+        if not token:
+            return 0
+        # A bucket whose count changed since it was read (a late write) is kept for the next run.
+        result = await self.collection.bulk_write([DeleteOne({"_id": _id, "count": count}) for _id, count in token], ordered=False)
+        return result.deleted_count
+
+
+def to_series_document(user_id: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Time-series form of an entry: the user and type move into the `meta` field."""
+    doc = {k: v for k, v in entry.items() if k != "type"}
+    doc["timestamp"] = to_utc(entry["timestamp"])
+    doc["meta"] = {"user_id": user_id, "type": entry["type"]}
+    return doc
+
+
+class TimeSeriesActivityStore:
+    """One measurement per entry in the `activity_series` time-series collection."""
+
+    name = "timeseries"
+    # Series stages end with documents of the `to_document` shape, so consumers can't tell the layouts apart.
+    _entry_stages = [
+        {"$addFields": {"type": "$meta.type"}},
+        {"$project": {"_id": 0, "meta": 0}},
+    ]
+
+    def __init__(self, db):
+        self.db = db
+        self.collection = db['activity_series']
+
+    async def ensure_indexes(self):
+        try:
+            await self.db.create_collection(
+                'activity_series',
+                timeseries={"timeField": "timestamp", "metaField": "meta", "granularity": "minutes"}
+            )
+        except CollectionInvalid:
+            # Already there; make sure it wasn't created implicitly (as a plain collection) by an earlier insert.
+            info = await self.db.list_collections(filter={"name": "activity_series"}).to_list(1)
+            if not info or info[0].get("type") != "timeseries":
+                raise CollectionInvalid("activity_series exists but is not a time-series collection; "
+                                        "rename or drop it and re-run scripts.migrate_activity_timeseries")
+        await self.collection.create_index([('meta.user_id', ASCENDING), ('meta.type', ASCENDING), ('timestamp', ASCENDING)])
+        await self.collection.create_index([('meta.user_id', ASCENDING), ('id', ASCENDING)])
+
+    async def user_ids(self) -> List[str]:
+        return await self.collection.distinct("meta.user_id")
+
+    async def insert(self, user_id: str, entry: Dict[str, Any]):
+        await self.collection.insert_one(to_series_document(user_id, entry))
+
+    async def insert_many(self, user_id: str, entries: List[Dict[str, Any]]) -> Set[int]:
+        """Insert entries with one unordered `insert_many`. Returns the positions of entries that failed to be written."""
+        try:
+            await self.collection.insert_many([to_series_document(user_id, e) for e in entries], ordered=False)
+        except BulkWriteError as e:
+            return {err["index"] for err in e.details.get("writeErrors", [])}
+        return set()
+
+    def entry_pipeline(self, user_id: str, activity_type: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Aggregation stages yielding one stored entry per document, optionally within [start, end] (UTC)."""
+        query: Dict[str, Any] = {"meta.user_id": user_id}
+        if activity_type is not None:
+            query["meta.type"] = activity_type
+        if start is not None or end is not None:
+            query["timestamp"] = _range(start, end)
+        return [{"$match": query}, {"$sort": {"timestamp": ASCENDING}}] + self._entry_stages
+
+    async def find_entries(self, user_id: str, activity_type: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        pipeline = self.entry_pipeline(user_id, activity_type, start, end)
+        return [from_document(a) async for a in self.collection.aggregate(pipeline)]
+
+    async def find_entry(self, user_id: str, entry_id) -> Optional[Dict[str, Any]]:
+        pipeline = [{"$match": {"meta.user_id": user_id, "id": entry_id}}, {"$limit": 1}] + self._entry_stages
+        docs = [d async for d in self.collection.aggregate(pipeline)]
+        return from_document(docs[0]) if docs else None
+
+    async def latest_timestamp(self, user_id: str, activity_type: str) -> Optional[datetime]:
+        doc = await self.collection.find_one(
+            {"meta.user_id": user_id, "meta.type": activity_type},
+            {"timestamp": 1},
+            sort=[("timestamp", DESCENDING)]
+        )
+        return doc["timestamp"] if doc else None
+
+    async def update_entry(self, user_id: str, entry_id, updates: Dict[str, Any]) -> bool:
+        # Measurements can't reliably be patched in place, so replace the entry: insert the new
+        # measurement first and then delete the old one by `_id`, so a failure in between leaves a
+        # duplicate rather than losing the entry.
+        docs = [d async for d in self.collection.aggregate(
+            [{"$match": {"meta.user_id": user_id, "id": entry_id}}, {"$limit": 1}, {"$addFields": {"type": "$meta.type"}}]
+        )]
+        if not docs:
+            return False
+        old_id = docs[0].pop("_id")
+        current = from_document({k: v for k, v in docs[0].items() if k != "meta"})
+        await self.insert(user_id, {**current, **updates})
+        # Time-series collections only support multi-document deletes.
+        await self.collection.delete_many({"_id": old_id})
+        return True
+
+    async def delete_entry(self, user_id: str, entry_id) -> bool:
+        # Time-series collections only support multi-document deletes.
+        result = await self.collection.delete_many({"meta.user_id": user_id, "id": entry_id})
+        return result.deleted_count > 0
+
+    async def find_archivable(self, user_id: str, before: datetime) -> Tuple[List[Dict[str, Any]], Any]:
+        """Stored entries older than `before`, plus a token for `remove_archived` naming exactly those entries."""
+        docs = [d async for d in self.collection.aggregate(self.entry_pipeline(user_id) + [{"$match": {"timestamp": {"$lt": before}}}])]
+        return docs, [d["id"] for d in docs]
+
+    async def remove_archived(self, user_id: str, token) -> int:
+        if not token:
+            return 0
+        result = await self.collection.delete_many({"meta.user_id": user_id, "id": {"$in": token}})
+        return result.deleted_count
+
+
+def get_activity_store(storage: str, db, bucket_max_entries: int = DEFAULT_BUCKET_MAX_ENTRIES):
+    """Build the activity store for a configured storage mode."""
+    if storage == EmbeddedActivityStore.name:
+        return EmbeddedActivityStore(db)
+    if storage == BucketedActivityStore.name:
+        return BucketedActivityStore(db, max_entries=bucket_max_entries)
+    if storage == TimeSeriesActivityStore.name:
+        return TimeSeriesActivityStore(db)
+    raise ValueError(f"Unknown activity storage mode: {storage}")
@@ -2,7 +2,6 @@
 Service for managing user assessments (listing, starting, resuming, submitting)
 """
 
-import uuid
 from app.models.launchpad.hra import HraStep, Question
 from sanic import Sanic
 from sanic.log import logger
@@ -11,6 +10,7 @@ from datetime import datetime
 from pymongo import ASCENDING
 from app.models.launchpad.assessment import AssessmentTemplatePayload, AssessmentAnswersPayload
 from pydantic import ValidationError
+from app.utils.snowflake import next_id
 
 class AssessmentServiceException(Exception):
     pass
@@ -48,15 +48,15 @@ class AssessmentService:
         try:
             # Validate template input
             try:
-                validated_template = AssessmentTemplatePayload(**template)
+                validated_template = AssessmentTemplatePayload.model_validate(template)
             except ValidationError as ve:
                 logger.error(f"Assessment template validation error for {user_id}: {ve}")
                 raise AssessmentServiceException(f"Invalid assessment template: {ve}")
-            session_id = str(uuid.uuid4())
+            session_id = str(next_id())
             assessment_doc = {
                 "session_id": session_id,
                 "user_id": user_id,
-                "template": validated_template.dict(),
+                "template": validated_template.model_dump(),
                 "responses": {},
                 "status": "in_progress",
                 "started_at": datetime.utcnow().isoformat(),
@@ -84,7 +84,7 @@ class AssessmentService:
         try:
             # Validate answers input
             try:
-                validated_answers = AssessmentAnswersPayload(answers=answers)
+                validated_answers = AssessmentAnswersPayload.model_validate({"answers": answers})
             except ValidationError as ve:
                 logger.error(f"Assessment answers validation error for {user_id}, {session_id}: {ve}")
                 raise AssessmentServiceException(f"Invalid assessment answers: {ve}")
@@ -2,12 +2,13 @@
 Service for managing user challenges (listing, joining, progress, check-in)
 """
 
-import uuid
 from sanic import Sanic
 from sanic.log import logger
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from pymongo import ASCENDING
+from app.utils.snowflake import next_id
+from app.services.sync_service import SyncService, CHALLENGE
 
 class ChallengeServiceException(Exception):
     pass
@@ -17,6 +18,7 @@ class ChallengeService:
         self.app = app
         self.challenges = app.ctx.mongo['launchpad_db']['challenges']
         self.user_challenges = app.ctx.mongo['launchpad_db']['user_challenges']
+        self.sync = SyncService(app)
 
     @classmethod
     def register_listeners(cls, app: Sanic):
@@ -52,7 +54,7 @@ class ChallengeService:
             existing = await self.user_challenges.find_one({"user_id": user_id, "challenge_id": challenge_id})
             if existing:
                 return existing["user_challenge_id"]
-            user_challenge_id = str(uuid.uuid4())
+            user_challenge_id = str(next_id())
             doc = {
                 "user_challenge_id": user_challenge_id,
                 "user_id": user_id,
@@ -63,7 +65,9 @@ class ChallengeService:
                 "joined_at": datetime.utcnow().isoformat(),
                 "completed_at": None
             }
-            await self.user_challenges.insert_one(doc)
+            # insert_one adds an ObjectId `_id` to what it is given, so insert a copy and sync the clean doc.
+            await self.user_challenges.insert_one(dict(doc))
+            await self.sync.record(user_id, CHALLENGE, challenge_id, doc)
             return user_challenge_id
         except Exception as e:
             logger.error(f"Error joining challenge for {user_id}: {e}")
@@ -77,6 +81,9 @@ class ChallengeService:
                 {"user_id": user_id, "challenge_id": challenge_id, "status": "in_progress"},
                 {"$push": {"check_ins": now}, "$inc": {"progress": 1}}
             )
+            if result.modified_count > 0:
+                doc = await self.user_challenges.find_one({"user_id": user_id, "challenge_id": challenge_id}, {"_id": 0})
+                await self.sync.record(user_id, CHALLENGE, challenge_id, doc)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error check-in for {user_id} in challenge {challenge_id}: {e}")
@@ -94,6 +101,8 @@ class ChallengeService:
         """Allow user to leave a challenge (delete user_challenge entry)."""
         try:
             result = await self.user_challenges.delete_one({"user_id": user_id, "challenge_id": challenge_id})
+            if result.deleted_count > 0:
+                await self.sync.record(user_id, CHALLENGE, challenge_id, deleted=True)
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error leaving challenge for {user_id}: {e}")
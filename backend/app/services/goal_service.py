@@ -8,6 +8,7 @@ from sanic import Sanic
 from sanic.log import logger
 from typing import Optional, Dict, Any
 from pymongo import ASCENDING
+from app.services.sync_service import SyncService, GOALS
 
 class GoalServiceException(Exception):
     pass
@@ -16,6 +17,7 @@ class GoalService:
     def __init__(self, app: Sanic):
         self.app = app
         self.collection = app.ctx.mongo['launchpad_db']['user_goals']
+        self.sync = SyncService(app)
 
     @classmethod
     def register_listeners(cls, app: Sanic):
@@ -27,6 +29,10 @@ class GoalService:
             except Exception as e:
                 logger.error(f"Failed to create indexes: {e}")
 
+    async def _record_change(self, user_id: str):
+        doc = await self.collection.find_one({"user_id": user_id}, {"goals": 1})
+        await self.sync.record(user_id, GOALS, GOALS, (doc or {}).get("goals"))
+
     async def get_goals(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Return the user's goals."""
         try:
@@ -42,13 +48,16 @@ class GoalService:
         """Set new goals for the user (overwrites existing)."""
         try:
             # Validate using Goals model
-            goals = Goals(**goal_data)
+            goals = Goals.model_validate(goal_data)
             result = await self.collection.update_one(
                 {"user_id": user_id},
-                {"$set": {"goals": goals.dict()}},
+                {"$set": {"goals": goals.model_dump()}},
                 upsert=True
             )
-            return result.modified_count > 0 or result.upserted_id is not None
+            changed = result.modified_count > 0 or result.upserted_id is not None
+            if changed:
+                await self.sync.record(user_id, GOALS, GOALS, goals.model_dump())
+            return changed
         except Exception as e:
             logger.error(f"Error setting goals for {user_id}: {e}")
             raise GoalServiceException("Failed to set goals")
@@ -64,6 +73,8 @@ class GoalService:
                 {"user_id": user_id},
                 {"$set": {update_field: goal_data}}
             )
+            if result.modified_count > 0:
+                await self._record_change(user_id)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating {goal_type} goal for {user_id}: {e}")
@@ -79,6 +90,8 @@ class GoalService:
                 {"user_id": user_id},
                 {"$unset": {update_field: ""}}
             )
+            if result.modified_count > 0:
+                await self._record_change(user_id)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error deleting {goal_type} goal for {user_id}: {e}")
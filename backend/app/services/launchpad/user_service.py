@@ -1,4 +1,8 @@
+from app.db.cache import get_shared_cache
+from app.db.config import USER_CONFIG_CACHE_SIZE, USER_CONFIG_CACHE_TTL_SECONDS, USER_CONFIG_SHARED_TTL_SECONDS
 from app.models.launchpad.user import User, Form, Widget
+from app.utils.cache import ReadThroughCache
+from app.utils.static_response import StaticJSON
 from sanic import Sanic
 
 EXAMPLE_USER = User(
@@ -14,8 +18,45 @@ EXAMPLE_USER = User(
     )
 )
 
-async def get_user_config(app: Sanic, user_id=1):
-    user = await app.ctx.mongo.vitality_service_db.users.find_one({"id": user_id})
+
+def get_user_config_cache(app: Sanic) -> ReadThroughCache[StaticJSON]:
+    """The worker's cache of encoded camelCase config responses, created on first use."""
+    cache = getattr(app.ctx, "user_configs", None)
+    if cache is None:
+        cache = app.ctx.user_configs = ReadThroughCache(
+            get_shared_cache(app), "user_config",
+            encode=lambda payload: payload.body, decode=StaticJSON.from_body,
+            local_size=USER_CONFIG_CACHE_SIZE, local_ttl=USER_CONFIG_CACHE_TTL_SECONDS,
+            shared_ttl=USER_CONFIG_SHARED_TTL_SECONDS,
+        )
+    return cache
+
+def config_filter(user_id: str) -> dict:
+    """Query for a user's config document. Configs saved before accounts existed store a numeric id."""
+    if user_id.isdigit():
+        return {"id": {"$in": [user_id, int(user_id)]}}
+    return {"id": user_id}
+
+async def get_user_config(app: Sanic, user_id: str) -> User:
+    """The user's stored config, or the example config for a user who hasn't saved one."""
+    user = await app.ctx.mongo.vitality_service_db.users.find_one(config_filter(user_id))
     if user:
-        return User.parse_obj(user)
-    return EXAMPLE_USER 
\ No newline at end of file
+        return User.model_validate(user)
+    return EXAMPLE_USER.model_copy(update={"id": user_id})
+
+async def get_user_config_payload(app: Sanic, user_id: str) -> StaticJSON:
+    """The user's config as the encoded camelCase response body, read through the cache."""
+    async def load() -> StaticJSON:
+        user = await get_user_config(app, user_id)
+        return StaticJSON(user.model_dump(by_alias=True))
+    return await get_user_config_cache(app).get(user_id, load)
+
+async def update_user_config(app: Sanic, user: User) -> User:
+    """Store the config (snake_case, as read by `get_user_config`) and drop its cached response."""
+    users = app.ctx.mongo.vitality_service_db.users
+    existing = await users.find_one(config_filter(user.id), {"_id": 1})
+    # Replace a numeric-id document in place (its id becomes the string) rather than adding a second one.
+    match = {"_id": existing["_id"]} if existing else {"id": user.id}
+    await users.replace_one(match, user.model_dump(), upsert=True)
+    await get_user_config_cache(app).invalidate(user.id)
+    return user
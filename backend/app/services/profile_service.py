@@ -57,10 +57,10 @@ class ProfileService:
         try:
             if "steps" not in profile_data or not isinstance(profile_data["steps"], list):
                 raise ValueError("Profile data must include a 'steps' list.")
-            payload = ProfilePayload(**profile_data)
+            payload = ProfilePayload.model_validate(profile_data)
             result = await self.collection.update_one(
                 {"user_id": user_id},
-                {"$set": {"profile": payload.dict(), "updated_at": datetime.utcnow()}},
+                {"$set": {"profile": payload.model_dump(), "updated_at": datetime.utcnow()}},
                 upsert=True
             )
             return result.modified_count > 0 or result.upserted_id is not None
@@ -81,10 +81,10 @@ class ProfileService:
                     profile["steps"] = v  # Replace steps array
                 else:
                     profile[k] = v
-            payload = ProfilePayload(**profile)
+            payload = ProfilePayload.model_validate(profile)
             result = await self.collection.update_one(
                 {"user_id": user_id},
-                {"$set": {"profile": payload.dict(), "updated_at": datetime.utcnow()}},
+                {"$set": {"profile": payload.model_dump(), "updated_at": datetime.utcnow()}},
             )
             return result.modified_count > 0
         except Exception as e:
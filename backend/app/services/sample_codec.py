@@ -0,0 +1,33 @@
+"""
+Delta encoding of integer sample arrays for BSON binary fields.
+
+Layout: one byte naming the delta dtype, the first value as a little-endian int64, then the
+deltas between consecutive values in the narrowest little-endian integer type that holds them all.
+Per-minute heart rate (deltas of 60 seconds and a few bpm) packs into one byte per value.
+"""
+
+import numpy as np
+
+DELTA_DTYPES = (np.dtype("<i1"), np.dtype("<i2"), np.dtype("<i4"), np.dtype("<i8"))
+_FIRST = np.dtype("<i8")
+HEADER_BYTES = 1 + _FIRST.itemsize
+
+
+def encode(values) -> bytes:
+    values = np.asarray(values, dtype=np.int64)
+    if values.size == 0:
+        return b""
+    deltas = np.diff(values)
+    code = len(DELTA_DTYPES) - 1
+    if deltas.size:
+        low, high = deltas.min(), deltas.max()
+        code = next(i for i, dt in enumerate(DELTA_DTYPES) if np.iinfo(dt).min <= low and high <= np.iinfo(dt).max)
+    return bytes([code]) + values[:1].astype(_FIRST).tobytes() + deltas.astype(DELTA_DTYPES[code]).tobytes()
+
+
+def decode(data: bytes) -> np.ndarray:
+    if not data:
+        return np.empty(0, dtype=np.int64)
+    first = np.frombuffer(data, dtype=_FIRST, count=1, offset=1)
+    deltas = np.frombuffer(data, dtype=DELTA_DTYPES[data[0]], offset=HEADER_BYTES)
+    return np.concatenate((first, first[0] + np.cumsum(deltas, dtype=np.int64)))
@@ -0,0 +1,155 @@
+"""
+Service for high-frequency samples (heart rate, SpO2): one `sample_buckets` document per user,
+metric and UTC day, holding the day's sample times and values as delta-encoded binary arrays.
+"""
+
+from bson.binary import Binary
+from sanic import Sanic
+from sanic.log import logger
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+import numpy as np
+from app.services import sample_codec
+from app.services.activity_storage import to_utc
+
+# Accepted value range per metric.
+SAMPLE_METRICS = {
+    "heart_rate": (20, 250),
+    "spo2": (50, 100),
+}
+
+SECONDS_PER_DAY = 86400
+# Concurrent writers to the same day bucket retry on a version conflict this many times.
+MAX_MERGE_ATTEMPTS = 5
+
+class SampleServiceException(Exception):
+    pass
+
+def _epoch_seconds(timestamp) -> int:
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        return int(timestamp)
+    return int((to_utc(timestamp) - datetime(1970, 1, 1)).total_seconds())
+
+def merge(times: np.ndarray, values: np.ndarray, new_times: np.ndarray, new_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge new samples into a day's arrays, sorted by time; a new sample replaces one at the same second."""
+    all_times = np.concatenate((new_times, times))
+    all_values = np.concatenate((new_values, values))
+    # np.unique keeps the first occurrence, and the new samples come first.
+    unique_times, first = np.unique(all_times, return_index=True)
+    return unique_times, all_values[first]
+
+class SampleService:
+    def __init__(self, app: Sanic):
+        self.app = app
+        self.collection = app.ctx.mongo['launchpad_db']['sample_buckets']
+
+    @classmethod
+    def register_listeners(cls, app: Sanic):
+        @app.listener('before_server_start')
+        async def ensure_indexes(app, loop):
+            collection = app.ctx.mongo['launchpad_db']['sample_buckets']
+            try:
+                await collection.create_index([('user_id', ASCENDING), ('metric', ASCENDING), ('day', ASCENDING)], unique=True)
+            except Exception as e:
+                # The optimistic merge in add_samples relies on this index to turn racing upserts into retries.
+                logger.error(f"Failed to create indexes: {e}")
+                raise
+
+    async def add_samples(self, user_id: str, metric: str, samples: List[Any]) -> Dict[str, Any]:
+        """Store a batch of [timestamp, value] samples (ISO or epoch-second timestamps, integer values).
+
+        Returns how many samples were accepted and the index and reason of every rejected one.
+        """
+        if metric not in SAMPLE_METRICS:
+            raise SampleServiceException(f"Unknown sample metric: {metric}")
+        low, high = SAMPLE_METRICS[metric]
+        rejected, times, values = [], [], []
+        for i, sample in enumerate(samples):
+            try:
+                timestamp, value = sample
+                if not isinstance(value, int) or isinstance(value, bool) or not low <= value <= high:
+                    raise ValueError(f"value must be an integer between {low} and {high}")
+                times.append(_epoch_seconds(timestamp))
+                values.append(value)
+            except (ValueError, TypeError) as e:
+                rejected.append({"index": i, "error": str(e)})
+        try:
+            if times:
+                await self._write(user_id, metric, np.array(times, dtype=np.int64), np.array(values, dtype=np.int64))
+            return {"accepted": len(times), "rejected": rejected}
+        except Exception as e:
+            logger.error(f"Error adding {metric} samples for {user_id}: {e}")
+            raise SampleServiceException("Failed to add samples")
+
+    async def _write(self, user_id: str, metric: str, times: np.ndarray, values: np.ndarray):
+        days = times // SECONDS_PER_DAY
+        pending = {}
+        for day in np.unique(days):
+            in_day = days == day
+            key = str(np.datetime64(int(day), "D"))
+            pending[key] = (times[in_day] - day * SECONDS_PER_DAY, values[in_day])
+        for _ in range(MAX_MERGE_ATTEMPTS):
+            existing = {
+                doc["day"]: doc async for doc in
+                self.collection.find({"user_id": user_id, "metric": metric, "day": {"$in": list(pending)}})
+            }
+            ops, keys = [], []
+            for key, (offsets, day_values) in pending.items():
+                doc = existing.get(key)
+                if doc:
+                    offsets, day_values = merge(sample_codec.decode(doc["t"]), sample_codec.decode(doc["v"]), offsets, day_values)
+                else:
+                    offsets, day_values = merge(np.empty(0, np.int64), np.empty(0, np.int64), offsets, day_values)
+                version = doc["version"] if doc else 0
+                ops.append(UpdateOne(
+                    # A bucket written since we read it no longer matches, and the upsert then hits the unique index.
+                    {"user_id": user_id, "metric": metric, "day": key, "version": version},
+                    {"$set": {
+                        "count": int(offsets.size),
+                        "t": Binary(sample_codec.encode(offsets)),
+                        "v": Binary(sample_codec.encode(day_values)),
+                    }, "$inc": {"version": 1}},
+                    upsert=True
+                ))
+                keys.append(key)
+            try:
+                await self.collection.bulk_write(ops, ordered=False)
+                return
+            except BulkWriteError as e:
+                conflicted = {keys[err["index"]] for err in e.details.get("writeErrors", []) if err.get("code") == 11000}
+                if len(conflicted) < len(e.details.get("writeErrors", [])):
+                    raise
+                pending = {key: pending[key] for key in conflicted}
+        raise SampleServiceException(f"Sample buckets for {user_id} kept changing; gave up after {MAX_MERGE_ATTEMPTS} attempts")
+
+    async def get_samples(self, user_id: str, metric: str, start: Optional[str] = None, end: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (datetime64[s] times, int64 values) for [start, end], decoded from the day buckets in range."""
+        try:
+            query: Dict[str, Any] = {"user_id": user_id, "metric": metric}
+            low = to_utc(start) if start else None
+            high = to_utc(end) if end else None
+            if low or high:
+                query["day"] = {}
+                if low:
+                    query["day"]["$gte"] = low.date().isoformat()
+                if high:
+                    query["day"]["$lte"] = high.date().isoformat()
+            times, values = [], []
+            async for doc in self.collection.find(query, {"day": 1, "t": 1, "v": 1}).sort("day", ASCENDING):
+                midnight = np.datetime64(doc["day"], "s")
+                times.append(midnight + sample_codec.decode(doc["t"]).astype("timedelta64[s]"))
+                values.append(sample_codec.decode(doc["v"]))
+            if not times:
+                return np.empty(0, dtype="datetime64[s]"), np.empty(0, dtype=np.int64)
+            times, values = np.concatenate(times), np.concatenate(values)
+            mask = np.ones(times.size, dtype=bool)
+            if low:
+                mask &= times >= np.datetime64(low, "s")
+            if high:
+                mask &= times <= np.datetime64(high, "s")
+            return times[mask], values[mask]
+        except Exception as e:
+            logger.error(f"Error fetching {metric} samples for {user_id}: {e}")
+            raise SampleServiceException("Failed to fetch samples")
@@ -0,0 +1,145 @@
+"""
+Service for delta sync: a per-user change version and a compacted changelog of what changed.
+
+Every write to activity entries, goals or challenges takes the next version from `user_versions`
+and stamps it on the changed item's row in `sync_changelog` (one row per item, so a client that
+was away for a month gets each item once, in its latest state; deletes are kept as tombstones).
+
+Versions are reserved before the changelog is written, so a lower version can land after a higher
+one. Each reservation is listed under `pending` on the user's `user_versions` document until its
+rows are written, and `get_changes` never hands out a cursor past the lowest pending version.
+"""
+
+from sanic import Sanic
+from sanic.log import logger
+from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, UpdateOne, ReturnDocument
+from pymongo.errors import BulkWriteError
+
+ACTIVITY = "activity"
+GOALS = "goals"
+CHALLENGE = "challenge"
+
+DEFAULT_SYNC_LIMIT = 1000
+# A reservation still pending after this long belongs to a writer that died; it stops holding back
+# the cursor (its versions are simply never written).
+SYNC_PENDING_TIMEOUT_SECONDS = 60
+
+
+def reservation_pipeline(count: int) -> List[Dict[str, Any]]:
+    """Update pipeline that bumps `version` by `count` and lists the range as pending, in one atomic step.
+
+    Expired reservations are dropped from `pending` on the way.
+    """
+    expiry = {"$subtract": ["$$NOW", SYNC_PENDING_TIMEOUT_SECONDS * 1000]}
+    return [
+        {"$set": {"version": {"$add": [{"$ifNull": ["$version", 0]}, count]}}},
+        {"$set": {"pending": {"$concatArrays": [
+            {"$filter": {"input": {"$ifNull": ["$pending", []]}, "cond": {"$gt": ["$$this.at", expiry]}}},
+            [{"first": {"$subtract": ["$version", count - 1]}, "last": "$version", "at": "$$NOW"}],
+        ]}}},
+    ]
+
+
+def readable_version(doc: Optional[Dict[str, Any]], now: datetime) -> int:
+    """Highest version below which every reserved version has either been written or expired."""
+    if not doc:
+        return 0
+    cutoff = now - timedelta(seconds=SYNC_PENDING_TIMEOUT_SECONDS)
+    firsts = [p["first"] for p in doc.get("pending", []) if p["at"] > cutoff]
+    return min([doc.get("version", 0)] + [first - 1 for first in firsts])
+
+class SyncServiceException(Exception):
+    pass
+
+class SyncService:
+    def __init__(self, app: Sanic):
+        self.app = app
+        self.versions = app.ctx.mongo['launchpad_db']['user_versions']
+        self.changelog = app.ctx.mongo['launchpad_db']['sync_changelog']
+
+    @classmethod
+    def register_listeners(cls, app: Sanic):
+        @app.listener('before_server_start')
+        async def ensure_indexes(app, loop):
+            versions = app.ctx.mongo['launchpad_db']['user_versions']
+            changelog = app.ctx.mongo['launchpad_db']['sync_changelog']
+            try:
+                await versions.create_index([('user_id', ASCENDING)], unique=True)
+                await changelog.create_index([('user_id', ASCENDING), ('version', ASCENDING)])
+                await changelog.create_index([('user_id', ASCENDING), ('kind', ASCENDING), ('key', ASCENDING)], unique=True)
+            except Exception as e:
+                # Both unique indexes are what keep concurrent writers from forking a user's version or an item's row.
+                logger.error(f"Failed to create indexes: {e}")
+                raise
+
+    async def _reserve(self, user_id: str, count: int) -> int:
+        """Atomically reserve `count` versions and mark them pending; returns the highest one."""
+        doc = await self.versions.find_one_and_update(
+            {"user_id": user_id},
+            reservation_pipeline(count),
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["version"]
+
+    async def _release(self, user_id: str, last: int):
+        await self.versions.update_one({"user_id": user_id}, {"$pull": {"pending": {"last": last}}})
+
+    async def record(self, user_id: str, kind: str, key: Any, data: Optional[Dict[str, Any]] = None, deleted: bool = False) -> int:
+        """Stamp one changed (or, with deleted=True, removed) item with the user's next version."""
+        return await self.record_many(user_id, kind, [(key, data)], deleted=deleted)
+
+    async def record_many(self, user_id: str, kind: str, items: List[tuple], deleted: bool = False) -> int:
+        """Stamp (key, data) items with consecutive new versions. Returns the last version used."""
+        if not items:
+            return 0
+        last = await self._reserve(user_id, len(items))
+        ops = []
+        for version, (key, data) in enumerate(items, start=last - len(items) + 1):
+            ops.append(UpdateOne(
+                # A concurrent writer that already stamped a newer version wins; our upsert then hits the unique index.
+                {"user_id": user_id, "kind": kind, "key": key, "version": {"$lt": version}},
+                {"$set": {"version": version, "deleted": deleted, "data": None if deleted else data},
+                 "$currentDate": {"changed_at": True}},
+                upsert=True
+            ))
+        try:
+            await self.changelog.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+        finally:
+            # Written or failed, these versions no longer hold back readers.
+            await self._release(user_id, last)
+        return last
+
+    async def get_changes(self, user_id: str, since: int = 0, limit: int = DEFAULT_SYNC_LIMIT) -> Dict[str, Any]:
+        """Return the items changed after version `since`, oldest first.
+
+        `version` is what the client should send as `since` next time; `more` means it should ask again right away.
+        """
+        try:
+            # Read the reservations before the changelog: anything reserved later gets a higher version than `readable`.
+            readable = readable_version(await self.versions.find_one({"user_id": user_id}, {"version": 1, "pending": 1}), datetime.utcnow())
+            rows = [
+                row async for row in self.changelog.find(
+                    {"user_id": user_id, "version": {"$gt": since, "$lte": readable}},
+                    {"_id": 0, "kind": 1, "key": 1, "version": 1, "deleted": 1, "data": 1}
+                ).sort("version", ASCENDING).limit(limit + 1)
+            ]
+            more = len(rows) > limit
+            rows = rows[:limit]
+            for row in rows:
+                if row["kind"] == ACTIVITY:
+                    # Activity ids are 64-bit, so they go out as strings like in the rest of the API.
+                    row["key"] = str(row["key"])
+                    if row.get("data"):
+                        row["data"]["id"] = str(row["data"]["id"])
+            # With nothing left below `readable`, the client can skip straight to it (the gaps were overwritten rows).
+            version = rows[-1]["version"] if more else max(since, readable)
+            return {"version": version, "more": more, "changes": rows}
+        except Exception as e:
+            logger.error(f"Error fetching changes for {user_id} since {since}: {e}")
+            raise SyncServiceException("Failed to fetch changes")
@@ -0,0 +1,157 @@
+"""
+Service for access tokens: issued on login, revoked on logout, and checked on every request from
+the `Authorization: Bearer` header without a database round trip.
+
+Revocations are stored in `revoked_tokens` (expiring with the token) and every worker reloads them
+every AUTH_REVOCATION_REFRESH_SECONDS, so a token revoked on another worker stops working within
+that interval. The worker that handles the logout drops it immediately.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from sanic import Sanic, Request
+from sanic.exceptions import Forbidden, Unauthorized
+from sanic.log import logger
+from pymongo import ASCENDING
+
+from app.db.config import AUTH_TOKEN_SECRET, AUTH_TOKEN_TTL_SECONDS, AUTH_TOKEN_CACHE_SIZE, AUTH_REVOCATION_REFRESH_SECONDS, AUTH_REQUIRE_TOKEN, AUTH_ADMIN_USER_IDS
+from app.utils.snowflake import next_id
+from app.utils.tokens import TokenVerifier, TokenError, encode_token, decode_token
+from app.utils.json_response import json_response
+
+
+class TokenServiceException(Exception):
+    pass
+
+
+# Placeholder an older config.json shipped; treated like no secret at all.
+DEV_TOKEN_SECRET = "dev-only-change-me"
+# Without a real secret no tokens are issued or accepted, and callers are identified by `user_id`.
+TOKENS_ENABLED = AUTH_TOKEN_SECRET not in ("", DEV_TOKEN_SECRET)
+
+
+def get_token_verifier(app) -> TokenVerifier:
+    """The worker's shared verifier, created on first use."""
+    verifier = getattr(app.ctx, "token_verifier", None)
+    if verifier is None:
+        verifier = app.ctx.token_verifier = TokenVerifier(AUTH_TOKEN_SECRET.encode(), AUTH_TOKEN_CACHE_SIZE)
+    return verifier
+
+
+def request_user_id(request: Request, supplied: Optional[str] = None) -> Optional[str]:
+    """The caller's user id: the verified token's, or the legacy `user_id` parameter for requests without one."""
+    token_user = getattr(request.ctx, "user_id", None)
+    if token_user is not None:
+        if supplied and supplied != token_user:
+            raise Forbidden("user_id does not match the access token")
+        return token_user
+    if AUTH_REQUIRE_TOKEN:
+        raise Unauthorized("An access token is required", scheme="Bearer")
+    return supplied
+
+
+def require_admin(request: Request) -> str:
+    """The caller's user id, if their verified token belongs to one of AUTH_ADMIN_USER_IDS."""
+    token_user = getattr(request.ctx, "user_id", None)
+    if token_user is None:
+        raise Unauthorized("An access token is required", scheme="Bearer")
+    if token_user not in AUTH_ADMIN_USER_IDS:
+        raise Forbidden("Admin access required")
+    return token_user
+
+
+class TokenService:
+    def __init__(self, app: Sanic):
+        self.app = app
+        self.collection = app.ctx.mongo['launchpad_db']['revoked_tokens']
+        self.verifier = get_token_verifier(app)
+
+    @classmethod
+    def register_listeners(cls, app: Sanic):
+        @app.listener('before_server_start')
+        async def check_secret(app, loop):
+            # Anyone who knows the secret can mint a token for any user, so a guessable one is never used.
+            if TOKENS_ENABLED:
+                return
+            if AUTH_REQUIRE_TOKEN:
+                raise RuntimeError("AUTH_REQUIRE_TOKEN is on but AUTH_TOKEN_SECRET is unset; set a random secret shared by every worker")
+            logger.warning("AUTH_TOKEN_SECRET not set; token login is disabled and requests are identified by user_id")
+
+        @app.listener('before_server_start')
+        async def ensure_indexes(app, loop):
+            collection = app.ctx.mongo['launchpad_db']['revoked_tokens']
+            try:
+                await collection.create_index([('jti', ASCENDING)], unique=True)
+                await collection.create_index([('exp', ASCENDING)], expireAfterSeconds=0)
+            except Exception as e:
+                logger.error(f"Failed to create indexes: {e}")
+
+        @app.listener('after_server_start')
+        async def start_revocation_refresh(app, loop):
+            app.add_task(cls(app)._refresh_loop(), name="token_revocations")
+
+    @classmethod
+    def register_middleware(cls, app: Sanic):
+        @app.middleware('request')
+        async def identify_user(request: Request):
+            request.ctx.user_id = None
+            header = request.headers.get("authorization")
+            if not header:
+                return
+            scheme, _, token = header.partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return json_response({"error": "Authorization must be a Bearer token"}, status=401)
+            if not TOKENS_ENABLED:
+                return json_response({"error": "Token authentication is not configured"}, status=401)
+            try:
+                request.ctx.user_id = get_token_verifier(request.app).verify(token)
+            except TokenError as e:
+                return json_response({"error": str(e)}, status=401)
+
+    async def issue(self, user_id: str) -> Dict[str, Any]:
+        """Sign a new access token for a user who just authenticated. Raises TokenServiceException without a secret."""
+        if not TOKENS_ENABLED:
+            raise TokenServiceException("Token authentication is not configured")
+        exp = int(time.time()) + AUTH_TOKEN_TTL_SECONDS
+        token = encode_token({"sub": user_id, "exp": exp, "jti": str(next_id())}, self.verifier.secret)
+        return {"token": token, "expires_at": datetime.utcfromtimestamp(exp).isoformat() + "Z"}
+
+    async def revoke(self, token: str) -> bool:
+        """Revoke a token until it expires. Returns False if the token isn't one of ours or has already expired."""
+        if not TOKENS_ENABLED:
+            return False
+        try:
+            claims = decode_token(token, self.verifier.secret)
+        except TokenError:
+            return False
+        if claims["exp"] <= time.time():
+            return False
+        try:
+            await self.collection.update_one(
+                {"jti": claims["jti"]},
+                {"$set": {"exp": datetime.utcfromtimestamp(claims["exp"]), "user_id": claims["sub"], "revoked_at": datetime.utcnow()}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error revoking token {claims['jti']}: {e}")
+            raise TokenServiceException("Failed to revoke token")
+        self.verifier.revoke(claims["jti"], claims["exp"])
+        return True
+
+    async def refresh_revocations(self):
+        """Load every revocation that hasn't expired yet (revocations made by other workers included)."""
+        now = datetime.utcnow()
+        async for doc in self.collection.find({"exp": {"$gt": now}}, {"_id": 0, "jti": 1, "exp": 1}):
+            self.verifier.revoke(doc["jti"], int((doc["exp"] - datetime(1970, 1, 1)).total_seconds()))
+        self.verifier.prune()
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh_revocations()
+            except Exception as e:
+                logger.error(f"Error refreshing token revocations: {e}")
+            await asyncio.sleep(AUTH_REVOCATION_REFRESH_SECONDS)
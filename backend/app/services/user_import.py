@@ -0,0 +1,177 @@
+"""
+Bulk user import for employer/partner rollouts: CSV or NDJSON records, streamed and written in
+chunks with unordered `insert_many`.
+
+Every record needs `email` and `name`. Records with a `password` are created as active users.
+Records without one are created as invited users with a one-time invite token, which is returned
+once in the report and stored only as a SHA-256 hash. A bad record or a duplicate email fails only
+its own row.
+"""
+
+import asyncio
+import csv
+import hashlib
+import json
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
+
+import bcrypt
+from pydantic import BaseModel, EmailStr, ValidationError
+from pymongo.errors import BulkWriteError
+
+from app.db.config import AUTH_BCRYPT_ROUNDS
+from app.utils.passwords import get_import_hasher
+
+IMPORT_CHUNK_SIZE = 1000
+INVITE_TTL_DAYS = 14
+# Error entries kept in a report; the `failed` count is always complete.
+MAX_REPORTED_ERRORS = 10000
+
+
+class ImportTooLarge(Exception):
+    pass
+
+
+async def limit_records(records: AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]], max_rows: int) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """Read at most `max_rows` records up front and raise ImportTooLarge if there are more, so nothing is imported."""
+    buffered = []
+    async for item in records:
+        if len(buffered) >= max_rows:
+            raise ImportTooLarge(f"At most {max_rows} rows per request; import larger files with scripts.import_users")
+        buffered.append(item)
+    for item in buffered:
+        yield item
+
+
+class ImportRecord(BaseModel):
+    email: EmailStr
+    name: str
+    password: Optional[str] = None
+
+
+def hash_passwords(passwords: List[str], rounds: int) -> List[str]:
+    """Hash a slice of passwords; runs in a worker process of the import's process pool."""
+    return [bcrypt.hashpw(p.encode(), bcrypt.gensalt(rounds)).decode() for p in passwords]
+
+
+def invite_token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """(row number, record) per data line of a CSV with a header line. One record per line."""
+    header = None
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [h.strip().lower() for h in values]
+            continue
+        row += 1
+        yield row, ({k: v for k, v in zip(header, values) if v != ""} if len(values) == len(header) else None)
+
+
+async def ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """(row number, record) per non-empty line; None for a line that isn't a JSON object."""
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield row, (record if isinstance(record, dict) else None)
+
+
+class UserImporter:
+    def __init__(self, collection, executor=None, parallelism: int = 1, rounds: int = AUTH_BCRYPT_ROUNDS, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.collection = collection
+        # A process pool (the CLI) or None for this worker's import bcrypt threads (the API).
+        self.executor = executor
+        self.parallelism = parallelism
+        self.rounds = rounds
+        self.chunk_size = chunk_size
+
+    async def run(self, records: AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]]) -> Dict[str, Any]:
+        report = {"inserted": 0, "invited": 0, "failed": 0, "errors": [], "invites": []}
+        chunk = []
+        async for row, record in records:
+            chunk.append((row, record))
+            if len(chunk) >= self.chunk_size:
+                await self._import_chunk(chunk, report)
+                chunk = []
+        if chunk:
+            await self._import_chunk(chunk, report)
+        return report
+
+    async def _hash(self, passwords: List[str]) -> List[str]:
+        if not passwords:
+            return []
+        if self.executor is None:
+            hasher = get_import_hasher()
+            return list(await asyncio.gather(*(hasher.hash(p) for p in passwords)))
+        # One task per process, each hashing a contiguous slice, so results stay in order.
+        size = -(-len(passwords) // self.parallelism)
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, hash_passwords, passwords[i:i + size], self.rounds)
+            for i in range(0, len(passwords), size)
+        ))
+        return [h for part in parts for h in part]
+
+    def _fail(self, report: Dict[str, Any], row: int, error: str, email: Optional[str] = None):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row, "email": email, "error": error})
+
+    async def _import_chunk(self, chunk: List[Tuple[int, Optional[Dict[str, Any]]]], report: Dict[str, Any]):
+        valid: List[Tuple[int, ImportRecord]] = []
+        for row, record in chunk:
+            if record is None:
+                self._fail(report, row, "Malformed record")
+                continue
+            try:
+                valid.append((row, ImportRecord(**record)))
+            except ValidationError as ve:
+                self._fail(report, row, f"Invalid user data: {', '.join(str(err['loc'][0]) for err in ve.errors() if err['loc'])}", record.get("email"))
+        hashes = iter(await self._hash([r.password for _, r in valid if r.password]))
+        now = datetime.utcnow()
+        docs, tokens = [], []
+        for row, record in valid:
+            doc = {
+                "_id": str(uuid.uuid4()),
+                "email": record.email,
+                "name": record.name,
+                "password_hash": next(hashes) if record.password else None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            token = None
+            if not record.password:
+                token = secrets.token_urlsafe(24)
+                doc["invite_token_hash"] = invite_token_hash(token)
+                doc["invite_expires_at"] = now + timedelta(days=INVITE_TTL_DAYS)
+            docs.append(doc)
+            tokens.append(token)
+        if not docs:
+            return
+        failed = {}
+        try:
+            await self.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed = {err["index"]: err for err in e.details.get("writeErrors", [])}
+        for i, ((row, record), doc, token) in enumerate(zip(valid, docs, tokens)):
+            if i in failed:
+                duplicate = failed[i].get("code") == 11000
+                self._fail(report, row, "Email already registered" if duplicate else "Failed to insert user", record.email)
+            elif token:
+                report["invited"] += 1
+                report["invites"].append({"row": row, "email": record.email, "user_id": doc["_id"], "invite_token": token})
+            else:
+                report["inserted"] += 1
@@ -7,10 +7,11 @@ from datetime import datetime
 from app.models.launchpad.user import User
 from sanic import Sanic
 from sanic.log import logger
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, AsyncIterator
 from pymongo import ASCENDING
 from pydantic import BaseModel, EmailStr, ValidationError
-import bcrypt
+from app.utils.passwords import get_password_hasher
+from app.services.user_import import UserImporter, ImportTooLarge, limit_records, invite_token_hash, IMPORT_CHUNK_SIZE
 
 class UserPayload(BaseModel):
     email: EmailStr
@@ -28,17 +29,23 @@ class UserService:
             self.collection = collection
         else:
             self.collection = app.ctx.mongo['launchpad_db']['users']
+        self.hasher = get_password_hasher()
 
     @classmethod
     def register_listeners(cls, app: Sanic):
         @app.listener('before_server_start')
         async def ensure_indexes(app, loop):
-            collection = app.ctx.mongo['launchpad_db']['users']
             try:
-                await collection.create_index([('_id', ASCENDING)], unique=True)
-                await collection.create_index([('email', ASCENDING)], unique=True)
+                await cls(app).ensure_indexes()
             except Exception as e:
+                # Registration and bulk import report duplicate emails through the unique index; don't run without it.
                 logger.error(f"Failed to create indexes: {e}")
+                raise
+
+    async def ensure_indexes(self):
+        """Create the unique email and invite token indexes (`_id` is unique already)."""
+        await self.collection.create_index([('email', ASCENDING)], unique=True)
+        await self.collection.create_index([('invite_token_hash', ASCENDING)], unique=True, sparse=True)
 
     async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Return user details as a sanitized dict."""
@@ -56,7 +63,7 @@ class UserService:
         """Create a new user. Returns the user id. Hashes password and enforces unique email."""
         try:
             payload = UserPayload(**user_data)
-            password_hash = bcrypt.hashpw(payload.password.encode(), bcrypt.gensalt()).decode()
+            password_hash = await self.hasher.hash(payload.password)
             user_doc = {
                 "_id": str(uuid.uuid4()),
                 "email": payload.email,
@@ -80,10 +87,60 @@ class UserService:
     async def authenticate(self, email: str, password: str) -> Optional[str]:
         """Authenticate user by email and password. Returns user_id if valid, else None."""
         try:
-            doc = await self.collection.find_one({"email": email})
-            if doc and bcrypt.checkpw(password.encode(), doc["password_hash"].encode()):
+            doc = await self.collection.find_one({"email": email}, {"password_hash": 1})
+            # Invited users have no password until they accept their invite.
+            if doc and doc.get("password_hash") and await self.hasher.verify(password, doc["password_hash"]):
+                if self.hasher.needs_rehash(doc["password_hash"]):
+                    await self._rehash(doc, password)
                 return doc["_id"]
             return None
         except Exception as e:
             logger.error(f"Error authenticating user {email}: {e}")
-            raise UserServiceException("Failed to authenticate user") 
\ No newline at end of file
+            raise UserServiceException("Failed to authenticate user")
+
+    async def _rehash(self, doc: Dict[str, Any], password: str):
+        """Re-hash a just-verified password at the configured cost. A failure here doesn't fail the login."""
+        try:
+            password_hash = await self.hasher.hash(password)
+            # Only replace the hash we verified, in case the password changed meanwhile.
+            await self.collection.update_one(
+                {"_id": doc["_id"], "password_hash": doc["password_hash"]},
+                {"$set": {"password_hash": password_hash, "updated_at": datetime.utcnow()}}
+            )
+        except Exception as e:
+            logger.error(f"Error rehashing password for user {doc['_id']}: {e}") 
+
+    async def import_users(self, records: AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]], executor=None, parallelism: int = 1, chunk_size: int = IMPORT_CHUNK_SIZE, max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Create users from (row, record) pairs in chunks. Returns counts, per-row errors and the new invite tokens.
+
+        With `max_rows`, more rows than that raise ImportTooLarge before any user is created.
+        """
+        try:
+            if max_rows is not None:
+                records = limit_records(records, max_rows)
+            importer = UserImporter(self.collection, executor, parallelism, self.hasher.rounds, chunk_size)
+            return await importer.run(records)
+        except ImportTooLarge:
+            raise
+        except Exception as e:
+            logger.error(f"Error importing users: {e}")
+            raise UserServiceException("Failed to import users")
+
+    async def accept_invite(self, invite_token: str, password: str) -> Optional[str]:
+        """Set the password of an invited user. Returns the user id, or None if the token is unknown or expired."""
+        try:
+            invite = {"invite_token_hash": invite_token_hash(invite_token), "invite_expires_at": {"$gt": datetime.utcnow()}}
+            # Check the token before paying for a hash.
+            if not await self.collection.find_one(invite, {"_id": 1}):
+                return None
+            password_hash = await self.hasher.hash(password)
+            doc = await self.collection.find_one_and_update(
+                invite,
+                {"$set": {"password_hash": password_hash, "updated_at": datetime.utcnow()},
+                 "$unset": {"invite_token_hash": "", "invite_expires_at": ""}},
+                projection={"_id": 1}
+            )
+            return doc["_id"] if doc else None
+        except Exception as e:
+            logger.error(f"Error accepting invite: {e}")
+            raise UserServiceException("Failed to accept invite")
@@ -41,8 +41,8 @@ class WellnessService:
                     "recommendations": []
                 }
             try:
-                obj = Wellness(**doc.get("wellness", {})) if "wellness" in doc else None
-                wellness_data = obj.dict() if obj else {}
+                obj = Wellness.model_validate(doc.get("wellness", {})) if "wellness" in doc else None
+                wellness_data = obj.model_dump() if obj else {}
             except ValidationError as ve:
                 logger.error(f"Wellness model validation error: {ve}")
                 wellness_data = {}
@@ -0,0 +1,198 @@
+"""
+Two-tier read-through cache: a per-worker LRU+TTL tier in front of a shared tier that speaks the
+Redis protocol (a `redis.asyncio` client, or `FakeRedis` for tests and benchmarks). Without a
+shared tier (`shared=None`) only the local tier is used.
+
+Every key has a version counter in the shared tier (`<key>:v`). Shared entries are stored with the
+version they were loaded under and only count as hits while it is still current, so `invalidate`
+is a single atomic INCR: entries written before it, including ones from loads that were already in
+flight, can never be served again. Local entries are dropped on the invalidating worker; other
+workers keep theirs until `local_ttl` runs out, which bounds how stale a read can be.
+
+If the shared tier fails, reads fall through to the loader and the error is logged and counted. A
+failed invalidation is counted the same way rather than raised, since the data it follows has
+already been written: other workers may then serve the old value until `shared_ttl` runs out.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from statistics import quantiles
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from sanic.log import logger
+
+T = TypeVar("T")
+
+# Latency samples kept per outcome for the percentiles in `metrics()`.
+LATENCY_SAMPLES = 1024
+
+
+class FakeRedis:
+    """In-memory stand-in for the handful of Redis commands the cache uses, with expiry.
+
+    `latency` (seconds) is awaited on every command to imitate a network round trip.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+
+    async def _round_trip(self):
+        await asyncio.sleep(self.latency)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def mget(self, *keys: str) -> List[Optional[bytes]]:
+        await self._round_trip()
+        return [self._read(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ex: Optional[float] = None):
+        await self._round_trip()
+        self._data[key] = (time.monotonic() + ex if ex else None, value)
+        return True
+
+    async def incr(self, key: str) -> int:
+        await self._round_trip()
+        value = int(self._read(key) or 0) + 1
+        expires = self._data[key][0] if key in self._data else None
+        self._data[key] = (expires, str(value).encode())
+        return value
+
+    async def aclose(self):
+        self._data.clear()
+
+
+class LocalTier(Generic[T]):
+    """LRU-bounded dict whose entries expire `ttl` seconds after they were stored."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, T]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[T]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: str, value: T):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReadThroughCache(Generic[T]):
+    """Values of type T, stored in the shared tier as bytes via `encode`/`decode`."""
+
+    def __init__(self, shared, namespace: str, encode: Callable[[T], bytes], decode: Callable[[bytes], T],
+                 local_size: int, local_ttl: float, shared_ttl: float):
+        self.shared = shared
+        self.namespace = namespace
+        self.encode = encode
+        self.decode = decode
+        self.shared_ttl = shared_ttl
+        self.local: LocalTier[T] = LocalTier(local_size, local_ttl)
+        # Bumped by every invalidate here, so a read that overlapped one isn't cached locally.
+        self._epoch = 0
+        self._counts = {"local_hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0, "shared_errors": 0}
+        self._latency = {outcome: deque(maxlen=LATENCY_SAMPLES) for outcome in ("local", "shared", "load")}
+
+    def _key(self, key: Any) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: Any, loader: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        cache_key = self._key(key)
+        value = self.local.get(cache_key)
+        if value is not None:
+            self._record("local", start)
+            return value
+
+        epoch, version = self._epoch, b"0"
+        if self.shared is None:
+            value = await loader()
+            if epoch == self._epoch:
+                self.local.put(cache_key, value)
+            self._record("load", start)
+            return value
+        try:
+            current, stored = await self.shared.mget(f"{cache_key}:v", cache_key)
+            version = current or b"0"
+            if stored is not None:
+                stored_version, _, body = stored.partition(b"\n")
+                if stored_version == version:
+                    value = self.decode(body)
+                    if epoch == self._epoch:
+                        self.local.put(cache_key, value)
+                    self._record("shared", start)
+                    return value
+        except Exception as e:
+            self._counts["shared_errors"] += 1
+            logger.error(f"Shared cache read failed for {cache_key}: {e}")
+
+        value = await loader()
+        if epoch == self._epoch:
+            self.local.put(cache_key, value)
+        try:
+            await self.shared.set(cache_key, version + b"\n" + self.encode(value), ex=self.shared_ttl)
+        except Exception as e:
+            self._counts["shared_errors"] += 1
+            logger.error(f"Shared cache write failed for {cache_key}: {e}")
+        self._record("load", start)
+        return value
+
+    async def invalidate(self, key: Any):
+        """Call after the underlying data changed. Never raises; shared tier errors are logged and counted."""
+        cache_key = self._key(key)
+        self._counts["invalidations"] += 1
+        try:
+            if self.shared is not None:
+                await self.shared.incr(f"{cache_key}:v")
+        except Exception as e:
+            self._counts["shared_errors"] += 1
+            logger.error(f"Shared cache invalidation failed for {cache_key}: {e}")
+        finally:
+            # After the INCR, so reads that raced it can't leave the old value behind locally.
+            self.local.discard(cache_key)
+            self._epoch += 1
+
+    def _record(self, outcome: str, start: float):
+        self._latency[outcome].append((time.perf_counter() - start) * 1000)
+        self._counts["local_hits" if outcome == "local" else "shared_hits" if outcome == "shared" else "misses"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        counts = self._counts
+        gets = counts["local_hits"] + counts["shared_hits"] + counts["misses"]
+        latency = {}
+        for outcome, samples in self._latency.items():
+            if samples:
+                cuts = quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else [samples[0]] * 99
+                latency[outcome] = {"p50_ms": round(cuts[49], 3), "p99_ms": round(cuts[98], 3)}
+        return {
+            **counts,
+            "gets": gets,
+            "hit_ratio": round((counts["local_hits"] + counts["shared_hits"]) / gets, 4) if gets else None,
+            "local_entries": len(self.local),
+            "latency": latency,
+        }
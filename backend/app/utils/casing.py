@@ -0,0 +1,24 @@
+"""
+snake_case -> camelCase key translation for API responses.
+
+Key sets are small and repeat on every request, so each translation is computed once and then
+served from a lookup table. Used as the alias generator of the response models and, through
+`keys_to_camel`, for free-form dicts whose keys aren't model fields.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+
+@lru_cache(maxsize=4096)
+def to_camel_case(s: str) -> str:
+    parts = s.split('_')
+    return parts[0] + ''.join(word.capitalize() for word in parts[1:])
+
+
+def keys_to_camel(obj: Any) -> Any:
+    if isinstance(obj, list):
+        return [keys_to_camel(i) for i in obj]
+    if isinstance(obj, dict):
+        return {to_camel_case(k) if isinstance(k, str) else k: keys_to_camel(v) for k, v in obj.items()}
+    return obj
@@ -0,0 +1,45 @@
+"""
+JSON responses encoded straight to bytes with orjson.
+
+pydantic models are serialized by pydantic-core and spliced in as raw JSON, so no intermediate dict
+tree is built for them. orjson handles datetimes (naive ones are UTC, written with a `Z`), UUIDs and
+numpy arrays natively; ObjectIds become their hex string.
+"""
+
+from typing import Any, Dict, Optional
+
+import orjson
+from bson import ObjectId
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sanic.response import HTTPResponse
+
+from app.models.launchpad.activity_tracker import ActivityRecord
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def _fallback(obj: Any) -> Any:
+    # Types neither orjson nor pydantic-core know; returns something they do.
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, ActivityRecord):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return orjson.Fragment(to_json(obj, fallback=_fallback))
+    return _fallback(obj)
+
+
+def dumps(data: Any) -> bytes:
+    if isinstance(data, BaseModel):
+        return to_json(data, fallback=_fallback)
+    return orjson.dumps(data, default=_default, option=OPTIONS)
+
+
+def json_response(body: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+    """Drop-in for `sanic.response.json` that also accepts pydantic models and `ActivityRecord`s."""
+    return HTTPResponse(dumps(body), status=status, headers=headers, content_type="application/json")
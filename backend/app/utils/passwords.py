@@ -0,0 +1,74 @@
+"""
+bcrypt hashing and verification off the event loop.
+
+A bcrypt call takes hundreds of milliseconds of CPU at production cost. bcrypt releases the GIL
+while it works, so a small thread pool is enough to keep the loop free. A semaphore in front of the
+pool caps how many calls are handed to it at once. Callers beyond that wait on the loop instead of in
+the pool's queue, so a request that is cancelled while waiting never spends CPU on its hash.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+from app.db.config import AUTH_BCRYPT_ROUNDS, AUTH_HASH_WORKERS, AUTH_IMPORT_HASH_WORKERS
+
+
+def hash_rounds(password_hash: str) -> Optional[int]:
+    """The cost factor of a `$2b$<rounds>$...` hash, or None if it isn't one."""
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    def __init__(self, rounds: int = AUTH_BCRYPT_ROUNDS, workers: int = AUTH_HASH_WORKERS):
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = asyncio.Semaphore(workers)
+
+    async def _run(self, fn, *args):
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(bcrypt.hashpw, password.encode(), bcrypt.gensalt(self.rounds))
+        return hashed.decode()
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(bcrypt.checkpw, password.encode(), password_hash.encode())
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True if the hash was made with a different cost than the configured one."""
+        return hash_rounds(password_hash) != self.rounds
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_pid: Optional[int] = None
+_import_hasher: Optional[PasswordHasher] = None
+_import_hasher_pid: Optional[int] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Return this process's hasher, created on first use in each (forked) process."""
+    global _hasher, _hasher_pid
+    if _hasher is None or _hasher_pid != os.getpid():
+        _hasher = PasswordHasher()
+        _hasher_pid = os.getpid()
+    return _hasher
+
+
+def get_import_hasher() -> PasswordHasher:
+    """Return this process's hasher for API bulk imports, with its own threads so imports can't hold up logins."""
+    global _import_hasher, _import_hasher_pid
+    if _import_hasher is None or _import_hasher_pid != os.getpid():
+        _import_hasher = PasswordHasher(workers=AUTH_IMPORT_HASH_WORKERS)
+        _import_hasher_pid = os.getpid()
+    return _import_hasher
@@ -0,0 +1,129 @@
+"""
+Snowflake-style 64-bit ids: 41 bits of milliseconds since EPOCH_MS, 10 bits of worker id and a
+12-bit per-millisecond sequence. Ids from one worker are strictly increasing and ids from all
+workers sort by creation millisecond, so they are usable as keyset pagination cursors.
+
+Ids are past JavaScript's Number.MAX_SAFE_INTEGER, so API responses carry them as strings (see
+`SnowflakeId`); internally and in MongoDB they stay integers.
+"""
+
+import os
+import re
+import time
+from datetime import datetime, timezone
+from typing import Annotated, List, Optional
+
+from pydantic import PlainSerializer
+
+from app.db.config import NODE_ID, ID_PROCESS_SLOT
+
+EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z; 41 bits of milliseconds last until 2094
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+# The worker id is NODE_ID in the high bits and the process slot on that node in the low bits.
+PROCESS_BITS = 5
+MAX_PROCESS_SLOT = (1 << PROCESS_BITS) - 1
+MAX_NODE_ID = (1 << (WORKER_BITS - PROCESS_BITS)) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# An id field that is an int in Python and MongoDB but a string in JSON.
+SnowflakeId = Annotated[int, PlainSerializer(str, return_type=str, when_used="json")]
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+class SnowflakeGenerator:
+    """Per-process id generator.
+
+    There is no lock: every Sanic worker is its own process and `next_id` never awaits, so calls
+    from the event loop can't interleave. Don't share one instance across threads.
+    """
+
+    def __init__(self, worker_id: int, epoch_ms: int = EPOCH_MS):
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        self.worker_id = worker_id
+        self.epoch_ms = epoch_ms
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        now = _now_ms() - self.epoch_ms
+        if now > self._last_ms:
+            self._last_ms = now
+            self._sequence = 0
+        else:
+            # Same millisecond, or the clock stepped back: keep counting from the last issued time.
+            self._sequence += 1
+            if self._sequence > MAX_SEQUENCE:
+                # Sequence exhausted: wait for the clock to pass the last issued millisecond. Never
+                # issue ahead of the clock, or a restarted worker could hand out the same ids again.
+                while now <= self._last_ms:
+                    time.sleep((self._last_ms - now + 1) / 1000)
+                    now = _now_ms() - self.epoch_ms
+                self._last_ms = now
+                self._sequence = 0
+        return (self._last_ms << (WORKER_BITS + SEQUENCE_BITS)) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+    def next_ids(self, count: int) -> List[int]:
+        return [self.next_id() for _ in range(count)]
+
+
+def id_datetime(snowflake_id: int, epoch_ms: int = EPOCH_MS) -> datetime:
+    """Return the (UTC) creation time encoded in an id."""
+    ms = (int(snowflake_id) >> (WORKER_BITS + SEQUENCE_BITS)) + epoch_ms
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+_generator: Optional[SnowflakeGenerator] = None
+_generator_pid: Optional[int] = None
+_process_slot: Optional[int] = ID_PROCESS_SLOT
+
+
+def set_process_slot(slot: int):
+    """Give a process that isn't a Sanic worker (a script, a benchmark) its slot on this node.
+
+    The slot must not be used by any other process running with the same NODE_ID.
+    """
+    global _process_slot, _generator
+    if not 0 <= slot <= MAX_PROCESS_SLOT:
+        raise ValueError(f"process slot must be between 0 and {MAX_PROCESS_SLOT}")
+    _process_slot = slot
+    _generator = None
+
+
+def get_id_generator() -> SnowflakeGenerator:
+    """Return this process's generator, created on first use in each (forked) process."""
+    global _generator, _generator_pid
+    if _generator is None or _generator_pid != os.getpid():
+        _generator = SnowflakeGenerator(worker_id())
+        _generator_pid = os.getpid()
+    return _generator
+
+
+def worker_id() -> int:
+    """This process's worker id: NODE_ID plus the Sanic worker index, or the configured slot outside Sanic workers.
+
+    Raises ValueError if either part is out of range and RuntimeError if a non-Sanic process has no slot.
+    """
+    if not 0 <= NODE_ID <= MAX_NODE_ID:
+        raise ValueError(f"NODE_ID must be between 0 and {MAX_NODE_ID}, got {NODE_ID}")
+    match = re.search(r"Server-(\d+)", os.getenv("SANIC_WORKER_NAME", ""))
+    if match:
+        slot = int(match.group(1))
+        if slot > MAX_PROCESS_SLOT:
+            raise ValueError(f"At most {MAX_PROCESS_SLOT + 1} Sanic workers per NODE_ID, got worker {slot}")
+    elif _process_slot is not None:
+        slot = _process_slot
+        if not 0 <= slot <= MAX_PROCESS_SLOT:
+            raise ValueError(f"ID_PROCESS_SLOT must be between 0 and {MAX_PROCESS_SLOT}, got {slot}")
+    else:
+        raise RuntimeError("Not a Sanic worker: set ID_PROCESS_SLOT (or call set_process_slot) to a slot no worker on this node uses")
+    return (NODE_ID << PROCESS_BITS) | slot
+
+
+def next_id() -> int:
+    return get_id_generator().next_id()
@@ -0,0 +1,58 @@
+"""
+Pre-serialized JSON bodies for routes that serve fixed content (onboarding steps, intro, search).
+
+Each payload is encoded to bytes once, when it is created or updated, and carries a strong ETag
+computed from those bytes. `static_json` answers a matching `If-None-Match` with an empty 304.
+"""
+
+import hashlib
+from typing import Any, Dict, Hashable, Optional
+
+from sanic import Request
+from sanic.response import HTTPResponse
+
+from app.db.config import STATIC_RESPONSE_MAX_AGE
+from app.utils.json_response import dumps
+
+
+class StaticJSON:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, data: Any):
+        self.update(data)
+
+    def update(self, data: Any):
+        """Re-encode after the content changed; the ETag changes with it."""
+        self._set_body(dumps(data))
+
+    def _set_body(self, body: bytes):
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.body = body
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "StaticJSON":
+        """Wrap a body that is already encoded (e.g. read back from a cache)."""
+        payload = cls.__new__(cls)
+        payload._set_body(body)
+        return payload
+
+
+def static_payloads(content: Dict[Hashable, Any]) -> Dict[Hashable, StaticJSON]:
+    return {key: StaticJSON(data) for key, data in content.items()}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so `W/"x"` matches `"x"`."""
+    if not if_none_match:
+        return False
+    if if_none_match == etag or if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def static_json(request: Request, payload: StaticJSON, max_age: int = STATIC_RESPONSE_MAX_AGE,
+                cache_control: Optional[str] = None) -> HTTPResponse:
+    headers = {"ETag": payload.etag, "Cache-Control": cache_control or f"public, max-age={max_age}"}
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return HTTPResponse(status=304, headers=headers)
+    return HTTPResponse(payload.body, headers=headers, content_type="application/json")
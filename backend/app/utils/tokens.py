@@ -0,0 +1,102 @@
+"""
+Signed, expiring access tokens verified entirely in memory.
+
+A token is `<payload>.<signature>`: the base64url JSON claims (`sub` user id, `exp` expiry in epoch
+seconds, `jti` token id) and their base64url HMAC-SHA256. Verifying one is a hash and a JSON parse;
+`TokenVerifier` skips even that for tokens it has already verified, and checks expiry and the
+revocation list on every call.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class TokenError(Exception):
+    pass
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(payload: str, secret: bytes) -> str:
+    return _b64encode(hmac.new(secret, payload.encode(), hashlib.sha256).digest())
+
+
+def encode_token(claims: Dict[str, Any], secret: bytes) -> str:
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{payload}.{_signature(payload, secret)}"
+
+
+def decode_token(token: str, secret: bytes) -> Dict[str, Any]:
+    """Return the claims of a correctly signed token. Raises TokenError otherwise (expiry is not checked here)."""
+    payload, _, signature = token.partition(".")
+    # Compared as bytes: compare_digest raises TypeError for str with non-ASCII characters.
+    if not payload or not signature or not hmac.compare_digest(signature.encode(), _signature(payload, secret).encode()):
+        raise TokenError("Invalid token signature")
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        raise TokenError("Malformed token")
+    if not isinstance(claims, dict) or not {"sub", "exp", "jti"} <= claims.keys():
+        raise TokenError("Malformed token")
+    return claims
+
+
+class TokenVerifier:
+    """Per-process verifier: an LRU of verified tokens plus the ids of revoked ones."""
+
+    def __init__(self, secret: bytes, cache_size: int = 10000):
+        self.secret = secret
+        self.cache_size = cache_size
+        # token -> (user id, expiry, token id)
+        self._cache: "OrderedDict[str, Tuple[str, int, str]]" = OrderedDict()
+        # token id -> expiry; entries are dropped once the token would have expired anyway.
+        self._revoked: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "rejected": 0}
+
+    def verify(self, token: str, now: Optional[float] = None) -> str:
+        """Return the token's user id. Raises TokenError if it is forged, malformed, expired or revoked."""
+        now = time.time() if now is None else now
+        cached = self._cache.get(token)
+        if cached is not None:
+            self._cache.move_to_end(token)
+            self._stats["hits"] += 1
+            user_id, exp, jti = cached
+        else:
+            self._stats["misses"] += 1
+            try:
+                claims = decode_token(token, self.secret)
+            except TokenError:
+                self._stats["rejected"] += 1
+                raise
+            user_id, exp, jti = claims["sub"], claims["exp"], claims["jti"]
+        if exp <= now or jti in self._revoked:
+            self._cache.pop(token, None)
+            self._stats["rejected"] += 1
+            raise TokenError("Token expired" if exp <= now else "Token revoked")
+        if cached is None:
+            self._cache[token] = (user_id, exp, jti)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return user_id
+
+    def revoke(self, jti: str, exp: int):
+        self._revoked[jti] = exp
+
+    def prune(self, now: Optional[float] = None):
+        """Forget revocations of tokens that have expired since."""
+        now = time.time() if now is None else now
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"cached": len(self._cache), "revoked": len(self._revoked), **self._stats}
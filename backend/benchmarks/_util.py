@@ -0,0 +1,44 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks that touch MongoDB expect a local, disposable `mongod` (MONGO_BENCH_URI, default
+mongodb://localhost:27017) and only write documents for `bench-*` user ids.
+"""
+
+import os
+import time
+from statistics import quantiles
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, List
+
+import motor.motor_asyncio
+
+from app.utils.snowflake import MAX_PROCESS_SLOT, set_process_slot
+
+MONGO_BENCH_URI = os.getenv("MONGO_BENCH_URI", "mongodb://localhost:27017")
+
+
+def bench_app():
+    """A minimal stand-in for the Sanic app: services only need `app.ctx.mongo`."""
+    # Ids need a process slot outside Sanic workers; take the last one, which a dev server never uses.
+    set_process_slot(MAX_PROCESS_SLOT)
+    return SimpleNamespace(ctx=SimpleNamespace(mongo=motor.motor_asyncio.AsyncIOMotorClient(MONGO_BENCH_URI)))
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    cuts = quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p99": cuts[98]}
+
+
+async def time_async(fn: Callable[[], Awaitable], runs: int) -> Dict[str, float]:
+    """Run `fn` `runs` times and return p50/p99 latency in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def print_row(*cols, widths=(24, 12, 12, 12)):
+    print("".join(str(c).ljust(w) for c, w in zip(cols, widths)))
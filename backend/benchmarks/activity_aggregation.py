@@ -0,0 +1,143 @@
+"""
+p50/p99 latency of the ActivityService read paths against history size.
+
+`legacy` is the original find_one + Python loop implementation, kept here verbatim for
+comparison; `embedded` and `bucketed` run the current ActivityService on each storage layout
+(rollup reads for totals and averages, an aggregation pipeline for the last sync time).
+
+    python -m benchmarks.activity_aggregation [--sizes 1000 10000 50000] [--runs 50]
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+from calendar import monthrange
+from datetime import datetime, timedelta
+
+from app.services.activity_service import ActivityService
+from app.services.activity_storage import DEFAULT_BUCKET_MAX_ENTRIES, to_document
+from benchmarks._util import bench_app, time_async, print_row
+
+TYPES = ["steps", "water", "sleep", "calories"]
+FIELD_MAP = {"steps": "steps", "water": "glasses", "sleep": "duration", "calories": "calories"}
+
+
+def make_entries(n: int):
+    now = datetime.utcnow()
+    entries = []
+    for i in range(n):
+        ts = now - timedelta(minutes=30 * i)
+        t = TYPES[i % len(TYPES)]
+        entries.append({
+            "id": i, "type": t, "title": t.title(), "duration": 30, "calories": 120, "steps": 500 + i % 1000,
+            "timestamp": ts.isoformat(), "intensity": "normal",
+        })
+    return entries
+
+
+def legacy_id(user_id: str) -> str:
+    return f"{user_id}-legacy"
+
+
+async def seed(db, user_id: str, entries):
+    await cleanup(db, user_id)
+    # The legacy path reads the original shape: ISO-string timestamps in one document.
+    await db['activity_tracker'].insert_one({"user_id": legacy_id(user_id), "activities": entries})
+    docs = [to_document(e) for e in entries]
+    await db['activity_tracker'].insert_one({"user_id": user_id, "activities": docs})
+    grouped = defaultdict(list)
+    for d in docs:
+        grouped[(d["type"], d["day"])].append(d)
+    buckets = []
+    for (t, day), items in grouped.items():
+        for i in range(0, len(items), DEFAULT_BUCKET_MAX_ENTRIES):
+            chunk = items[i:i + DEFAULT_BUCKET_MAX_ENTRIES]
+            buckets.append({"user_id": user_id, "type": t, "day": day, "count": len(chunk), "entries": chunk})
+    await db['activity_buckets'].insert_many(buckets)
+
+
+async def cleanup(db, user_id: str):
+    await db['activity_tracker'].delete_many({"user_id": {"$in": [user_id, legacy_id(user_id)]}})
+    await db['activity_buckets'].delete_many({"user_id": user_id})
+    await db['activity_rollups'].delete_many({"user_id": user_id})
+
+
+class LegacyReads:
+    """The pre-aggregation implementations."""
+
+    def __init__(self, db):
+        self.collection = db['activity_tracker']
+
+    async def daily(self, user_id, date):
+        doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
+        totals = {}
+        for a in doc["activities"]:
+            if datetime.fromisoformat(a["timestamp"]).date() == datetime.fromisoformat(date).date():
+                totals[a["type"]] = totals.get(a["type"], 0) + a.get("steps", 0)
+        return totals
+
+    async def weekly(self, user_id, activity_type):
+        doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
+        now = datetime.utcnow()
+        week_ago = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=6)
+        values = [a.get("steps", 0) for a in doc["activities"] if a["type"] == activity_type and week_ago <= datetime.fromisoformat(a["timestamp"]) <= now]
+        return sum(values) / len(values) if values else 0.0
+
+    async def monthly(self, user_id, activity_type, year, month):
+        doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
+        daily = [0] * monthrange(year, month)[1]
+        metric = FIELD_MAP.get(activity_type)
+        for a in doc["activities"]:
+            if a["type"] == activity_type:
+                ts = datetime.fromisoformat(a["timestamp"])
+                if ts.year == year and ts.month == month and metric in a:
+                    daily[ts.day - 1] += a.get(metric, 0)
+        return daily
+
+    async def lifetime(self, user_id):
+        doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
+        totals = {}
+        for a in doc["activities"]:
+            metric = FIELD_MAP.get(a["type"])
+            if metric and metric in a:
+                totals[a["type"]] = totals.get(a["type"], 0) + a.get(metric, 0)
+        return totals
+
+    async def last_sync(self, user_id, activity_type):
+        doc = await self.collection.find_one({"user_id": user_id}, {"activities": 1})
+        return max(a["timestamp"] for a in doc["activities"] if a["type"] == activity_type)
+
+
+async def main(sizes, runs):
+    app = bench_app()
+    db = app.ctx.mongo['launchpad_db']
+    legacy = LegacyReads(db)
+    services = {"embedded": ActivityService(app, storage="embedded"), "bucketed": ActivityService(app, storage="bucketed")}
+    today = datetime.utcnow()
+    print_row("method / size", "path", "p50 ms", "p99 ms")
+    for n in sizes:
+        user_id = f"bench-agg-{n}"
+        await seed(db, user_id, make_entries(n))
+        await services["bucketed"].rebuild_rollups(user_id)
+        cases = {
+            "daily_totals": (lambda: legacy.daily(legacy_id(user_id), today.isoformat()), lambda s: s.get_daily_totals(user_id, today.isoformat())),
+            "weekly_averages": (lambda: legacy.weekly(legacy_id(user_id), "steps"), lambda s: s.get_weekly_averages(user_id, "steps")),
+            "monthly_history": (lambda: legacy.monthly(legacy_id(user_id), "steps", today.year, today.month), lambda s: s.get_monthly_history(user_id, "steps", today.year, today.month)),
+            "lifetime_totals": (lambda: legacy.lifetime(legacy_id(user_id)), lambda s: s.get_lifetime_totals(user_id)),
+            "last_sync_time": (lambda: legacy.last_sync(legacy_id(user_id), "steps"), lambda s: s.get_last_sync_time(user_id, "steps")),
+        }
+        for name, (old, new) in cases.items():
+            stats = await time_async(old, runs)
+            print_row(f"{name} / {n}", "legacy", f"{stats['p50']:.2f}", f"{stats['p99']:.2f}")
+            for label, service in services.items():
+                stats = await time_async(lambda: new(service), runs)
+                print_row("", label, f"{stats['p50']:.2f}", f"{stats['p99']:.2f}")
+        await cleanup(db, user_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.runs))
@@ -0,0 +1,61 @@
+"""
+Wearable sync ingest throughput (entries/sec): one add_activity_entry call per sample vs.
+add_activity_entries batches.
+
+    python -m benchmarks.activity_bulk_ingest [--entries 5000] [--batch 500]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from app.services.activity_service import ActivityService
+from benchmarks._util import bench_app, print_row
+
+
+def make_samples(n: int):
+    start = datetime.utcnow() - timedelta(minutes=n)
+    return [
+        {"type": "steps", "steps": 50 + i % 200, "timestamp": (start + timedelta(minutes=i)).isoformat()}
+        for i in range(n)
+    ]
+
+
+async def reset(db, user_id: str):
+    for name in ("activity_tracker", "activity_buckets", "activity_rollups"):
+        await db[name].delete_many({"user_id": user_id})
+
+
+async def main(n: int, batch: int):
+    app = bench_app()
+    db = app.ctx.mongo['launchpad_db']
+    samples = make_samples(n)
+    print_row("storage", "path", "seconds", "entries/s")
+    for storage in ("embedded", "bucketed"):
+        service = ActivityService(app, storage=storage)
+        user_id = f"bench-bulk-{storage}"
+
+        await reset(db, user_id)
+        start = time.perf_counter()
+        for sample in samples:
+            await service.add_activity_entry(user_id, sample["type"], sample)
+        elapsed = time.perf_counter() - start
+        print_row(storage, "single", f"{elapsed:.2f}", f"{n / elapsed:.0f}")
+
+        await reset(db, user_id)
+        start = time.perf_counter()
+        for i in range(0, n, batch):
+            results = await service.add_activity_entries(user_id, samples[i:i + batch])
+            assert all(r["success"] for r in results)
+        elapsed = time.perf_counter() - start
+        print_row("", f"bulk/{batch}", f"{elapsed:.2f}", f"{n / elapsed:.0f}")
+        await reset(db, user_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.entries, args.batch))
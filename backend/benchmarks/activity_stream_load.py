@@ -0,0 +1,187 @@
+"""
+Load test for the live dashboard stream: open many idle SSE connections to one running worker,
+check they all stay up across heartbeats, and time how long a write takes to reach its stream.
+
+    python app.py                      # single worker, in another shell
+    python -m benchmarks.activity_stream_load [--url http://127.0.0.1:8000/v1/api] \\
+        [--connections 10000] [--users 1000] [--hold 40] [--server-pid PID]
+
+The client needs one file descriptor per connection; the script raises its own soft limit to the
+hard limit, and the server process needs the same (`ulimit -n 65536`). Set --server-pid to report
+the worker's resident memory per connection (Linux only). With more than one worker, point --url
+at a single worker's port so every connection lands on the same broker.
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from benchmarks._util import percentiles, print_row
+
+WIDTHS = (34, 16)
+
+
+def rss_mib(pid: Optional[int]) -> Optional[float]:
+    if not pid:
+        return None
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+class StreamClient:
+    """One raw HTTP/1.1 SSE connection that counts what it receives."""
+
+    def __init__(self, host: str, port: int, path: str):
+        self.host, self.port, self.path = host, port, path
+        self.status = None
+        self.heartbeats = 0
+        self.events: Dict[str, int] = {}
+        self.closed = False
+        self.event_seen = asyncio.Event()
+        self._reader = self._writer = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(
+            f"GET {self.path} HTTP/1.1\r\nHost: {self.host}\r\nAccept: text/event-stream\r\n\r\n".encode()
+        )
+        head = await self._reader.readuntil(b"\r\n\r\n")
+        self.status = int(head.split(b" ", 2)[1])
+
+    async def read(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                if line.startswith(b": heartbeat"):
+                    self.heartbeats += 1
+                elif line.startswith(b"event: "):
+                    name = line[7:].strip().decode()
+                    self.events[name] = self.events.get(name, 0) + 1
+                    self.event_seen.set()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        self.closed = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+async def post_json(host: str, port: int, path: str, body: dict) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    payload = json.dumps(body).encode()
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    writer.close()
+    return int(head.split(b" ", 2)[1])
+
+
+async def main(url: str, connections: int, users: int, hold: float, concurrency: int, server_pid: Optional[int]):
+    fd_limit = raise_fd_limit()
+    if fd_limit < connections + 100:
+        print(f"warning: file descriptor limit {fd_limit} is below {connections} connections")
+    parts = urlsplit(url)
+    host, port, prefix = parts.hostname, parts.port or 80, parts.path.rstrip("/")
+    rss_before = rss_mib(server_pid)
+
+    clients: List[StreamClient] = []
+    readers = []
+    connect_ms: List[float] = []
+    failures: Dict[str, int] = {}
+    gate = asyncio.Semaphore(concurrency)
+
+    async def open_one(i: int):
+        client = StreamClient(host, port, f"{prefix}/activity/stream?user_id=bench-stream-{i % users}")
+        async with gate:
+            start = time.perf_counter()
+            try:
+                await client.connect()
+            except (OSError, asyncio.IncompleteReadError) as e:
+                failures[type(e).__name__] = failures.get(type(e).__name__, 0) + 1
+                return
+            connect_ms.append((time.perf_counter() - start) * 1000)
+        if client.status != 200:
+            failures[f"HTTP {client.status}"] = failures.get(f"HTTP {client.status}", 0) + 1
+            client.close()
+            return
+        clients.append(client)
+        readers.append(asyncio.ensure_future(client.read()))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(open_one(i) for i in range(connections)))
+    ramp_s = time.perf_counter() - start
+    rss_open = rss_mib(server_pid)
+
+    # Fan-out latency: one write per sampled user, timed until one of that user's streams sees it.
+    latencies = []
+    sample_users = min(users, 20)
+    for u in range(sample_users):
+        watching = [c for c in clients if c.path.endswith(f"=bench-stream-{u}")]
+        if not watching:
+            continue
+        for c in watching:
+            c.event_seen.clear()
+        started = time.perf_counter()
+        status = await post_json(host, port, f"{prefix}/activity/bulk",
+                                 {"user_id": f"bench-stream-{u}", "activities": [{"type": "steps", "steps": 100}]})
+        if status != 200:
+            failures[f"bulk HTTP {status}"] = failures.get(f"bulk HTTP {status}", 0) + 1
+            continue
+        await asyncio.wait([asyncio.ensure_future(c.event_seen.wait()) for c in watching], return_when=asyncio.FIRST_COMPLETED, timeout=10)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.sleep(hold)
+    alive = [c for c in clients if not c.closed]
+    beating = sum(1 for c in alive if c.heartbeats)
+
+    print_row("metric", "value", widths=WIDTHS)
+    print_row("connections requested", connections, widths=WIDTHS)
+    print_row("connections open", len(clients), widths=WIDTHS)
+    print_row("failed", ", ".join(f"{k}: {v}" for k, v in failures.items()) or 0, widths=WIDTHS)
+    print_row("ramp-up s", f"{ramp_s:.1f}", widths=WIDTHS)
+    if len(connect_ms) >= 2:
+        p = percentiles(connect_ms)
+        print_row("connect ms p50 / p99", f"{p['p50']:.1f} / {p['p99']:.1f}", widths=WIDTHS)
+    if len(latencies) >= 2:
+        p = percentiles(latencies)
+        print_row("write-to-event ms p50 / p99", f"{p['p50']:.1f} / {p['p99']:.1f}", widths=WIDTHS)
+    print_row(f"still open after {hold:.0f}s", len(alive), widths=WIDTHS)
+    print_row("received a heartbeat", beating, widths=WIDTHS)
+    if rss_before is not None and rss_open is not None and clients:
+        print_row("server RSS MiB before / open", f"{rss_before:.0f} / {rss_open:.0f}", widths=WIDTHS)
+        print_row("server KiB per connection", f"{(rss_open - rss_before) * 1024 / len(clients):.1f}", widths=WIDTHS)
+
+    for client in clients:
+        client.close()
+    await asyncio.gather(*readers, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000/v1/api")
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--hold", type=float, default=40, help="seconds to keep connections idle (> heartbeat interval)")
+    parser.add_argument("--concurrency", type=int, default=500, help="connections being opened at once")
+    parser.add_argument("--server-pid", type=int)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.connections, args.users, args.hold, args.concurrency, args.server_pid))
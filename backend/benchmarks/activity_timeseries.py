@@ -0,0 +1,67 @@
+"""
+Storage size and range-query latency of the embedded, bucketed and time-series layouts.
+
+Sizes come from collStats and cover the whole collection, so run this against an empty,
+disposable `mongod` (MongoDB 7.0+ for the time-series layout).
+
+    python -m benchmarks.activity_timeseries [--entries 50000] [--runs 50]
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from app.services.activity_service import ActivityService
+from benchmarks._util import bench_app, time_async, print_row
+
+LAYOUTS = ("embedded", "bucketed", "timeseries")
+RANGES_DAYS = (1, 7, 30, 365)
+BATCH = 1000
+WIDTHS = (14, 28, 16)
+
+
+def make_samples(n: int):
+    # One sample every 10 minutes, ending now.
+    now = datetime.utcnow()
+    return [
+        {"type": "steps", "steps": 40 + i % 160, "duration": 10, "timestamp": (now - timedelta(minutes=10 * i)).isoformat()}
+        for i in range(n)
+    ]
+
+
+async def storage_stats(db, collection: str):
+    stats = await db.command("collStats", collection)
+    return stats.get("storageSize", 0), stats.get("totalIndexSize", 0)
+
+
+async def main(n: int, runs: int):
+    app = bench_app()
+    db = app.ctx.mongo['launchpad_db']
+    samples = make_samples(n)
+    now = datetime.utcnow()
+    print_row("layout", "metric", "value", widths=WIDTHS)
+    for layout in LAYOUTS:
+        service = ActivityService(app, storage=layout)
+        user_id = f"bench-ts-{layout}"
+        await service.store.ensure_indexes()
+        await service.store.collection.delete_many({"meta.user_id": user_id} if layout == "timeseries" else {"user_id": user_id})
+        for i in range(0, n, BATCH):
+            await service.add_activity_entries(user_id, samples[i:i + BATCH])
+        data, indexes = await storage_stats(db, service.store.collection.name)
+        print_row(layout, "storage bytes / entry", f"{data / n:.1f}", widths=WIDTHS)
+        print_row("", "index bytes / entry", f"{indexes / n:.1f}", widths=WIDTHS)
+        for days in RANGES_DAYS:
+            start, end = (now - timedelta(days=days)).isoformat(), now.isoformat()
+            stats = await time_async(lambda: service.get_activity_history(user_id, "steps", start, end), runs)
+            print_row("", f"{days}d range p50 / p99 ms", f"{stats['p50']:.2f} / {stats['p99']:.2f}", widths=WIDTHS)
+        await service.store.collection.delete_many({"meta.user_id": user_id} if layout == "timeseries" else {"user_id": user_id})
+        await service.rollups.collection.delete_many({"user_id": user_id})
+        await service.achievements.collection.delete_many({"user_id": user_id})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.entries, args.runs))
@@ -0,0 +1,94 @@
+"""
+Trend computation: per-element Python loops (the way the monthly calendar and weekly averages
+used to be built) vs. the vectorized activity_analytics path, over the same day rollups.
+CPU only, no MongoDB needed.
+
+    python -m benchmarks.activity_trends [--runs 50]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from app.services.activity_analytics import ROLLING_WINDOWS, PERCENTILES, load_matrix, trends, history_start, history_days
+from benchmarks._util import percentiles, print_row
+
+TYPES = ["steps", "water", "sleep", "weight", "calories", "distance", "move_minutes"]
+GOALS = {"steps": 10000, "calories": 600, "move_minutes": 60, "water": 8}
+
+
+def make_docs(start: date, days: int):
+    rng = random.Random(7)
+    return [
+        {"type": t, "key": (start + timedelta(days=d)).isoformat(), "value": rng.randint(0, 15000)}
+        for t in TYPES for d in range(days) if rng.random() < 0.9
+    ]
+
+
+def loop_percentile(values, p):
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def loop_trends(docs, types, goals, window, start):
+    """Reference implementation with plain Python loops, producing the same numbers."""
+    days = history_days(window)
+    series = {t: [0.0] * days for t in types}
+    for doc in docs:
+        offset = (date.fromisoformat(doc["key"]) - start).days
+        series[doc["type"]][offset] += doc.get("value", 0)
+    result = {}
+    for t in types:
+        values = series[t]
+        recent = values[-window:]
+        stats = {"total": sum(recent), "average": sum(recent) / window}
+        for n in ROLLING_WINDOWS:
+            rolling = []
+            for i in range(days - window, days):
+                rolling.append(round(sum(values[i - n + 1:i + 1]) / n, 2))
+            stats[f"rolling_{n}"] = rolling
+        stats["percentiles"] = {f"p{p}": loop_percentile(recent, p) for p in PERCENTILES}
+        goal = goals.get(t)
+        longest = run = 0
+        for v in recent:
+            run = run + 1 if goal and v >= goal else 0
+            longest = max(longest, run)
+        stats["goal_hit_ratio"] = round(sum(1 for v in recent if v >= goal) / window, 4) if goal else None
+        stats["longest_streak"] = longest
+        result[t] = stats
+    return result
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        begin = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - begin) * 1000)
+    return out, percentiles(samples)
+
+
+def main(runs: int):
+    today = date.today()
+    print_row("window", "path", "p50 ms", "p99 ms")
+    for window in (30, 90, 365):
+        start = history_start(today, window)
+        docs = make_docs(start, history_days(window))
+        expected, loop = timed(lambda: loop_trends(docs, TYPES, GOALS, window, start), runs)
+        got, vec = timed(lambda: trends(load_matrix(docs, TYPES, start, history_days(window)), TYPES, GOALS, window, start), runs)
+        for t in TYPES:
+            assert got["types"][t]["rolling_30"] == expected[t]["rolling_30"], t
+            assert got["types"][t]["longest_streak"] == expected[t]["longest_streak"], t
+        print_row(window, "loops", f"{loop['p50']:.2f}", f"{loop['p99']:.2f}")
+        print_row("", "numpy", f"{vec['p50']:.2f}", f"{vec['p99']:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,58 @@
+"""
+Cost of turning stored entries into API output for a 50k-entry user: validating every entry with
+pydantic (`Activity.model_validate(a).model_dump()`, the old read path), `model_construct` without
+validation, the batch `ActivityList` TypeAdapter, and the
+slotted `ActivityRecord` used for trusted reads now. CPU only, no MongoDB needed.
+
+    python -m benchmarks.activity_trusted_reads [--entries 50000] [--runs 10]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app.models.launchpad.activity_tracker import Activity, ActivityList, ActivityRecord
+from benchmarks._util import percentiles, print_row
+
+
+def make_entries(n: int):
+    start = datetime(2025, 1, 1)
+    return [
+        Activity(
+            id=i, type="steps", title="Steps", duration=i % 60, calories=i % 300, steps=i % 12000,
+            timestamp=(start + timedelta(minutes=10 * i)).isoformat(), intensity="normal"
+        ).model_dump()
+        for i in range(n)
+    ]
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        begin = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - begin) * 1000)
+    return percentiles(samples)
+
+
+def main(n: int, runs: int):
+    entries = make_entries(n)
+    paths = {
+        "validate": lambda: [Activity.model_validate(a).model_dump() for a in entries],
+        "type adapter": lambda: ActivityList.dump_python(ActivityList.validate_python(entries)),
+        "construct": lambda: [Activity.model_construct(**a).model_dump() for a in entries],
+        "record": lambda: [ActivityRecord(a).model_dump() for a in entries],
+    }
+    print_row("path", "entries", "p50 ms", "p99 ms")
+    assert paths["validate"]() == paths["type adapter"]() == paths["record"]()
+    for name, fn in paths.items():
+        result = timed(fn, runs)
+        print_row(name, n, f"{result['p50']:.1f}", f"{result['p99']:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    main(args.entries, args.runs)
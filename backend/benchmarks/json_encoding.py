@@ -0,0 +1,103 @@
+"""
+Encoding cost and allocations of JSON response bodies: the old path (`model_dump()` then the stdlib
+encoder `sanic.response.json` falls back to) against `app.utils.json_response.dumps`.
+
+Payloads: a full `ActivityTracker` with a week of activities, and an assessment session document as
+stored (ObjectId, datetimes, answers) plus its `AssessmentTemplatePayload`.
+
+    python -m benchmarks.json_encoding [--runs 2000] [--activities 200]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.models.launchpad.activity_tracker import ActivityTracker
+from app.models.launchpad.assessment import AssessmentTemplatePayload
+from app.routes.hra import HRA_MOCK
+from app.utils.json_response import dumps
+from benchmarks._util import print_row
+
+WIDTHS = (34, 12, 16, 12)
+
+
+def make_tracker(activities: int) -> ActivityTracker:
+    stat = {"current": 8000, "goal": 10000, "progress": 80, "unit": "steps"}
+    start = datetime(2025, 6, 20)
+    return ActivityTracker(
+        todayStats={"steps": stat, "calories": stat, "activeMinutes": stat, "distance": stat},
+        weeklyStats={"stepsData": [8000] * 7, "caloriesData": [500] * 7, "activeMinutesData": [45] * 7, "labels": list("MTWTFSS")},
+        activities=[
+            {"id": 237561926709248 + i, "type": "walk", "title": "Morning Walk", "duration": 30, "calories": 120, "steps": 3000,
+             "timestamp": (start + timedelta(minutes=50 * i)).isoformat(), "intensity": "normal"}
+            for i in range(activities)
+        ],
+        goals={"daily": {"steps": 10000, "calories": 600, "activeMinutes": 60, "water": 8},
+               "weekly": {"workouts": 5, "totalSteps": 70000, "totalCalories": 4200}},
+        achievements=[{"id": i, "title": "10K Steps!", "description": "You walked 10,000 steps in a day!", "icon": "steps",
+                       "earned": True, "date": "2025-06-24", "progress": 100} for i in range(4)],
+    )
+
+
+def make_session() -> dict:
+    now = datetime(2025, 6, 26, 6, 30)
+    return {
+        "_id": ObjectId(), "session_id": "237561926709248", "user_id": "bench-user", "template_id": "hra-basic",
+        "status": "completed", "started_at": now, "updated_at": now, "completed_at": now,
+        "answers": {f"q{i}": {"value": i, "answered_at": now} for i in range(40)},
+    }
+
+
+def make_template() -> AssessmentTemplatePayload:
+    # A JSON round trip turns the mock's integer scale-label keys into the strings the model expects.
+    steps = [{**step, "responses": step.get("responses", {}), "riskFactors": step.get("riskFactors", []),
+              "recommendations": step.get("recommendations", [])} for step in json.loads(json.dumps(list(HRA_MOCK.values())))]
+    return AssessmentTemplatePayload(template_id="hra-basic", name="Health Risk Assessment", steps=steps)
+
+
+def measure(fn, runs: int):
+    """(us per call, peak KiB allocated by one call, body bytes)."""
+    body = fn()
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    elapsed = (time.perf_counter() - start) * 1e6 / runs
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024, len(body)
+
+
+def row(label: str, fn, runs: int):
+    us, kib, size = measure(fn, runs)
+    print_row(label, f"{us:.1f}", f"{kib:.1f}", size, widths=WIDTHS)
+
+
+def stdlib(data) -> bytes:
+    return json.dumps(data, separators=(",", ":"), default=str).encode()
+
+
+def main(runs: int, activities: int):
+    tracker, session, template = make_tracker(activities), make_session(), make_template()
+    print_row("payload / path", "us / call", "peak KiB / call", "bytes", widths=WIDTHS)
+    row("tracker: model_dump + json.dumps", lambda: stdlib(tracker.model_dump()), runs)
+    row("tracker: dumps(model)", lambda: dumps(tracker), runs)
+    row("session: json.dumps(default=str)", lambda: stdlib(session), runs)
+    row("session: dumps(document)", lambda: dumps(session), runs)
+    row("template: model_dump + json.dumps", lambda: stdlib(template.model_dump()), runs)
+    row("template: dumps(model)", lambda: dumps(template), runs)
+    row("list: [m.model_dump()] + json", lambda: stdlib({"activities": [a.model_dump() for a in tracker.activities]}), runs)
+    row("list: dumps({models})", lambda: dumps({"activities": tracker.activities}), runs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--activities", type=int, default=200)
+    args = parser.parse_args()
+    main(args.runs, args.activities)
@@ -0,0 +1,85 @@
+"""
+Validation throughput of every model in `app.models.launchpad`, from Python dicts
+(`model_validate`) and from raw JSON (`model_validate_json`), plus the `ActivityList` TypeAdapter
+against validating item by item. CPU only, no MongoDB needed.
+
+    python -m benchmarks.model_validation [--seconds 0.5] [--list-size 1000]
+"""
+
+import argparse
+import json
+import time
+
+from app.models.launchpad.activity_tracker import Activity, ActivityList, ActivityTracker, Goals, Achievement
+from app.models.launchpad.assessment import AssessmentTemplatePayload, AssessmentAnswersPayload
+from app.models.launchpad.hra import HraStep
+from app.models.launchpad.profile import ProfileStep
+from app.models.launchpad.user import User
+from app.models.launchpad.wellness import Wellness
+from app.routes.hra import HRA_MOCK
+from app.routes.profile import PROFILE_MOCK
+from app.routes.wellness import WELLNESS_INTRO
+from app.services.launchpad.user_service import EXAMPLE_USER
+from benchmarks.json_encoding import make_tracker
+from benchmarks._util import print_row
+
+WIDTHS = (30, 16, 16, 12)
+
+
+def ops_per_second(fn, seconds: float) -> float:
+    fn()
+    calls, start = 0, time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        fn()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def hra_steps():
+    # A JSON round trip turns the mock's integer scale-label keys into the strings the model expects.
+    return [{"responses": {}, "riskFactors": [], "recommendations": [], **step} for step in json.loads(json.dumps(list(HRA_MOCK.values())))]
+
+
+def payloads():
+    steps = hra_steps()
+    activity = {"id": 237561926709248, "type": "walk", "title": "Morning Walk", "duration": 30, "calories": 120,
+                "steps": 3000, "timestamp": "2025-06-26T06:30:00", "intensity": "normal"}
+    return {
+        "Activity": (Activity, activity),
+        "ActivityTracker": (ActivityTracker, make_tracker(50).model_dump()),
+        "Goals": (Goals, {"daily": {"steps": 10000, "calories": 600, "activeMinutes": 60, "water": 8},
+                          "weekly": {"workouts": 5, "totalSteps": 70000, "totalCalories": 4200}}),
+        "Achievement": (Achievement, {"id": 1, "title": "10K Steps!", "description": "You walked 10,000 steps!", "icon": "steps",
+                                      "earned": True, "date": "2025-06-24", "progress": 100}),
+        "HraStep": (HraStep, steps[-1]),
+        "ProfileStep": (ProfileStep, PROFILE_MOCK[1]),
+        "Wellness": (Wellness, WELLNESS_INTRO),
+        "User": (User, EXAMPLE_USER.model_dump()),
+        "AssessmentTemplatePayload": (AssessmentTemplatePayload, {"template_id": "hra-basic", "name": "HRA", "steps": steps}),
+        "AssessmentAnswersPayload": (AssessmentAnswersPayload, {"answers": {f"q{i}": i for i in range(40)}}),
+    }
+
+
+def main(seconds: float, list_size: int):
+    print_row("model", "dict / s", "json / s", "json bytes", widths=WIDTHS)
+    for name, (model, data) in payloads().items():
+        raw = json.dumps(data).encode()
+        from_dict = ops_per_second(lambda: model.model_validate(data), seconds)
+        from_json = ops_per_second(lambda: model.model_validate_json(raw), seconds)
+        print_row(name, f"{from_dict:,.0f}", f"{from_json:,.0f}", len(raw), widths=WIDTHS)
+
+    activities = [{**payloads()["Activity"][1], "id": i} for i in range(list_size)]
+    print()
+    print_row("list payload", "per item / s", "TypeAdapter / s", "items", widths=WIDTHS)
+    one_by_one = ops_per_second(lambda: [Activity.model_validate(a) for a in activities], seconds)
+    batched = ops_per_second(lambda: ActivityList.validate_python(activities), seconds)
+    print_row("List[Activity]", f"{one_by_one * list_size:,.0f}", f"{batched * list_size:,.0f}", list_size, widths=WIDTHS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=0.5, help="time spent per measurement")
+    parser.add_argument("--list-size", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.seconds, args.list_size)
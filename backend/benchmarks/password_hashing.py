@@ -0,0 +1,70 @@
+"""
+Latency an unrelated request sees while a worker handles a login storm, with bcrypt called inline
+on the event loop (the old behaviour) versus through the bounded thread pool.
+
+An unrelated request is modelled as a probe that sleeps 5 ms and records how late it wakes: the
+time any other handler on the worker would wait for the loop. No database is needed.
+
+    python -m benchmarks.password_hashing [--logins 40] [--rounds 12] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import time
+
+import bcrypt
+
+from app.utils.passwords import PasswordHasher
+from benchmarks._util import percentiles, print_row
+
+PROBE_INTERVAL = 0.005
+WIDTHS = (10, 12, 18, 18, 12)
+
+
+async def probe(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        due = time.perf_counter() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - due) * 1000)
+
+
+async def storm(mode: str, logins: int, password_hash: str, hasher: PasswordHasher):
+    async def inline_login():
+        # What `authenticate` used to do: checkpw directly in the handler.
+        await asyncio.sleep(0)
+        assert bcrypt.checkpw(b"correct horse", password_hash.encode())
+
+    async def pooled_login():
+        assert await hasher.verify("correct horse", password_hash)
+
+    login = inline_login if mode == "inline" else pooled_login
+    stop, lags = asyncio.Event(), []
+    prober = asyncio.ensure_future(probe(stop, lags))
+    await asyncio.sleep(PROBE_INTERVAL * 4)
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await prober
+    return lags, elapsed
+
+
+async def main(logins: int, rounds: int, workers: int):
+    hasher = PasswordHasher(rounds=rounds, workers=workers)
+    password_hash = await hasher.hash("correct horse")
+    print(f"{logins} concurrent logins, bcrypt cost {rounds}, {workers} hash thread(s)")
+    print_row("mode", "logins/s", "probe p50 ms", "probe p99 ms", "probe max", widths=WIDTHS)
+    for mode in ("inline", "pool"):
+        lags, elapsed = await storm(mode, logins, password_hash, hasher)
+        p = percentiles(lags) if len(lags) >= 2 else {"p50": lags[0], "p99": lags[0]}
+        print_row(mode, f"{logins / elapsed:.1f}", f"{p['p50']:.2f}", f"{p['p99']:.2f}", f"{max(lags):.0f}", widths=WIDTHS)
+    hasher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.rounds, args.workers))
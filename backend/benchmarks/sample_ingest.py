@@ -0,0 +1,80 @@
+"""
+Bytes per sample and ingest throughput of the heart-rate sample buckets, next to what the same
+samples would cost as one `Activity`-shaped entry each.
+
+    python -m benchmarks.sample_ingest [--days 7] [--batch 1440]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+import bson
+
+from app.services.activity_storage import to_document
+from app.services.sample_service import SampleService
+from benchmarks._util import bench_app, print_row
+
+WIDTHS = (10, 34, 14)
+
+
+def make_samples(days: int):
+    """One heart-rate reading per minute, drifting like a real trace."""
+    rng = random.Random(3)
+    start = int((datetime.utcnow() - timedelta(days=days)).timestamp()) // 60 * 60
+    value, samples = 70, []
+    for i in range(days * 1440):
+        value = min(180, max(45, value + rng.randint(-3, 3)))
+        samples.append([start + 60 * i, value])
+    return samples
+
+
+def activity_entry_bytes(sample) -> int:
+    entry = {
+        "id": 0, "type": "heart_rate", "title": "Heart Rate", "duration": 0, "calories": 0, "steps": sample[1],
+        "timestamp": datetime.utcfromtimestamp(sample[0]).isoformat(), "intensity": "normal",
+    }
+    return len(bson.encode(to_document(entry)))
+
+
+async def main(days: int, batch: int):
+    app = bench_app()
+    service = SampleService(app)
+    user_id = "bench-samples"
+    samples = make_samples(days)
+    await service.collection.delete_many({"user_id": user_id})
+
+    start = time.perf_counter()
+    for i in range(0, len(samples), batch):
+        result = await service.add_samples(user_id, "heart_rate", samples[i:i + batch])
+        assert not result["rejected"]
+    elapsed = time.perf_counter() - start
+
+    sizes = [doc async for doc in service.collection.aggregate([
+        {"$match": {"user_id": user_id}},
+        {"$group": {"_id": None, "bytes": {"$sum": {"$bsonSize": "$$ROOT"}}}},
+    ])]
+    stored = sizes[0]["bytes"] if sizes else 0
+
+    start_read = time.perf_counter()
+    times, values = await service.get_samples(user_id, "heart_rate")
+    read_ms = (time.perf_counter() - start_read) * 1000
+    assert values.size == len(samples)
+
+    n = len(samples)
+    print_row("samples", "metric", "value", widths=WIDTHS)
+    print_row(n, f"ingest samples/s (batch {batch})", f"{n / elapsed:.0f}", widths=WIDTHS)
+    print_row("", "bucket bytes / sample", f"{stored / n:.2f}", widths=WIDTHS)
+    print_row("", "Activity entry bytes / sample", f"{activity_entry_bytes(samples[0]):.2f}", widths=WIDTHS)
+    print_row("", "full-range decode ms", f"{read_ms:.1f}", widths=WIDTHS)
+    await service.collection.delete_many({"user_id": user_id})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--batch", type=int, default=1440)
+    args = parser.parse_args()
+    asyncio.run(main(args.days, args.batch))
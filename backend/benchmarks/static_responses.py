@@ -0,0 +1,43 @@
+"""
+Per-request cost of the onboarding step routes: re-serializing the step dict with `response.json`
+versus returning the pre-encoded body (200) or answering a revalidation (304).
+
+    python -m benchmarks.static_responses [--runs 20000]
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from sanic import response
+
+from app.routes.onboarding import ONBOARDING_MOCK, ONBOARDING_PAYLOADS
+from app.utils.static_response import static_json
+from benchmarks._util import print_row
+
+WIDTHS = (28, 14, 12)
+
+
+def per_call_us(fn, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / runs
+
+
+def main(runs: int):
+    step = max(ONBOARDING_PAYLOADS, key=lambda k: len(ONBOARDING_PAYLOADS[k].body))
+    data, payload = ONBOARDING_MOCK[step], ONBOARDING_PAYLOADS[step]
+    fresh = SimpleNamespace(headers={})
+    revalidate = SimpleNamespace(headers={"if-none-match": payload.etag})
+    print_row("path", "us / request", "body bytes", widths=WIDTHS)
+    print_row("response.json(dict)", f"{per_call_us(lambda: response.json(data), runs):.2f}", len(payload.body), widths=WIDTHS)
+    print_row("pre-encoded, 200", f"{per_call_us(lambda: static_json(fresh, payload), runs):.2f}", len(payload.body), widths=WIDTHS)
+    print_row("If-None-Match hit, 304", f"{per_call_us(lambda: static_json(revalidate, payload), runs):.2f}", 0, widths=WIDTHS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,64 @@
+"""
+Per-request cost of identifying the caller from an access token: a cold verification (HMAC and
+JSON decode), a verification served from the LRU, and a cold one that also evicts, next to the
+revocation check that runs on every call. No database is needed.
+
+    python -m benchmarks.token_verification [--tokens 20000] [--cache-size 10000]
+"""
+
+import argparse
+import time
+
+from app.utils.tokens import TokenVerifier, encode_token
+from benchmarks._util import print_row
+
+SECRET = b"bench-secret"
+WIDTHS = (34, 14)
+
+
+def make_tokens(count: int):
+    exp = int(time.time()) + 3600
+    return [encode_token({"sub": f"bench-user-{i}", "exp": exp, "jti": str(i)}, SECRET) for i in range(count)]
+
+
+def per_call_us(fn, tokens) -> float:
+    start = time.perf_counter()
+    for token in tokens:
+        fn(token)
+    return (time.perf_counter() - start) * 1e6 / len(tokens)
+
+
+def main(count: int, cache_size: int):
+    tokens = make_tokens(count)
+    working_set = tokens[:min(cache_size, count)]
+
+    cold = per_call_us(TokenVerifier(SECRET, cache_size=0).verify, tokens)
+
+    warm_verifier = TokenVerifier(SECRET, cache_size=cache_size)
+    per_call_us(warm_verifier.verify, working_set)
+    warm = per_call_us(warm_verifier.verify, working_set)
+
+    # Every call misses and pushes another token out of a full cache.
+    churn_verifier = TokenVerifier(SECRET, cache_size=max(1, count // 10))
+    churn = per_call_us(churn_verifier.verify, tokens)
+
+    revoked_verifier = TokenVerifier(SECRET, cache_size=cache_size)
+    for i in range(1000):
+        revoked_verifier.revoke(f"revoked-{i}", int(time.time()) + 3600)
+    per_call_us(revoked_verifier.verify, working_set)
+    with_revocations = per_call_us(revoked_verifier.verify, working_set)
+
+    print_row("path", "us / request", widths=WIDTHS)
+    print_row("cold (HMAC + decode)", f"{cold:.2f}", widths=WIDTHS)
+    print_row(f"cached ({len(working_set)} tokens)", f"{warm:.2f}", widths=WIDTHS)
+    print_row("cached, 1000 revocations listed", f"{with_revocations:.2f}", widths=WIDTHS)
+    print_row("miss + eviction", f"{churn:.2f}", widths=WIDTHS)
+    print(warm_verifier.metrics())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=20000)
+    parser.add_argument("--cache-size", type=int, default=10000)
+    args = parser.parse_args()
+    main(args.tokens, args.cache_size)
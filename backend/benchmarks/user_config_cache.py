@@ -0,0 +1,86 @@
+"""
+/api/wellness/config reads through the two-tier cache, against loading every request from the
+database. Several simulated workers share one `FakeRedis` (with a configurable round trip) and each
+has its own local tier; the database is a sleep of `--db-ms`. Users are drawn with a skew (a few
+are hot) and a fraction of requests update the config, which invalidates it.
+
+    python -m benchmarks.user_config_cache [--requests 20000] [--users 2000] [--workers 4] [--db-ms 2] [--redis-ms 0.3] [--update-rate 0.01]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.models.launchpad.user import User
+from app.services.launchpad.user_service import EXAMPLE_USER
+from app.utils.cache import FakeRedis, ReadThroughCache
+from app.utils.static_response import StaticJSON
+from benchmarks._util import percentiles, print_row
+
+WIDTHS = (26, 10, 10, 10, 12)
+
+
+def make_cache(shared: FakeRedis, local_ttl: float) -> ReadThroughCache[StaticJSON]:
+    return ReadThroughCache(shared, "user_config", encode=lambda p: p.body, decode=StaticJSON.from_body,
+                            local_size=10000, local_ttl=local_ttl, shared_ttl=3600)
+
+
+async def run(args, cached: bool):
+    rng = random.Random(7)
+    shared = FakeRedis(latency=args.redis_ms / 1000)
+    caches = [make_cache(shared, args.local_ttl) for _ in range(args.workers)]
+    template = EXAMPLE_USER.model_dump()
+
+    async def load(user_id: int) -> StaticJSON:
+        await asyncio.sleep(args.db_ms / 1000)
+        return StaticJSON(User.model_validate({**template, "id": user_id}).model_dump(by_alias=True))
+
+    samples, loads = [], 0
+
+    async def request(i: int):
+        nonlocal loads
+        cache = caches[i % args.workers]
+        user_id = min(int(rng.paretovariate(1.2)), args.users)
+        if cached and rng.random() < args.update_rate:
+            await cache.invalidate(user_id)
+            return
+        start = time.perf_counter()
+        if cached:
+            await cache.get(user_id, lambda: load(user_id))
+        else:
+            loads += 1
+            await load(user_id)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    # Bounded concurrency, like a worker's open connections.
+    for batch in range(0, args.requests, args.concurrency):
+        await asyncio.gather(*(request(i) for i in range(batch, min(batch + args.concurrency, args.requests))))
+
+    if cached:
+        metrics = [c.metrics() for c in caches]
+        gets = sum(m["gets"] for m in metrics)
+        hits = sum(m["local_hits"] + m["shared_hits"] for m in metrics)
+        loads = sum(m["misses"] for m in metrics)
+        return percentiles(samples), hits / gets, loads
+    return percentiles(samples), 0.0, loads
+
+
+def main(args):
+    print_row("path", "p50 ms", "p99 ms", "hit ratio", "db reads", widths=WIDTHS)
+    for label, cached in (("database every request", False), ("two-tier cache", True)):
+        latency, ratio, loads = asyncio.run(run(args, cached))
+        print_row(label, f"{latency['p50']:.3f}", f"{latency['p99']:.3f}", f"{ratio:.3f}", loads, widths=WIDTHS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--db-ms", type=float, default=2.0)
+    parser.add_argument("--redis-ms", type=float, default=0.3)
+    parser.add_argument("--local-ttl", type=float, default=30.0)
+    parser.add_argument("--update-rate", type=float, default=0.01)
+    main(parser.parse_args())
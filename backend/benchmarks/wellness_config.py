@@ -0,0 +1,62 @@
+"""
+Per-request cost of building the /api/wellness/config body for a user with many widgets: the old
+recursive `keys_to_camel(model_dump())` with uncached key splitting, `model_dump(by_alias=True)`,
+and serving the cached encoded payload. CPU only, no MongoDB needed.
+
+    python -m benchmarks.wellness_config [--runs 5000] [--widgets 200]
+"""
+
+import argparse
+import time
+
+from app.models.launchpad.user import User
+from app.utils.casing import keys_to_camel, to_camel_case
+from app.utils.json_response import dumps
+from app.utils.static_response import StaticJSON
+from benchmarks._util import print_row
+
+WIDTHS = (38, 14, 12)
+
+
+def uncached_keys_to_camel(obj):
+    if isinstance(obj, list):
+        return [uncached_keys_to_camel(i) for i in obj]
+    if isinstance(obj, dict):
+        return {to_camel_case.__wrapped__(k): uncached_keys_to_camel(v) for k, v in obj.items()}
+    return obj
+
+
+def make_user(widgets: int) -> User:
+    tabs = ["daily_overview", "weekly_challenges", "health_assessments", "sleep_tracking"]
+    return User(id=1, name="Bench User", form={
+        "tabs": tabs,
+        "widgets": {tab: [{"widget_id": i, "widget_name": f"Widget {i}", "value": {"current_value": i, "target_value": 100}}
+                          for i in range(widgets // len(tabs))] for tab in tabs},
+    })
+
+
+def per_call_us(fn, runs: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / runs
+
+
+def main(runs: int, widgets: int):
+    user = make_user(widgets)
+    cached = StaticJSON(user.model_dump(by_alias=True))
+    assert dumps(uncached_keys_to_camel(user.model_dump())) == cached.body
+    print_row("path", "us / request", "body bytes", widths=WIDTHS)
+    print_row("keys_to_camel(model_dump), uncached", f"{per_call_us(lambda: dumps(uncached_keys_to_camel(user.model_dump())), runs):.1f}", len(cached.body), widths=WIDTHS)
+    print_row("keys_to_camel(model_dump), memoized", f"{per_call_us(lambda: dumps(keys_to_camel(user.model_dump())), runs):.1f}", len(cached.body), widths=WIDTHS)
+    print_row("model_dump(by_alias=True)", f"{per_call_us(lambda: dumps(user.model_dump(by_alias=True)), runs):.1f}", len(cached.body), widths=WIDTHS)
+    print_row("cached payload", f"{per_call_us(lambda: cached.body, runs):.2f}", len(cached.body), widths=WIDTHS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5000)
+    parser.add_argument("--widgets", type=int, default=200)
+    args = parser.parse_args()
+    main(args.runs, args.widgets)
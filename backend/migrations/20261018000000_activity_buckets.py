@@ -0,0 +1,58 @@
+"""
+Move embedded `activity_tracker.activities` arrays into per-user, per-type, per-day `activity_buckets`.
+
+Run with: pymongo-migrate migrate -u "$MONGO_URI" -m migrations
+"""
+from collections import defaultdict
+from datetime import datetime
+
+import pymongo
+
+name = '20261018000000_activity_buckets'
+dependencies = []
+
+BUCKET_MAX_ENTRIES = 200
+
+
+def _day(timestamp: str) -> str:
+    return datetime.fromisoformat(timestamp).date().isoformat()
+
+
+def upgrade(db: "pymongo.database.Database"):
+    buckets = db['activity_buckets']
+    buckets.create_index([('user_id', pymongo.ASCENDING), ('type', pymongo.ASCENDING), ('day', pymongo.ASCENDING)])
+    buckets.create_index([('user_id', pymongo.ASCENDING), ('entries.id', pymongo.ASCENDING)])
+    for doc in db['activity_tracker'].find({"activities.0": {"$exists": True}}, {"user_id": 1, "activities": 1}):
+        user_id = doc["user_id"]
+        # Safe to re-run: entries a previous partial run (or the app) already bucketed are skipped,
+        # and nothing else in `activity_buckets` is touched.
+        bucketed = set(buckets.distinct("entries.id", {"user_id": user_id}))
+        grouped = defaultdict(list)
+        for entry in doc["activities"]:
+            if entry["id"] not in bucketed:
+                grouped[(entry["type"], _day(entry["timestamp"]))].append(entry)
+        ops = []
+        for (activity_type, day), entries in sorted(grouped.items(), key=lambda kv: kv[0][1]):
+            entries.sort(key=lambda a: a["timestamp"])
+            for i in range(0, len(entries), BUCKET_MAX_ENTRIES):
+                chunk = entries[i:i + BUCKET_MAX_ENTRIES]
+                # Fill a bucket of the day with room for the whole chunk, or open a new one.
+                ops.append(pymongo.UpdateOne(
+                    {"user_id": user_id, "type": activity_type, "day": day, "count": {"$lte": BUCKET_MAX_ENTRIES - len(chunk)}},
+                    {"$addToSet": {"entries": {"$each": chunk}}, "$inc": {"count": len(chunk)}},
+                    upsert=True
+                ))
+        # Ordered, so a failure stops before the tracker's copy is removed; re-running picks up the rest.
+        if ops:
+            buckets.bulk_write(ops, ordered=True)
+        db['activity_tracker'].update_one({"_id": doc["_id"]}, {"$unset": {"activities": ""}})
+
+
+def downgrade(db: "pymongo.database.Database"):
+    activity_tracker = db['activity_tracker']
+    for user_id in db['activity_buckets'].distinct("user_id"):
+        entries = []
+        for bucket in db['activity_buckets'].find({"user_id": user_id}).sort([("day", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)]):
+            entries.extend(bucket.get("entries", []))
+        activity_tracker.update_one({"user_id": user_id}, {"$set": {"activities": entries}}, upsert=True)
+        db['activity_buckets'].delete_many({"user_id": user_id})
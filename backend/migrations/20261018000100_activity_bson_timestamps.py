@@ -0,0 +1,72 @@
+"""
+Store activity entry timestamps as BSON dates with a precomputed UTC `day` key.
+
+Buckets are regrouped per user because converting offset timestamps to UTC can move an entry
+to a different day. Run scripts.rebuild_activity_rollups afterwards so day rollups follow.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import pymongo
+
+name = '20261018000100_activity_bson_timestamps'
+dependencies = ['20261018000000_activity_buckets']
+
+BUCKET_MAX_ENTRIES = 200
+
+
+def _to_date(entry):
+    ts = entry["timestamp"]
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return {**entry, "timestamp": ts, "day": ts.date().isoformat()}
+
+
+def _to_string(entry):
+    restored = {k: v for k, v in entry.items() if k != "day"}
+    if isinstance(restored["timestamp"], datetime):
+        restored["timestamp"] = restored["timestamp"].isoformat()
+    return restored
+
+
+def _rewrite_embedded(db, convert):
+    collection = db['activity_tracker']
+    for doc in collection.find({"activities.0": {"$exists": True}}, {"activities": 1}):
+        collection.update_one({"_id": doc["_id"]}, {"$set": {"activities": [convert(a) for a in doc["activities"]]}})
+
+
+def _rewrite_buckets(db, convert, day_of):
+    buckets = db['activity_buckets']
+    for user_id in buckets.distinct("user_id"):
+        grouped = defaultdict(list)
+        for bucket in buckets.find({"user_id": user_id}):
+            for entry in bucket.get("entries", []):
+                converted = convert(entry)
+                grouped[(converted["type"], day_of(converted))].append(converted)
+        new_buckets = []
+        for (activity_type, day), entries in grouped.items():
+            entries.sort(key=lambda a: a["timestamp"])
+            for i in range(0, len(entries), BUCKET_MAX_ENTRIES):
+                chunk = entries[i:i + BUCKET_MAX_ENTRIES]
+                new_buckets.append({"user_id": user_id, "type": activity_type, "day": day, "count": len(chunk), "entries": chunk})
+        buckets.delete_many({"user_id": user_id})
+        if new_buckets:
+            buckets.insert_many(new_buckets, ordered=False)
+
+
+def upgrade(db: "pymongo.database.Database"):
+    _rewrite_embedded(db, _to_date)
+    _rewrite_buckets(db, _to_date, lambda e: e["day"])
+    activity_tracker = db['activity_tracker']
+    activity_tracker.create_index([('user_id', pymongo.ASCENDING), ('activities.type', pymongo.ASCENDING), ('activities.timestamp', pymongo.ASCENDING)])
+    if 'activities.timestamp_1' in activity_tracker.index_information():
+        activity_tracker.drop_index('activities.timestamp_1')
+
+
+def downgrade(db: "pymongo.database.Database"):
+    _rewrite_embedded(db, _to_string)
+    _rewrite_buckets(db, _to_string, lambda e: datetime.fromisoformat(e["timestamp"]).date().isoformat())
+    activity_tracker = db['activity_tracker']
+    activity_tracker.create_index([('activities.timestamp', pymongo.ASCENDING)])
@@ -0,0 +1,27 @@
+"""
+List each `activity_archive` month's entry ids next to its blob, so archived entries can be found by id.
+
+Run with: pymongo-migrate migrate -u "$MONGO_URI" -m migrations
+"""
+import zlib
+
+import bson
+import pymongo
+
+name = '20261018000200_activity_archive_ids'
+dependencies = ['20261018000100_activity_bson_timestamps']
+
+
+def upgrade(db: "pymongo.database.Database"):
+    archive = db['activity_archive']
+    for doc in archive.find({"ids": {"$exists": False}}, {"data": 1}):
+        entries = bson.decode(zlib.decompress(doc["data"]))["entries"]
+        archive.update_one({"_id": doc["_id"]}, {"$set": {"ids": [e["id"] for e in entries]}})
+    archive.create_index([('user_id', pymongo.ASCENDING), ('ids', pymongo.ASCENDING)])
+
+
+def downgrade(db: "pymongo.database.Database"):
+    archive = db['activity_archive']
+    if 'user_id_1_ids_1' in archive.index_information():
+        archive.drop_index('user_id_1_ids_1')
+    archive.update_many({}, {"$unset": {"ids": ""}})
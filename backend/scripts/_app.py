@@ -0,0 +1,13 @@
+"""
+Minimal app context for command-line scripts: services only need `app.ctx.mongo`.
+"""
+
+from types import SimpleNamespace
+
+import motor.motor_asyncio
+
+from app.db.config import MONGO_URI
+
+
+def script_app(uri: str = MONGO_URI):
+    return SimpleNamespace(ctx=SimpleNamespace(mongo=motor.motor_asyncio.AsyncIOMotorClient(uri)))
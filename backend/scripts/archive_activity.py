@@ -0,0 +1,60 @@
+"""
+Move activity entries older than the hot window into the compressed `activity_archive` tier and
+report the hot working set (data + indexes of the configured store's collection) before and after.
+
+    python -m scripts.archive_activity [--older-than-days 90] [--user USER_ID ...]
+
+Safe to re-run: entries are copied before they are removed, and re-archived entries are merged by id.
+"""
+
+import argparse
+import asyncio
+
+from app.db.config import ACTIVITY_ARCHIVE_AFTER_DAYS
+from app.services.activity_service import ActivityService
+from scripts._app import script_app
+
+
+async def collection_size(db, name: str):
+    try:
+        stats = await db.command("collStats", name)
+    except Exception:
+        return {"data": 0, "storage": 0, "indexes": 0}
+    return {"data": stats.get("size", 0), "storage": stats.get("storageSize", 0), "indexes": stats.get("totalIndexSize", 0)}
+
+
+def mib(n: int) -> str:
+    return f"{n / 2 ** 20:.1f} MiB"
+
+
+async def report(db, service: ActivityService, label: str):
+    hot = await collection_size(db, service.store.collection.name)
+    cold = await collection_size(db, service.archive.collection.name)
+    print(f"{label}: hot working set {mib(hot['data'] + hot['indexes'])} "
+          f"(data {mib(hot['data'])}, indexes {mib(hot['indexes'])}); archive on disk {mib(cold['storage'])}")
+
+
+async def main(older_than_days: int, user_ids):
+    app = script_app()
+    db = app.ctx.mongo['launchpad_db']
+    service = ActivityService(app)
+    await service.archive.ensure_indexes()
+    await report(db, service, "before")
+    if not user_ids:
+        user_ids = await service.store.user_ids()
+    archived = 0
+    for user_id in sorted(user_ids):
+        result = await service.archive_entries(user_id, older_than_days)
+        if result["archived"]:
+            print(f"{user_id}: archived {result['archived']}, removed {result['removed']} from the hot store")
+        archived += result["archived"]
+    print(f"{len(user_ids)} user(s), {archived} entries archived (older than {older_than_days} days)")
+    await report(db, service, "after")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--older-than-days", type=int, default=ACTIVITY_ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--user", dest="user_ids", action="append", default=[])
+    args = parser.parse_args()
+    asyncio.run(main(args.older_than_days, args.user_ids))
@@ -0,0 +1,59 @@
+"""
+Copy activity entries from the embedded or bucketed layout into the `activity_series`
+time-series collection, user by user. Switch ACTIVITY_STORAGE to `timeseries` once it has run.
+
+    python -m scripts.migrate_activity_timeseries [--source bucketed] [--user USER_ID ...] [--batch 1000]
+
+The source is left untouched. A user's existing series entries are replaced, so the script can
+be re-run (e.g. to pick up writes made during the first pass).
+"""
+
+import argparse
+import asyncio
+
+from app.services.activity_storage import get_activity_store, TimeSeriesActivityStore
+from scripts._app import script_app
+
+
+async def migrate_user(source, target: TimeSeriesActivityStore, user_id: str, batch: int) -> int:
+    await target.collection.delete_many({"meta.user_id": user_id})
+    copied, pending = 0, []
+    async for entry in source.collection.aggregate(source.entry_pipeline(user_id), batchSize=batch):
+        pending.append(entry)
+        if len(pending) >= batch:
+            copied += await _write(target, user_id, pending)
+            pending = []
+    if pending:
+        copied += await _write(target, user_id, pending)
+    return copied
+
+
+async def _write(target: TimeSeriesActivityStore, user_id: str, entries) -> int:
+    failed = await target.insert_many(user_id, [{k: v for k, v in e.items() if k != "day"} for e in entries])
+    if failed:
+        print(f"{user_id}: {len(failed)} entries failed to copy")
+    return len(entries) - len(failed)
+
+
+async def main(source_name: str, user_ids, batch: int):
+    db = script_app().ctx.mongo['launchpad_db']
+    source = get_activity_store(source_name, db)
+    target = TimeSeriesActivityStore(db)
+    await target.ensure_indexes()
+    if not user_ids:
+        user_ids = await source.user_ids()
+    total = 0
+    for user_id in sorted(user_ids):
+        copied = await migrate_user(source, target, user_id, batch)
+        total += copied
+        print(f"{user_id}: {copied} entries")
+    print(f"{len(user_ids)} user(s), {total} entries copied to activity_series")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", choices=["embedded", "bucketed"], default="bucketed")
+    parser.add_argument("--user", dest="user_ids", action="append", default=[])
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.source, args.user_ids, args.batch))
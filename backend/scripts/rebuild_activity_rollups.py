@@ -0,0 +1,47 @@
+"""
+Recompute `activity_rollups` from raw activity entries and report any drift.
+
+    python -m scripts.rebuild_activity_rollups [--user USER_ID ... | --flagged] [--dry-run]
+
+`--flagged` only rebuilds users whose rollups an ingest failed to update (see
+`ActivityRollups.flag_rebuild`); run it periodically.
+
+Exits with status 1 when drift was found, so it can double as a consistency check.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.services.activity_service import ActivityService
+from scripts._app import script_app
+
+
+async def main(user_ids, flagged: bool, dry_run: bool) -> int:
+    service = ActivityService(script_app())
+    if flagged:
+        user_ids = await service.rollups.flagged_users()
+    elif not user_ids:
+        user_ids = set(await service.store.user_ids())
+        user_ids |= set(await service.rollups.collection.distinct("user_id"))
+    drifted = 0
+    for user_id in sorted(user_ids):
+        drift = await service.rebuild_rollups(user_id, dry_run=dry_run)
+        if not drift:
+            continue
+        drifted += 1
+        print(f"{user_id}: {len(drift)} rollup(s) drifted")
+        for item in drift:
+            print(f"  {item['type']} {item['period']} {item['key']}: stored={item['stored']} expected={item['expected']}")
+    action = "found" if dry_run else "rebuilt"
+    print(f"{len(user_ids)} user(s) checked, {drifted} {action} with drift")
+    return 1 if drifted else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user", dest="user_ids", action="append", default=[])
+    parser.add_argument("--flagged", action="store_true", help="only rebuild users flagged after a failed rollup update")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without rewriting rollups")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.user_ids, args.flagged, args.dry_run)))
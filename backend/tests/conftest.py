@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+# Ids are minted outside a Sanic worker in tests.
+os.environ.setdefault("ID_PROCESS_SLOT", "31")
+
+
+@pytest.fixture(autouse=True)
+def mongomock_bulk_sort(monkeypatch):
+    """pymongo passes a `sort` option to bulk updates that mongomock's bulk builder doesn't accept yet."""
+    try:
+        import mongomock.collection as collection
+    except ImportError:
+        return
+    for name in ("add_update", "add_replace", "add_delete"):
+        original = getattr(collection.BulkOperationBuilder, name)
+
+        def without_sort(self, *args, _original=original, **kwargs):
+            kwargs.pop("sort", None)
+            return _original(self, *args, **kwargs)
+
+        monkeypatch.setattr(collection.BulkOperationBuilder, name, without_sort)
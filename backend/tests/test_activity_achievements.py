@@ -0,0 +1,52 @@
+"""
+Streak achievements, including days backfilled into an earlier gap, against an in-memory MongoDB.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.services.activity_achievements import ActivityAchievements, STREAK
+from app.services.activity_rollups import DAY
+
+RULE = {"id": 1, "title": "Five Days", "description": "Steps 5 days in a row", "icon": "streak",
+        "rule": STREAK, "type": "steps", "metric": "value", "daily_min": 1000, "target": 5}
+START = date(2025, 6, 1)
+
+
+def day(n):
+    return (START + timedelta(days=n)).isoformat()
+
+
+async def log_days(achievements, days):
+    """Write each day's rollup and evaluate it, one ingest per day."""
+    for n in days:
+        await achievements.rollups.insert_one({"user_id": "u1", "type": "steps", "period": DAY, "key": day(n), "value": 2000, "count": 1})
+        await achievements.evaluate("u1", [{"type": "steps", "timestamp": f"{day(n)}T08:00:00"}])
+    doc = await achievements.collection.find_one({"user_id": "u1"})
+    return doc["rules"]["1"]
+
+
+def achievements():
+    return ActivityAchievements(mongomock_motor.AsyncMongoMockClient()["launchpad_db"], rules=[RULE])
+
+
+def test_consecutive_days_extend_the_streak():
+    state = asyncio.run(log_days(achievements(), [0, 1, 2, 4]))
+    assert (state["current"], state["best"], state["last_day"]) == (1, 3, day(4))
+    assert not state.get("earned")
+
+
+def test_backfilled_day_closing_a_gap_joins_both_runs():
+    state = asyncio.run(log_days(achievements(), [0, 1, 3, 4, 5, 2]))
+    assert (state["current"], state["best"], state["last_day"]) == (6, 6, day(5))
+    assert state["earned"]
+    assert state["date"] == day(4)
+
+
+def test_backfilled_older_run_only_raises_the_best_streak():
+    state = asyncio.run(log_days(achievements(), [20, 21, 0, 1, 2]))
+    assert (state["current"], state["best"], state["last_day"]) == (2, 3, day(21))
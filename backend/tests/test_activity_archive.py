@@ -0,0 +1,77 @@
+"""
+Reads and edits of archived activity entries, against an in-memory MongoDB.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.services import activity_archive
+from app.services.activity_service import ActivityService
+from app.services.sync_service import SyncService
+
+
+@pytest.fixture
+def app(monkeypatch):
+    async def record(self, *args, **kwargs):
+        return 0
+
+    # mongomock can't run the version reservation pipeline; the changelog isn't under test here.
+    monkeypatch.setattr(SyncService, "record", record)
+    monkeypatch.setattr(SyncService, "record_many", record)
+    return SimpleNamespace(ctx=SimpleNamespace(mongo=mongomock_motor.AsyncMongoMockClient()))
+
+
+async def archived_service(app, months=3, per_month=4):
+    """A service whose user u1 has `months` months of archived steps entries, oldest in 2025-01."""
+    service = ActivityService(app, storage="embedded")
+    for m in range(months):
+        for n in range(per_month):
+            ts = datetime(2025, 1 + m, 1 + n, 8)
+            await service.add_activity_entry("u1", "steps", {"steps": 100, "timestamp": ts.isoformat()})
+    await service.archive_entries("u1", older_than_days=0)
+    return service
+
+
+def test_history_page_stops_reading_the_archive_once_full(app, monkeypatch):
+    unpacked = []
+    unpack = activity_archive.unpack
+
+    def counting_unpack(blob):
+        unpacked.append(blob)
+        return unpack(blob)
+
+    async def run():
+        service = await archived_service(app)
+        monkeypatch.setattr(activity_archive, "unpack", counting_unpack)
+        return await service.get_activity_history_page("u1", "steps", limit=3, start_date="2024-12-01T00:00:00")
+
+    page = asyncio.run(run())
+    assert [e.timestamp for e in page["items"]] == ["2025-01-01T08:00:00", "2025-01-02T08:00:00", "2025-01-03T08:00:00"]
+    assert page["next"] is not None
+    assert len(unpacked) == 1
+
+
+def test_archived_entries_can_be_edited_and_deleted(app):
+    async def run():
+        service = await archived_service(app, months=2, per_month=2)
+        first, second, third, _ = [e.id for e in await service.get_activity_history("u1", "steps", start_date="2024-12-01T00:00:00")]
+        assert await service.store.find_entry("u1", first) is None
+        assert await service.update_activity_entry("u1", first, {"steps": 300})
+        # Moves the entry to the archived March blob.
+        assert await service.update_activity_entry("u1", second, {"timestamp": "2025-03-05T08:00:00"})
+        assert await service.delete_activity_entry("u1", third)
+        history = await service.get_activity_history("u1", "steps", start_date="2024-12-01T00:00:00")
+        totals = await service.rollups.get_totals("u1", "lifetime", "all", "steps")
+        return history, totals, first, second
+
+    history, totals, first, second = asyncio.run(run())
+    assert [(e.id, e.steps) for e in history][0] == (first, 300)
+    assert [e.id for e in history][-1] == second
+    assert len(history) == 3
+    assert totals[0]["count"] == 3
+    assert totals[0]["steps"] == 500
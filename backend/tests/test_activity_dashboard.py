@@ -0,0 +1,58 @@
+"""
+`ActivityService.get_dashboard` built from the stored entries, rollups, goals and achievements.
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.services.activity_service import ActivityService
+from app.services.goal_service import GoalService
+from app.services.sync_service import SyncService
+
+GOALS = {
+    "daily": {"steps": 10000, "calories": 600, "activeMinutes": 60, "water": 8},
+    "weekly": {"workouts": 5, "totalSteps": 70000, "totalCalories": 4200},
+}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    async def record(self, *args, **kwargs):
+        return 0
+
+    # mongomock can't run the version reservation pipeline; the changelog isn't under test here.
+    monkeypatch.setattr(SyncService, "record", record)
+    monkeypatch.setattr(SyncService, "record_many", record)
+    return SimpleNamespace(ctx=SimpleNamespace(mongo=mongomock_motor.AsyncMongoMockClient()))
+
+
+def test_dashboard_reflects_logged_entries(app):
+    async def run():
+        await GoalService(app).set_goal("u1", GOALS)
+        service = ActivityService(app)
+        now = datetime.utcnow().replace(microsecond=0).isoformat()
+        await service.add_activity_entry("u1", "steps", {"steps": 6000, "timestamp": now})
+        await service.add_activity_entry("u1", "steps", {"steps": 5000, "timestamp": now})
+        await service.add_activity_entry("u1", "calories", {"calories": 250, "timestamp": now})
+        return await service.get_dashboard("u1")
+
+    dashboard = asyncio.run(run())
+    assert dashboard["todayStats"]["steps"] == 11000
+    assert dashboard["todayStats"]["calories"] == 250
+    assert dashboard["weeklyStats"]["steps"] == 11000
+    assert len(dashboard["activities"]) == 3
+    assert dashboard["goals"] == {"steps": 10000, "calories": 600, "activeMinutes": 60}
+    assert [a["title"] for a in dashboard["achievements"]] == ["10K Steps!"]
+
+
+def test_empty_dashboard(app):
+    dashboard = asyncio.run(ActivityService(app).get_dashboard("nobody"))
+    assert dashboard["todayStats"] == {"steps": 0, "calories": 0, "activeMinutes": 0}
+    assert dashboard["activities"] == []
+    assert dashboard["goals"] == {"steps": None, "calories": None, "activeMinutes": None}
+    assert dashboard["achievements"] == []
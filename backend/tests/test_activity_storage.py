@@ -0,0 +1,45 @@
+"""
+Store-level behaviour of the activity storage layouts, against an in-memory MongoDB.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.services.activity_storage import EmbeddedActivityStore, TimeSeriesActivityStore
+
+
+def entry(entry_id, timestamp, steps=100):
+    return {"id": entry_id, "type": "steps", "title": "Steps", "duration": 0, "calories": 0,
+            "steps": steps, "timestamp": timestamp.isoformat(), "intensity": "normal"}
+
+
+def test_embedded_remove_archived_counts_removed_entries():
+    async def run():
+        store = EmbeddedActivityStore(mongomock_motor.AsyncMongoMockClient()["launchpad_db"])
+        old = datetime(2025, 1, 1)
+        for n in range(3):
+            await store.insert("u1", entry(n + 1, old + timedelta(hours=n)))
+        _, token = await store.find_archivable("u1", datetime(2025, 2, 1))
+        # One of the entries is deleted between reading and removing.
+        await store.delete_entry("u1", 2)
+        return await store.remove_archived("u1", token), await store.remove_archived("u1", token)
+
+    assert asyncio.run(run()) == (2, 0)
+
+
+def test_timeseries_update_replaces_only_the_old_measurement():
+    async def run():
+        store = TimeSeriesActivityStore(mongomock_motor.AsyncMongoMockClient()["launchpad_db"])
+        ts = datetime(2025, 3, 1, 8)
+        await store.insert("u1", entry(1, ts))
+        assert await store.update_entry("u1", 1, {"steps": 250, "timestamp": (ts + timedelta(days=1)).isoformat()})
+        return await store.find_entries("u1")
+
+    entries = asyncio.run(run())
+    assert len(entries) == 1
+    assert entries[0]["steps"] == 250
+    assert entries[0]["timestamp"] == "2025-03-02T08:00:00"
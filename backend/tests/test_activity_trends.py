@@ -0,0 +1,64 @@
+"""
+Goal-hit ratios and streaks in `ActivityService.get_trends`, against an in-memory MongoDB.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.services.activity_rollups import DAY
+from app.services.activity_service import ActivityService
+from app.services.goal_service import GoalService
+from app.services.sync_service import SyncService
+
+GOALS = {
+    "daily": {"steps": 10000, "calories": 600, "activeMinutes": 60, "water": 8},
+    "weekly": {"workouts": 5, "totalSteps": 70000, "totalCalories": 4200},
+}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    async def record(self, *args, **kwargs):
+        return 0
+
+    # mongomock can't run the version reservation pipeline; the changelog isn't under test here.
+    monkeypatch.setattr(SyncService, "record", record)
+    return SimpleNamespace(ctx=SimpleNamespace(mongo=mongomock_motor.AsyncMongoMockClient()))
+
+
+async def add_daily_steps(app, user_id, values):
+    """Day rollups for the last len(values) days, oldest first."""
+    today = datetime.utcnow().date()
+    await app.ctx.mongo["launchpad_db"]["activity_rollups"].insert_many([
+        {"user_id": user_id, "type": "steps", "period": DAY, "key": (today - timedelta(days=len(values) - 1 - i)).isoformat(), "value": v}
+        for i, v in enumerate(values)
+    ])
+
+
+def test_goal_hit_ratio_uses_goals_set_through_goal_service(app):
+    async def run():
+        await GoalService(app).set_goal("u1", GOALS)
+        await add_daily_steps(app, "u1", [12000, 5000, 10000, 3000, 11000, 9999, 10500, 12000, 15000, 10000])
+        return await ActivityService(app).get_trends("u1", ["steps"], window=10)
+
+    steps = asyncio.run(run())["types"]["steps"]
+    assert steps["goal"] == 10000
+    assert steps["goal_hit_ratio"] == 0.7
+    assert steps["current_streak"] == 4
+    assert steps["longest_streak"] == 4
+
+
+def test_no_goals_means_no_ratio(app):
+    async def run():
+        await add_daily_steps(app, "u2", [12000] * 5)
+        return await ActivityService(app).get_trends("u2", ["steps"], window=5)
+
+    steps = asyncio.run(run())["types"]["steps"]
+    assert steps["goal"] is None
+    assert steps["goal_hit_ratio"] is None
+    assert steps["current_streak"] == 0
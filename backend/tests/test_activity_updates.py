@@ -0,0 +1,66 @@
+"""
+Validation of activity entry updates, and ingest that outlives a failed rollup update.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.services.activity_rollups import ActivityRollups
+from app.services.activity_service import ActivityService, ActivityServiceException
+from app.services.sync_service import SyncService
+
+
+@pytest.fixture
+def app(monkeypatch):
+    async def record(self, *args, **kwargs):
+        return 0
+
+    # mongomock can't run the version reservation pipeline; the changelog isn't under test here.
+    monkeypatch.setattr(SyncService, "record", record)
+    monkeypatch.setattr(SyncService, "record_many", record)
+    return SimpleNamespace(ctx=SimpleNamespace(mongo=mongomock_motor.AsyncMongoMockClient()))
+
+
+@pytest.mark.parametrize("updates", [{"steps": "many"}, {"timestamp": "yesterday"}, {"id": 1}, {"owner": "u2"}])
+def test_invalid_update_is_rejected_before_writing(app, updates):
+    async def run():
+        service = ActivityService(app)
+        entry_id = await service.add_activity_entry("u1", "steps", {"steps": 500})
+        with pytest.raises(ActivityServiceException, match="Invalid activity update"):
+            await service.update_activity_entry("u1", entry_id, updates)
+        return await service.store.find_entry("u1", entry_id)
+
+    assert asyncio.run(run())["steps"] == 500
+
+
+def test_update_moves_rollups(app):
+    async def run():
+        # mongomock has no array filters, which bucketed in-place updates use.
+        service = ActivityService(app, storage="embedded")
+        entry_id = await service.add_activity_entry("u1", "steps", {"steps": 500})
+        assert await service.update_activity_entry("u1", entry_id, {"steps": "700"})
+        return await service.get_today_stats("u1")
+
+    assert asyncio.run(run())["steps"] == 700
+
+
+def test_failed_rollup_update_keeps_the_entry_and_flags_a_rebuild(app, monkeypatch):
+    async def broken(self, *args, **kwargs):
+        raise RuntimeError("rollups unavailable")
+
+    async def run():
+        service = ActivityService(app)
+        with monkeypatch.context() as m:
+            m.setattr(ActivityRollups, "apply", broken)
+            entry_id = await service.add_activity_entry("u1", "steps", {"steps": 500})
+        assert await service.store.find_entry("u1", entry_id) is not None
+        assert await service.rollups.flagged_users() == ["u1"]
+        assert await service.rebuild_rollups("u1")
+        assert await service.rollups.flagged_users() == []
+        return await service.get_today_stats("u1")
+
+    assert asyncio.run(run())["steps"] == 500
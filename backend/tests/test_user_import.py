@@ -0,0 +1,38 @@
+"""
+Row limits on `UserService.import_users`, against an in-memory MongoDB.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.services.user_import import ImportTooLarge
+from app.services.user_service import UserService
+
+
+async def rows(count):
+    for n in range(count):
+        yield n + 1, {"email": f"user{n}@example.com", "name": f"User {n}"}
+
+
+@pytest.fixture
+def service():
+    return UserService(SimpleNamespace(), collection=mongomock_motor.AsyncMongoMockClient()["launchpad_db"]["users"])
+
+
+def test_import_within_limit(service):
+    report = asyncio.run(service.import_users(rows(3), max_rows=3))
+    assert report["invited"] == 3
+    assert report["failed"] == 0
+
+
+def test_import_over_limit_creates_nobody(service):
+    async def run():
+        with pytest.raises(ImportTooLarge, match="scripts.import_users"):
+            await service.import_users(rows(4), max_rows=3, chunk_size=2)
+        return await service.collection.count_documents({})
+
+    assert asyncio.run(run()) == 0